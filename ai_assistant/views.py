@@ -5,6 +5,10 @@ from rest_framework import status
 from django.conf import settings
 import traceback
 import time
+from utils.cache import cached
+
+# Bir xil so'rov uchun AI javobi qancha saqlanadi (soniya)
+AI_CACHE_TIMEOUT = 60 * 60 * 24
 
 # Gemini API ni sozlash (v1)
 client = None
@@ -178,7 +182,11 @@ class AILessonPlanView(APIView):
             """
 
             # Fallback bilan so'rov yuborish
-            lesson_plan = generate_with_fallback(client, prompt)
+            lesson_plan = cached(
+                'ai', ('lesson_plan', prompt),
+                lambda: generate_with_fallback(client, prompt),
+                timeout=AI_CACHE_TIMEOUT
+            )
 
             return Response({
                 'subject': subject,
@@ -254,7 +262,11 @@ class AITestGeneratorView(APIView):
             """
 
             # Fallback bilan so'rov yuborish
-            questions_text = generate_with_fallback(client, prompt)
+            questions_text = cached(
+                'ai', ('tests', prompt),
+                lambda: generate_with_fallback(client, prompt),
+                timeout=AI_CACHE_TIMEOUT
+            )
 
             return Response({
                 'subject': subject,
@@ -55,12 +55,6 @@ class ConsultationCreateSerializer(serializers.ModelSerializer):
     def validate_teacher(self, value):
         """O'ziga maslahat so'rash mumkin emas"""
         request = self.context.get('request')
-        if request and hasattr(request, 'user'):
-            from teachers.models import Teacher
-            try:
-                student = Teacher.objects.get(user=request.user)
-                if student == value:
-                    raise serializers.ValidationError("O'zingizga maslahat so'ra olmaysiz")
-            except Teacher.DoesNotExist:
-                pass
+        if request and request.profile.teacher == value:
+            raise serializers.ValidationError("O'zingizga maslahat so'ra olmaysiz")
         return value
\ No newline at end of file
@@ -2,9 +2,11 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from django.db import transaction
 from .models import Consultation
 from .serializers import ConsultationSerializer, ConsultationCreateSerializer
-from teachers.models import Teacher
+from teachers import points
+from utils.pagination import KeysetPagination
 
 
 class ConsultationViewSet(viewsets.ModelViewSet):
@@ -18,19 +20,16 @@ class ConsultationViewSet(viewsets.ModelViewSet):
         return ConsultationSerializer
 
     def get_queryset(self):
-        user = self.request.user
-        try:
-            teacher = Teacher.objects.get(user=user)
-            # O'qituvchi o'zi bergan va olgan maslahatlarni ko'radi
-            return Consultation.objects.filter(teacher=teacher) | Consultation.objects.filter(student=teacher)
-        except Teacher.DoesNotExist:
+        teacher = self.request.profile.teacher
+        if teacher is None:
             return Consultation.objects.none()
+        # O'qituvchi o'zi bergan va olgan maslahatlarni ko'radi
+        return Consultation.objects.filter(teacher=teacher) | Consultation.objects.filter(student=teacher)
 
     def create(self, request, *args, **kwargs):
         """Maslahat yaratish"""
-        try:
-            student = Teacher.objects.get(user=request.user)
-        except Teacher.DoesNotExist:
+        student = request.profile.teacher
+        if student is None:
             return Response(
                 {"error": "O'qituvchi profili topilmadi. Admin bilan bog'laning."},
                 status=status.HTTP_400_BAD_REQUEST
@@ -47,16 +46,17 @@ class ConsultationViewSet(viewsets.ModelViewSet):
     def my_consultations(self, request):
         """Mening maslahatlarim"""
         consultations = self.get_queryset()
-        serializer = self.get_serializer(consultations, many=True)
-        return Response(serializer.data)
+        paginator = KeysetPagination(ordering=('-scheduled_at',))
+        page = paginator.paginate_queryset(consultations, request, view=self)
+        serializer = self.get_serializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
 
     @action(detail=True, methods=['post'])
     def accept(self, request, pk=None):
         """Maslahatni qabul qilish"""
         consultation = self.get_object()
-        teacher = Teacher.objects.get(user=request.user)
 
-        if consultation.teacher != teacher:
+        if consultation.teacher_id != request.profile.teacher.pk:
             return Response(
                 {'error': 'Bu maslahat sizga tegishli emas'},
                 status=status.HTTP_403_FORBIDDEN
@@ -71,9 +71,8 @@ class ConsultationViewSet(viewsets.ModelViewSet):
     def reject(self, request, pk=None):
         """Maslahatni rad etish"""
         consultation = self.get_object()
-        teacher = Teacher.objects.get(user=request.user)
 
-        if consultation.teacher != teacher:
+        if consultation.teacher_id != request.profile.teacher.pk:
             return Response(
                 {'error': 'Bu maslahat sizga tegishli emas'},
                 status=status.HTTP_403_FORBIDDEN
@@ -88,12 +87,12 @@ class ConsultationViewSet(viewsets.ModelViewSet):
     def complete(self, request, pk=None):
         """Maslahatni yakunlash"""
         consultation = self.get_object()
-        consultation.status = 'completed'
-        consultation.save()
 
-        # Ball qo'shish
-        consultation.teacher.total_points += 5
-        consultation.teacher.monthly_points += 5
-        consultation.teacher.update_level()
+        with transaction.atomic():
+            consultation.status = 'completed'
+            consultation.save()
+
+            # Ball qo'shish
+            points.award(consultation.teacher_id, 'consultation_completed', source=consultation)
 
         return Response({'message': 'Maslahat yakunlandi'})
\ No newline at end of file
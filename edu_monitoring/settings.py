@@ -66,6 +66,7 @@ INSTALLED_APPS = [
     'ai_assistant',
     'lesson_analysis',
     'mock_tests',
+    'search',
 ]
 
 MIDDLEWARE = [
@@ -76,6 +77,7 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'users.middleware.RequestProfileMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -222,8 +224,8 @@ AUTH_USER_MODEL = 'users.User'
 # REST Framework Settings
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework.authentication.TokenAuthentication',
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'users.authentication.CachedTokenAuthentication',
+        'users.authentication.CachedJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
@@ -231,6 +233,7 @@ REST_FRAMEWORK = {
     'DEFAULT_FILTER_BACKENDS': (
         'django_filters.rest_framework.DjangoFilterBackend',
         'rest_framework.filters.SearchFilter',
+        'search.filters.FullTextSearchFilter',
         'rest_framework.filters.OrderingFilter',
     ),
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
@@ -328,17 +331,58 @@ if not EMAIL_HOST_USER:
     EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
 
 # Cache Settings
+# Kesh barcha gunicorn workerlar va konteynerlar uchun umumiy bo'lishi kerak:
+#   CACHE_BACKEND=db    - ma'lumotlar bazasida (standart, qo'shimcha servis kerak
+#                         emas; jadval `python manage.py createcachetable` bilan,
+#                         start.sh da yaratiladi)
+#   CACHE_BACKEND=file  - server diskida: faqat bitta konteyner uchun, add/incr
+#                         atomar emas
+#   CACHE_BACKEND=locmem - faqat bitta jarayon ichida (development)
+_cache_backends = {
+    'file': 'django.core.cache.backends.filebased.FileBasedCache',
+    'db': 'django.core.cache.backends.db.DatabaseCache',
+    'locmem': 'django.core.cache.backends.locmem.LocMemCache',
+}
+_cache_backend = os.environ.get('CACHE_BACKEND', 'db')
+_cache_locations = {
+    'file': os.environ.get('CACHE_LOCATION', str(BASE_DIR / '.cache')),
+    'db': os.environ.get('CACHE_LOCATION', 'cache_table'),
+    'locmem': os.environ.get('CACHE_LOCATION', 'unique-snowflake'),
+}
+
 CACHES = {
     'default': {
-        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
-        'LOCATION': 'unique-snowflake',
-        'TIMEOUT': 300,
+        'BACKEND': _cache_backends[_cache_backend],
+        'LOCATION': _cache_locations[_cache_backend],
+        'TIMEOUT': int(os.environ.get('CACHE_TIMEOUT', 300)),
         'OPTIONS': {
-            'MAX_ENTRIES': 1000
+            # Yozuvlar soni chegarasi, oshganda 1/CULL_FREQUENCY qismi o'chiriladi
+            'MAX_ENTRIES': int(os.environ.get('CACHE_MAX_ENTRIES', 10000)),
+            'CULL_FREQUENCY': int(os.environ.get('CACHE_CULL_FREQUENCY', 3)),
         }
     }
 }
 
+# Test sessiyalari javoblari buferi (mock_tests/sessions.py) alohida keshda:
+# qulf uchun add atomar bo'lishi va bufer cull bilan o'chib ketmasligi kerak.
+#   ATTEMPT_CACHE_BACKEND=db    - ma'lumotlar bazasida (standart, jadval
+#                                 createcachetable bilan yaratiladi)
+#   ATTEMPT_CACHE_BACKEND=redis - ATTEMPT_CACHE_LOCATION=redis://... (redis paketi kerak)
+if os.environ.get('ATTEMPT_CACHE_BACKEND', 'db') == 'redis':
+    CACHES['attempts'] = {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': os.environ['ATTEMPT_CACHE_LOCATION'],
+        'TIMEOUT': None,
+    }
+else:
+    CACHES['attempts'] = {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': os.environ.get('ATTEMPT_CACHE_LOCATION', 'attempt_cache_table'),
+        'TIMEOUT': None,
+        # Cull o'chirilgan: buferlar muddati tugagach yoki sessiya yakunlanganda o'chadi
+        'OPTIONS': {'MAX_ENTRIES': 10 ** 9},
+    }
+
 # File Upload Settings
 FILE_UPLOAD_MAX_MEMORY_SIZE = 10485760  # 10MB
 DATA_UPLOAD_MAX_MEMORY_SIZE = 10485760  # 10MB
@@ -431,5 +475,38 @@ LEVEL_THRESHOLDS = {
     'expert': 1000,
 }
 
+# Joriy oy reytingi (compute_ratings --watch) shuncha soniyada yangilanadi
+RATING_RERANK_INTERVAL = int(os.environ.get('RATING_RERANK_INTERVAL', 60))
+
+# Autentifikatsiya natijasi keshda qancha saqlanadi (soniya)
+AUTH_CACHE_TTL = int(os.environ.get('AUTH_CACHE_TTL', 60))
+
+# Ko'rishlar/likelar hisoblagichlari bazaga shuncha vaqtda (soniya) yoki
+# shuncha kalit yig'ilganda yoziladi
+COUNTER_FLUSH_INTERVAL = int(os.environ.get('COUNTER_FLUSH_INTERVAL', 10))
+COUNTER_FLUSH_THRESHOLD = int(os.environ.get('COUNTER_FLUSH_THRESHOLD', 500))
+
+# To'liq matnli qidiruv natijalari soni chegarasi
+SEARCH_MAX_RESULTS = int(os.environ.get('SEARCH_MAX_RESULTS', 500))
+
+# Fon rejimidagi hisobotlar (soniyalarda)
+REPORT_CACHE_TTL = int(os.environ.get('REPORT_CACHE_TTL', 600))  # bir xil hisobot qayta ishlatiladi
+REPORT_JOB_TIMEOUT = int(os.environ.get('REPORT_JOB_TIMEOUT', 900))  # to'xtab qolgan hisobot qayta olinadi
+REPORT_RETENTION = int(os.environ.get('REPORT_RETENTION', 86400))  # fayllar shuncha saqlanadi
+# run_report_jobs worker (start.sh) shuncha soniya belgi bermasa hisobot so'rov ichida tayyorlanadi
+REPORT_WORKER_TIMEOUT = int(os.environ.get('REPORT_WORKER_TIMEOUT', 60))
+
+# Mock test sessiyalari (mock_tests/sessions.py)
+ATTEMPT_SESSION_GRACE = int(os.environ.get('ATTEMPT_SESSION_GRACE', 30))  # tarmoq kechikishi uchun qo'shimcha soniyalar
+ATTEMPT_FLUSH_INTERVAL = int(os.environ.get('ATTEMPT_FLUSH_INTERVAL', 15))  # buferlar shuncha soniyada bazaga yoziladi
+VARIANT_RETENTION = int(os.environ.get('VARIANT_RETENTION', 86400))  # topshirilmagan tasodifiy variant shuncha saqlanadi
+ITEM_ANALYSIS_INTERVAL = int(os.environ.get('ITEM_ANALYSIS_INTERVAL', 300))  # analyze_items --watch davri
+
+# Moslashuvchan (IRT) test rejimi
+IRT_MIN_ATTEMPTS = int(os.environ.get('IRT_MIN_ATTEMPTS', 50))  # kamroq urinishli test kalibrlanmaydi
+ADAPTIVE_SE_TARGET = float(os.environ.get('ADAPTIVE_SE_TARGET', 0.3))  # qobiliyat xatosi shundan kichik bo'lsa test tugaydi
+ADAPTIVE_MIN_ITEMS = int(os.environ.get('ADAPTIVE_MIN_ITEMS', 5))
+ADAPTIVE_MAX_ITEMS = int(os.environ.get('ADAPTIVE_MAX_ITEMS', 30))
+
 # Gemini API Key - .env dan o'qiladi
 GEMINI_API_KEY = os.environ.get('GEMINI_API_KEY', '')
\ No newline at end of file
@@ -41,6 +41,7 @@ def api_root(request):
             'ai_assistant': '/api/ai/',
             'lesson_analysis': '/api/lesson-analysis/',
             'mock_tests': '/api/mock-tests/',
+            'search': '/api/search/',
         },
         'documentation': 'API ishlayapti. Frontend ulanishi mumkin.',
     })
@@ -72,6 +73,7 @@ urlpatterns = [
     path('api/ratings/', include('ratings.urls')),
     path('api/ai/', include('ai_assistant.urls')),
     path('api/lesson-analysis/', include('lesson_analysis.urls')),
+    path('api/search/', include('search.urls')),
     path('api/', include('mock_tests.urls')),
 ]
 
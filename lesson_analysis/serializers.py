@@ -59,8 +59,8 @@ class LessonAnalysisCreateSerializer(serializers.ModelSerializer):
     def validate(self, data):
         # Tahlilchi o'zini tahlil qila olmaydi
         request = self.context.get('request')
-        if request and hasattr(request.user, 'teacher_profile'):
-            if data['teacher'] == request.user.teacher_profile:
+        if request and request.profile.teacher is not None:
+            if data['teacher'] == request.profile.teacher:
                 raise serializers.ValidationError("O'zingizni tahlil qila olmaysiz!")
         return data
 
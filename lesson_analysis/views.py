@@ -2,6 +2,7 @@ from rest_framework import viewsets, status, serializers
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from django.db import transaction
 from django.db.models import Avg, Count, Q
 from django.utils import timezone
 from .models import LessonAnalysis, LessonAnalysisComment
@@ -11,7 +12,8 @@ from .serializers import (
     LessonAnalysisCommentSerializer,
     LessonAnalysisStatsSerializer,
 )
-from teachers.models import Teacher
+from teachers import points
+from utils.pagination import KeysetPagination
 
 
 class LessonAnalysisViewSet(viewsets.ModelViewSet):
@@ -33,57 +35,59 @@ class LessonAnalysisViewSet(viewsets.ModelViewSet):
             return queryset
 
         # O'qituvchi o'zi bergan va olgan tahlillarni ko'radi
-        try:
-            teacher = Teacher.objects.get(user=user)
-            return queryset.filter(
-                Q(analyzer=teacher) | Q(teacher=teacher)
-            )
-        except Teacher.DoesNotExist:
+        teacher = self.request.profile.teacher
+        if teacher is None:
             return queryset.none()
+        return queryset.filter(
+            Q(analyzer=teacher) | Q(teacher=teacher)
+        )
 
     def perform_create(self, serializer):
         """Tahlil yaratish"""
-        try:
-            teacher = Teacher.objects.get(user=self.request.user)
-            serializer.save(analyzer=teacher, status='draft')
-        except Teacher.DoesNotExist:
+        teacher = self.request.profile.teacher
+        if teacher is None:
             raise serializers.ValidationError("O'qituvchi profili topilmadi")
+        serializer.save(analyzer=teacher, status='draft')
+
+    def paginated(self, analyses):
+        """Tahlillar ro'yxati dars sanasi bo'yicha sahifalab"""
+        paginator = KeysetPagination(ordering=('-lesson_date',))
+        page = paginator.paginate_queryset(analyses, self.request, view=self)
+        serializer = self.get_serializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
 
     @action(detail=False, methods=['get'])
     def my_analyses_given(self, request):
         """Men bergan tahlillar"""
-        try:
-            teacher = Teacher.objects.get(user=request.user)
-            analyses = LessonAnalysis.objects.filter(analyzer=teacher)
-            serializer = self.get_serializer(analyses, many=True)
-            return Response(serializer.data)
-        except Teacher.DoesNotExist:
-            return Response([])
+        teacher = request.profile.teacher
+        if teacher is None:
+            return Response({'next': None, 'results': []})
+
+        analyses = LessonAnalysis.objects.filter(analyzer=teacher)
+        return self.paginated(analyses)
 
     @action(detail=False, methods=['get'])
     def my_analyses_received(self, request):
         """Menga berilgan tahlillar"""
-        try:
-            teacher = Teacher.objects.get(user=request.user)
-            analyses = LessonAnalysis.objects.filter(teacher=teacher)
-            serializer = self.get_serializer(analyses, many=True)
-            return Response(serializer.data)
-        except Teacher.DoesNotExist:
-            return Response([])
+        teacher = request.profile.teacher
+        if teacher is None:
+            return Response({'next': None, 'results': []})
+
+        analyses = LessonAnalysis.objects.filter(teacher=teacher)
+        return self.paginated(analyses)
 
     @action(detail=False, methods=['get'])
     def pending(self, request):
         """Tasdiqlash kutilayotgan tahlillar"""
-        try:
-            teacher = Teacher.objects.get(user=request.user)
-            analyses = LessonAnalysis.objects.filter(
-                teacher=teacher,
-                status='pending'
-            )
-            serializer = self.get_serializer(analyses, many=True)
-            return Response(serializer.data)
-        except Teacher.DoesNotExist:
-            return Response([])
+        teacher = request.profile.teacher
+        if teacher is None:
+            return Response({'next': None, 'results': []})
+
+        analyses = LessonAnalysis.objects.filter(
+            teacher=teacher,
+            status='pending'
+        )
+        return self.paginated(analyses)
 
     @action(detail=True, methods=['post'])
     def submit(self, request, pk=None):
@@ -91,7 +95,7 @@ class LessonAnalysisViewSet(viewsets.ModelViewSet):
         analysis = self.get_object()
 
         # Faqat tahlilchi yuborishi mumkin
-        if analysis.analyzer.user != request.user:
+        if analysis.analyzer_id != getattr(request.profile.teacher, 'pk', None):
             return Response(
                 {'error': 'Faqat tahlilchi yuborishi mumkin'},
                 status=status.HTTP_403_FORBIDDEN
@@ -114,7 +118,7 @@ class LessonAnalysisViewSet(viewsets.ModelViewSet):
         analysis = self.get_object()
 
         # Faqat dars o'tgan o'qituvchi tasdiqlashi mumkin
-        if analysis.teacher.user != request.user:
+        if analysis.teacher_id != getattr(request.profile.teacher, 'pk', None):
             return Response(
                 {'error': 'Faqat dars o\'tgan o\'qituvchi tasdiqlashi mumkin'},
                 status=status.HTTP_403_FORBIDDEN
@@ -126,17 +130,16 @@ class LessonAnalysisViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        analysis.status = 'approved'
-        analysis.approved_at = timezone.now()
-        analysis.save()
+        with transaction.atomic():
+            analysis.status = 'approved'
+            analysis.approved_at = timezone.now()
+            analysis.save()
 
-        # Ball qo'shish
-        analysis.teacher.total_points += 5
-        analysis.teacher.monthly_points += 5
-        analysis.analyzer.total_points += 10
-        analysis.analyzer.monthly_points += 10
-        analysis.teacher.update_level()
-        analysis.analyzer.update_level()
+            # Ball qo'shish
+            points.award_many([
+                (analysis.teacher_id, 'analysis_received', analysis),
+                (analysis.analyzer_id, 'analysis_given', analysis),
+            ])
 
         return Response({'message': 'Tahlil tasdiqlandi'})
 
@@ -146,7 +149,7 @@ class LessonAnalysisViewSet(viewsets.ModelViewSet):
         analysis = self.get_object()
 
         # Faqat dars o'tgan o'qituvchi rad etishi mumkin
-        if analysis.teacher.user != request.user:
+        if analysis.teacher_id != getattr(request.profile.teacher, 'pk', None):
             return Response(
                 {'error': 'Faqat dars o\'tgan o\'qituvchi rad etishi mumkin'},
                 status=status.HTTP_403_FORBIDDEN
@@ -205,7 +208,12 @@ class LessonAnalysisViewSet(viewsets.ModelViewSet):
             }
         else:
             # O'qituvchi uchun shaxsiy statistika
-            teacher = Teacher.objects.get(user=user)
+            teacher = request.profile.teacher
+            if teacher is None:
+                return Response(
+                    {'error': "O'qituvchi profili topilmadi"},
+                    status=status.HTTP_404_NOT_FOUND
+                )
             stats = {
                 'total_analyses': LessonAnalysis.objects.filter(
                     Q(analyzer=teacher) | Q(teacher=teacher)
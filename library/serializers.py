@@ -1,9 +1,11 @@
 from rest_framework import serializers
+from utils.counters import PendingCountersMixin
 from .models import LibraryResource
 
 
-class LibraryResourceSerializer(serializers.ModelSerializer):
+class LibraryResourceSerializer(PendingCountersMixin, serializers.ModelSerializer):
     """Kutubxona serializer"""
+    counter_fields = ['views']
     resource_type_display = serializers.CharField(source='get_resource_type_display', read_only=True)
 
     class Meta:
@@ -4,6 +4,7 @@ from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from .models import LibraryResource
 from .serializers import LibraryResourceSerializer
+from utils import counters
 
 
 class LibraryResourceViewSet(viewsets.ModelViewSet):
@@ -11,11 +12,9 @@ class LibraryResourceViewSet(viewsets.ModelViewSet):
     queryset = LibraryResource.objects.all()
     serializer_class = LibraryResourceSerializer
     permission_classes = [IsAuthenticated]
+    search_kind = 'library'
 
     @action(detail=True, methods=['post'])
     def increment_view(self, request, pk=None):
         """Ko'rish sonini oshirish"""
-        resource = self.get_object()
-        resource.views += 1
-        resource.save()
-        return Response({'views': resource.views})
\ No newline at end of file
+        return Response({'views': counters.hit(self.get_queryset(), pk, 'views')})
\ No newline at end of file
@@ -11,7 +11,11 @@ class MaterialAdmin(admin.ModelAdmin):
     actions = ['approve_materials']
 
     def approve_materials(self, request, queryset):
+        from users.dashboard import rebuild_for_teachers
+
+        teacher_ids = list(queryset.values_list('teacher_id', flat=True).distinct())
         queryset.update(is_approved=True)
+        rebuild_for_teachers(teacher_ids)
         self.message_user(request, f"{queryset.count()} ta material tasdiqlandi")
 
     approve_materials.short_description = "Tanlangan materiallarni tasdiqlash"
\ No newline at end of file
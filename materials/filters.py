@@ -1,4 +1,5 @@
 import django_filters
+from search.index import search_objects
 from .models import Material
 
 
@@ -10,8 +11,12 @@ class MaterialFilter(django_filters.FilterSet):
     is_approved = django_filters.BooleanFilter()
     created_after = django_filters.DateFilter(field_name='created_at', lookup_expr='gte')
     created_before = django_filters.DateFilter(field_name='created_at', lookup_expr='lte')
-    search = django_filters.CharFilter(field_name='title', lookup_expr='icontains')
+    search = django_filters.CharFilter(method='filter_search')
 
     class Meta:
         model = Material
-        fields = ['subject', 'grade', 'is_approved']
\ No newline at end of file
+        fields = ['subject', 'grade', 'is_approved']
+
+    def filter_search(self, queryset, name, value):
+        """To'liq matnli indeks bo'yicha qidiruv"""
+        return search_objects(queryset, 'material', value)
@@ -1,8 +1,10 @@
 from rest_framework import serializers
+from utils.counters import PendingCountersMixin
 from .models import Material
 
 
-class MaterialSerializer(serializers.ModelSerializer):
+class MaterialSerializer(PendingCountersMixin, serializers.ModelSerializer):
+    counter_fields = ['views', 'downloads']
     teacher_name = serializers.SerializerMethodField(read_only=True)
     school_name = serializers.SerializerMethodField(read_only=True)
     subject_display = serializers.CharField(source='get_subject_display', read_only=True)
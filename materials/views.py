@@ -3,12 +3,15 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework.filters import SearchFilter, OrderingFilter
+from rest_framework.filters import OrderingFilter
+from search.filters import FullTextSearchFilter
+from django.db import transaction
 from django.db.models import Q
 from .models import Material
 from .serializers import MaterialSerializer
 from .filters import MaterialFilter
-from teachers.models import Teacher
+from teachers import points
+from utils import counters
 from utils.pagination import StandardResultsSetPagination
 
 
@@ -18,9 +21,10 @@ class MaterialViewSet(viewsets.ModelViewSet):
     serializer_class = MaterialSerializer
     permission_classes = [IsAuthenticated]
     pagination_class = StandardResultsSetPagination
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    # ?search= (MaterialFilter) va ?q= ikkalasi ham to'liq matnli indeksdan foydalanadi
+    filter_backends = [DjangoFilterBackend, FullTextSearchFilter, OrderingFilter]
     filterset_class = MaterialFilter
-    search_fields = ['title', 'description']
+    search_kind = 'material'
     ordering_fields = ['created_at', 'views', 'downloads']
 
     def get_queryset(self):
@@ -35,10 +39,10 @@ class MaterialViewSet(viewsets.ModelViewSet):
         if user.role == 'admin':
             queryset = queryset.filter(teacher__school__director=user)
         elif user.role == 'teacher':
-            try:
-                teacher = Teacher.objects.get(user=user)
+            teacher = self.request.profile.teacher
+            if teacher is not None:
                 queryset = queryset.filter(Q(is_approved=True) | Q(teacher=teacher))
-            except Teacher.DoesNotExist:
+            else:
                 queryset = queryset.filter(is_approved=True)
 
         return queryset
@@ -46,9 +50,8 @@ class MaterialViewSet(viewsets.ModelViewSet):
     def create(self, request, *args, **kwargs):
         """Material yaratish"""
         # O'qituvchi profilini tekshirish
-        try:
-            teacher = Teacher.objects.get(user=request.user)
-        except Teacher.DoesNotExist:
+        teacher = request.profile.teacher
+        if teacher is None:
             return Response(
                 {"error": "O'qituvchi profili topilmadi. Admin bilan bog'laning."},
                 status=status.HTTP_400_BAD_REQUEST
@@ -68,20 +71,20 @@ class MaterialViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'])
     def my_materials(self, request):
         """Mening materiallarim"""
-        try:
-            teacher = Teacher.objects.get(user=request.user)
-            materials = Material.objects.filter(teacher=teacher).select_related('teacher__user', 'teacher__school')
-
-            page = self.paginate_queryset(materials)
-            if page is not None:
-                serializer = self.get_serializer(page, many=True)
-                return self.get_paginated_response(serializer.data)
-
-            serializer = self.get_serializer(materials, many=True)
-            return Response(serializer.data)
-        except Teacher.DoesNotExist:
+        teacher = request.profile.teacher
+        if teacher is None:
             return Response([], status=status.HTTP_200_OK)
 
+        materials = Material.objects.filter(teacher=teacher).select_related('teacher__user', 'teacher__school')
+
+        page = self.paginate_queryset(materials)
+        if page is not None:
+            serializer = self.get_serializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+
+        serializer = self.get_serializer(materials, many=True)
+        return Response(serializer.data)
+
     @action(detail=False, methods=['get'])
     def pending(self, request):
         """Tasdiqlanmagan materiallar (Admin/Superadmin uchun)"""
@@ -112,16 +115,15 @@ class MaterialViewSet(viewsets.ModelViewSet):
         if material.is_approved:
             return Response({'message': 'Material allaqachon tasdiqlangan'})
 
-        material.is_approved = True
-        material.save()
+        with transaction.atomic():
+            material.is_approved = True
+            material.save()
 
-        # Ballarni qo'shish
-        material.teacher.total_points += 10
-        material.teacher.monthly_points += 10
-        material.teacher.update_level()
-        material.teacher.save()
+            # Ballarni qo'shish
+            awarded = points.award(material.teacher_id, 'material_approved', source=material)
 
-        return Response({'message': 'Material tasdiqlandi', 'points_added': 10})
+        points_added = points.POINT_VALUES['material_approved'] if awarded else 0
+        return Response({'message': 'Material tasdiqlandi', 'points_added': points_added})
 
     @action(detail=True, methods=['post'])
     def reject(self, request, pk=None):
@@ -141,15 +143,9 @@ class MaterialViewSet(viewsets.ModelViewSet):
     @action(detail=True, methods=['post'])
     def increment_view(self, request, pk=None):
         """Ko'rish sonini oshirish"""
-        material = self.get_object()
-        material.views += 1
-        material.save(update_fields=['views'])
-        return Response({'views': material.views})
+        return Response({'views': counters.hit(self.get_queryset(), pk, 'views')})
 
     @action(detail=True, methods=['post'])
     def increment_download(self, request, pk=None):
         """Yuklab olish sonini oshirish"""
-        material = self.get_object()
-        material.downloads += 1
-        material.save(update_fields=['downloads'])
-        return Response({'downloads': material.downloads})
\ No newline at end of file
+        return Response({'downloads': counters.hit(self.get_queryset(), pk, 'downloads')})
\ No newline at end of file
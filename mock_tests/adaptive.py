@@ -0,0 +1,224 @@
+"""
+Moslashuvchan (IRT) test rejimi.
+
+    start  - sessiya (mode='adaptive') ochiladi va θ=0 da eng ko'p axborot
+             beradigan savol beriladi;
+    answer - joriy savolga javob yoziladi va θ qayta baholanadi (irt.py).
+             Standart xato ADAPTIVE_SE_TARGET dan kichik bo'lsa (kamida
+             ADAPTIVE_MIN_ITEMS savoldan keyin), savollar ADAPTIVE_MAX_ITEMS
+             ga yetsa yoki tugasa urinish yakunlanadi; aks holda joriy θ da
+             eng ko'p axborot beradigan keyingi savol tanlanadi.
+
+Faqat kalibrlangan (ItemParameters bor) savollar beriladi. Parametrlar va
+javoblar kaliti keshdan olinadi, shuning uchun har bir javob - bitta
+qulflangan SELECT va UPDATE. Ball θ dan olinadi (irt.score), to'g'ri
+javoblar soni esa berilgan savollar bo'yicha. Oddiy submit va vaqtli
+sessiyalar o'zgarmaydi; muddati o'tgan sessiyani flush_attempt_sessions
+yakunlaydi (sessions.finish). Joriy savol sessiya davomida o'chirilsa, u
+tashlab yuboriladi va keyingi savol beriladi (skip_deleted).
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from utils.cache import cached, invalidate
+
+from . import grading, irt, packing, sessions
+from .models import AttemptSession, ItemParameters, TestAttempt
+from .sessions import SessionError
+
+
+def _namespace(test_id):
+    return f'mock_irt:{test_id}'
+
+
+def items(test_id):
+    """Testning kalibrlangan savollari: {question_id: (a, b)} - keshdan"""
+    def compute():
+        parameters = ItemParameters.objects.filter(question__test_id=test_id)
+        return {
+            question_id: (a, b)
+            for question_id, a, b in parameters.values_list('question_id', 'discrimination', 'difficulty')
+        }
+    return cached(_namespace(test_id), ['items'], compute, grading.KEY_TIMEOUT)
+
+
+def invalidate_items(test_id):
+    """Parametrlar keshini tranzaksiya yakunlangach eskirtirish"""
+    transaction.on_commit(lambda: invalidate(_namespace(test_id)))
+
+
+def available(test):
+    """Test moslashuvchan rejimda topshirilishi mumkinmi"""
+    return not test.is_randomized and len(items(test.pk)) >= settings.ADAPTIVE_MIN_ITEMS
+
+
+def _responses(session, parameters):
+    key = grading.answer_key(session.test_id)
+    expected = dict(zip(key['ids'], key['key']))
+    return [
+        (*parameters[pk], session.answers[str(pk)] == expected.get(pk))
+        for pk in session.question_ids
+        if str(pk) in session.answers and pk in parameters
+    ]
+
+
+def _question(test_id, question_id):
+    """Savol (to'g'ri javobsiz) yoki savol o'chirilgan bo'lsa None"""
+    key = grading.answer_key(test_id)
+    if question_id not in key['ids']:
+        return None
+    position = key['ids'].index(question_id)
+    return grading.public_questions({'review': [key['review'][position]]})[0]
+
+
+def _current_deleted(session):
+    return session.question_ids[-1] not in grading.answer_key(session.test_id)['ids']
+
+
+def payload(session):
+    """Sessiya holati va joriy savol (API javobi uchun)"""
+    theta, se = irt.estimate(_responses(session, items(session.test_id)))
+    return {
+        'id': session.pk,
+        'test': session.test_id,
+        'mode': session.mode,
+        'status': session.status,
+        'started_at': session.started_at,
+        'expires_at': session.expires_at,
+        'answered': len(session.answers),
+        'ability': round(theta, 3),
+        'ability_se': round(se, 3),
+        'question': _question(session.test_id, session.question_ids[-1]),
+    }
+
+
+def start(user, test, retries=3):
+    """Sessiya ochish yoki davom etayotganini qaytarish. (sessiya, yangi) qaytariladi."""
+    if not available(test):
+        raise SessionError('Test moslashuvchan rejim uchun kalibrlanmagan')
+
+    now = timezone.now()
+    session = AttemptSession.objects.filter(teacher=user, test=test, mode='adaptive', status='active').first()
+    if session is not None:
+        if session.expires_at + timedelta(seconds=settings.ATTEMPT_SESSION_GRACE) <= now:
+            sessions.finish_expired(session.pk)
+        elif not _current_deleted(session):
+            return session, False
+        else:
+            session, attempt = skip_deleted(session.pk)
+            if attempt is None:
+                return session, False
+            # Savollar tugab sessiya yakunlandi - yangisi ochiladi
+
+    first = irt.best_item(items(test.pk), set(), 0.0)
+    try:
+        with transaction.atomic():
+            session = AttemptSession.objects.create(
+                teacher=user,
+                test=test,
+                mode='adaptive',
+                question_ids=[first],
+                started_at=now,
+                expires_at=now + timedelta(minutes=test.duration),
+            )
+    except IntegrityError:
+        # Parallel so'rov allaqachon ochgan
+        if not retries:
+            raise SessionError("Sessiya ochilmadi, qayta urinib ko'ring")
+        return start(user, test, retries - 1)
+    return session, True
+
+
+def _advance(session, now):
+    """Keyingi savolni berish yoki urinishni yakunlash (sessiya qulflangan). Urinish qaytariladi."""
+    parameters = items(session.test_id)
+    theta, se = irt.estimate(_responses(session, parameters))
+    answered = len(session.answers)
+    done = (
+        (se <= settings.ADAPTIVE_SE_TARGET and answered >= settings.ADAPTIVE_MIN_ITEMS)
+        or answered >= settings.ADAPTIVE_MAX_ITEMS
+    )
+    following = None if done else irt.best_item(parameters, set(session.question_ids), theta)
+    if following is None:
+        attempt, _ = complete(session, theta, se)
+        return attempt
+
+    session.question_ids.append(following)
+    session.revision += 1
+    session.saved_at = now
+    session.save(update_fields=['answers', 'question_ids', 'revision', 'saved_at'])
+    return None
+
+
+def skip_deleted(session_id):
+    """Joriy savol o'chirilgan bo'lsa keyingisiga o'tish. (sessiya, urinish) qaytariladi."""
+    with transaction.atomic():
+        session = AttemptSession.objects.select_for_update().select_related('test').get(pk=session_id)
+        if session.status != 'active' or not _current_deleted(session):
+            return session, None
+        session.question_ids.pop()
+        return session, _advance(session, timezone.now())
+
+
+def answer(session_id, user_id, question_id, value):
+    """Joriy savolga javob. (sessiya, urinish) qaytariladi - urinish faqat test yakunlanganda."""
+    with transaction.atomic():
+        session = AttemptSession.objects.select_for_update().select_related('test').get(
+            pk=session_id, teacher_id=user_id, mode='adaptive'
+        )
+        if session.status != 'active':
+            raise SessionError('Sessiya yakunlangan')
+        now = timezone.now()
+        if now > session.expires_at + timedelta(seconds=settings.ATTEMPT_SESSION_GRACE):
+            attempt, _ = complete(session)
+            return session, attempt
+
+        if _current_deleted(session):
+            # Savol o'chirilgan - javob yozilmaydi, keyingi savol beriladi
+            session.question_ids.pop()
+            return session, _advance(session, now)
+
+        current = session.question_ids[-1]
+        if question_id != current:
+            raise SessionError('Bu savol joriy savol emas')
+        session.answers[str(current)] = grading.normalize_answer(value)
+        return session, _advance(session, now)
+
+
+def complete(session, theta=None, se=None):
+    """Qulflangan sessiyani yakunlash: TestAttempt yaratiladi. (urinish, kalit) qaytariladi."""
+    test = session.test
+    # Javob berilmagan oxirgi savol (muddati o'tgan/erta yakunlangan) hisobga
+    # olinmaydi; o'chirilgan savollar kalitga kirmaydi
+    answered = [pk for pk in session.question_ids if str(pk) in session.answers]
+    if theta is None:
+        # Javobsiz urinishda ham baho bor (apriori: θ=0, xato 1) - ability
+        # moslashuvchan urinish belgisi (reyting va statistikaga kirmaydi)
+        theta, se = irt.estimate(_responses(session, items(test.pk)))
+
+    key = grading.variant_key(answered)
+    result = grading.grade(key, session.answers, test.passing_score)
+    result['score'] = irt.score(theta) if answered else 0
+    result['passed'] = bool(answered) and result['score'] >= test.passing_score
+
+    now = timezone.now()
+    finished_at = min(now, session.expires_at)
+    attempt = TestAttempt.objects.create(
+        teacher_id=session.teacher_id,
+        test=test,
+        started_at=session.started_at,
+        time_spent=max(int((finished_at - session.started_at).total_seconds()), 0),
+        question_ids=key['ids'],
+        **packing.pack(key, session.answers),
+        ability=theta,
+        ability_se=se,
+        **result
+    )
+    session.status = 'finished'
+    session.attempt = attempt
+    session.saved_at = now
+    session.save(update_fields=['status', 'attempt', 'answers', 'saved_at'])
+    return attempt, key
@@ -1,5 +1,8 @@
 from django.contrib import admin
-from .models import MockTest, Question, TestAttempt
+from .models import (
+    AnswerLayout, AttemptSession, ItemAnalysis, ItemParameters, LeaderboardEntry, MockTest, Question,
+    QuestionStats, TestAttempt,
+)
 
 class QuestionInline(admin.TabularInline):
     model = Question
@@ -23,4 +26,36 @@ class QuestionAdmin(admin.ModelAdmin):
 class TestAttemptAdmin(admin.ModelAdmin):
     list_display = ['teacher', 'test', 'score', 'correct_answers', 'passed', 'started_at']
     list_filter = ['passed', 'test__subject']
-    search_fields = ['teacher__username', 'test__title']
\ No newline at end of file
+    search_fields = ['teacher__username', 'test__title']
+
+@admin.register(ItemAnalysis)
+class ItemAnalysisAdmin(admin.ModelAdmin):
+    list_display = ['test', 'attempts', 'last_attempt_id', 'analyzed_at']
+    raw_id_fields = ['test']
+
+@admin.register(QuestionStats)
+class QuestionStatsAdmin(admin.ModelAdmin):
+    list_display = ['question', 'correct', 'p_value', 'discrimination', 'updated_at']
+    raw_id_fields = ['question']
+
+@admin.register(AttemptSession)
+class AttemptSessionAdmin(admin.ModelAdmin):
+    list_display = ['teacher', 'test', 'mode', 'status', 'started_at', 'expires_at', 'saved_at']
+    list_filter = ['status', 'mode']
+    raw_id_fields = ['teacher', 'test', 'attempt']
+
+@admin.register(ItemParameters)
+class ItemParametersAdmin(admin.ModelAdmin):
+    list_display = ['question', 'discrimination', 'difficulty', 'responses', 'calibrated_at']
+    raw_id_fields = ['question']
+
+@admin.register(AnswerLayout)
+class AnswerLayoutAdmin(admin.ModelAdmin):
+    list_display = ['test', 'version', 'created_at']
+    raw_id_fields = ['test']
+
+@admin.register(LeaderboardEntry)
+class LeaderboardEntryAdmin(admin.ModelAdmin):
+    list_display = ['board', 'teacher', 'school', 'score', 'time_spent', 'achieved_at']
+    search_fields = ['board', 'teacher__username']
+    raw_id_fields = ['test', 'teacher', 'school']
@@ -0,0 +1,189 @@
+"""
+Savollar tahlili (item analysis).
+
+Har bir savol uchun barcha urinishlar bo'yicha:
+- p (qiyinlik) - to'g'ri javob berganlar ulushi;
+- diskriminatsiya - savolga to'g'ri javob bilan test bali orasidagi
+  nuqta-biserial korrelyatsiya: (M1 - M) / s * sqrt(p / q);
+- javob variantlari (distraktorlar) va javobsiz qoldirish ulushi;
+- vaqt: urinish vaqti savollar soniga bo'linadi (savol bo'yicha vaqt
+  yozilmaydi), to'g'ri javob berganlar uchun alohida o'rtacha.
+
+Hammasi yig'indilar ko'rinishida saqlanadi, shuning uchun har safar faqat
+ItemAnalysis.last_attempt_id dan keyingi urinishlar CHUNK_SIZE tadan
+o'qiladi va qo'shiladi. Tasodifiy variantdagi urinishlar (bank.py) test
+kalitiga mos kelmagani uchun hisobga olinmaydi. Savol qo'shilsa, o'chirilsa
+yoki to'g'ri javobi o'zgarsa (signals.py) test tahlili tashlab yuboriladi va
+keyingi ishga tushirishda qayta hisoblanadi.
+
+Tahlil faqat analyze_items buyrug'ida (deploy da --watch) bajariladi, API
+tayyor natijani o'qiydi.
+"""
+import math
+
+from django.db import transaction
+from django.db.models import F, Max
+from django.db.models.functions import Coalesce
+
+from .grading import NO_ANSWER, answer_key
+from .packing import aligned, decode, source_ids
+from .models import ItemAnalysis, MockTest, QuestionStats, TestAttempt
+
+CHUNK_SIZE = 2000
+
+OPTION_FIELDS = {'A': 'option_a', 'B': 'option_b', 'C': 'option_c', 'D': 'option_d', NO_ANSWER: 'blank'}
+STATS_FIELDS = list(OPTION_FIELDS.values()) + [
+    'correct', 'score_correct_sum', 'time_correct_sum', 'p_value', 'discrimination',
+]
+
+
+def pending_tests():
+    """Tahlil qilinmagan urinishlari bor testlar ID lari"""
+    return list(
+        MockTest.objects.filter(is_randomized=False).annotate(last_attempt=Max('attempts__id')).filter(
+            last_attempt__gt=Coalesce(F('item_analysis__last_attempt_id'), 0)
+        ).values_list('id', flat=True)
+    )
+
+
+def _derive(stats, state):
+    """Yig'indilardan p va diskriminatsiyani hisoblash"""
+    responses = sum(getattr(stats, field) for field in OPTION_FIELDS.values())
+    if not responses:
+        stats.p_value = stats.discrimination = None
+        return
+    p = stats.correct / responses
+    stats.p_value = p
+    stats.discrimination = None
+
+    mean = state.score_sum / state.attempts
+    variance = state.score_sq_sum / state.attempts - mean * mean
+    if stats.correct and 0 < p < 1 and variance > 0:
+        mean_correct = stats.score_correct_sum / stats.correct
+        stats.discrimination = (mean_correct - mean) / math.sqrt(variance) * math.sqrt(p / (1 - p))
+
+
+def analyze_test(test_id):
+    """Testning yangi urinishlarini tahlilga qo'shish. Qo'shilgan urinishlar soni qaytariladi."""
+    key = answer_key(test_id)
+    ids, expected = key['ids'], key['key']
+    size = len(ids)
+    if not size:
+        return 0
+
+    with transaction.atomic():
+        state, _ = ItemAnalysis.objects.select_for_update().get_or_create(test_id=test_id)
+
+        # Savol pozitsiyasi bo'yicha hisoblagich massivlari
+        counts = {option: [0] * size for option in OPTION_FIELDS}
+        correct = [0] * size
+        score_correct = [0.0] * size
+        time_correct = [0.0] * size
+
+        attempts = TestAttempt.objects.filter(
+            test_id=test_id, id__gt=state.last_attempt_id, question_ids__isnull=True
+        ).order_by('id').values_list('id', 'answers_packed', 'layout_version', 'score', 'time_spent')
+
+        added = 0
+        for attempt_id, packed, version, score, time_spent in attempts.iterator(chunk_size=CHUNK_SIZE):
+            if version == key['layout']:
+                given = decode(packed, size)
+            else:
+                # Savollar tartibi o'zgarishidan oldingi urinish
+                given = aligned(ids, packed, source_ids(test_id, version, None))
+            item_time = (time_spent or 0) / size
+            for position, (answer, right) in enumerate(zip(given, expected)):
+                counts.get(answer, counts[NO_ANSWER])[position] += 1
+                if answer == right:
+                    correct[position] += 1
+                    score_correct[position] += score
+                    time_correct[position] += item_time
+
+            added += 1
+            state.last_attempt_id = attempt_id
+            state.score_sum += score
+            state.score_sq_sum += score * score
+            state.time_sum += item_time
+
+        if not added:
+            return 0
+        state.attempts += added
+        state.save()
+
+        existing = QuestionStats.objects.in_bulk(ids, field_name='question_id')
+        created, updated = [], []
+        for position, question_id in enumerate(ids):
+            stats = existing.get(question_id)
+            if stats is None:
+                stats = QuestionStats(question_id=question_id)
+                created.append(stats)
+            else:
+                updated.append(stats)
+            for option, field in OPTION_FIELDS.items():
+                setattr(stats, field, getattr(stats, field) + counts[option][position])
+            stats.correct += correct[position]
+            stats.score_correct_sum += score_correct[position]
+            stats.time_correct_sum += time_correct[position]
+            _derive(stats, state)
+
+        QuestionStats.objects.bulk_create(created)
+        QuestionStats.objects.bulk_update(updated, STATS_FIELDS)
+    return added
+
+
+def analyze(test_ids=None, rebuild=False):
+    """Testlarni tahlil qilish (test_ids berilmasa - yangi urinishlari borlari)"""
+    if rebuild:
+        reset(test_ids)
+    if test_ids is None:
+        test_ids = pending_tests()
+    return sum(analyze_test(test_id) for test_id in test_ids)
+
+
+def reset(test_ids=None):
+    """Tahlilni tashlab yuborish (keyingi ishga tushirishda boshidan hisoblanadi)"""
+    states = ItemAnalysis.objects.all()
+    stats = QuestionStats.objects.all()
+    if test_ids is not None:
+        states = states.filter(test_id__in=test_ids)
+        stats = stats.filter(question__test_id__in=test_ids)
+    stats.delete()
+    states.delete()
+
+
+def report(test_id):
+    """Test bo'yicha tahlil natijasi (API uchun)"""
+    key = answer_key(test_id)
+    state = ItemAnalysis.objects.filter(test_id=test_id).first()
+    stats = QuestionStats.objects.in_bulk(key['ids'], field_name='question_id')
+
+    attempts = state.attempts if state else 0
+    mean_score = state.score_sum / attempts if attempts else None
+    mean_time = state.time_sum / attempts if attempts else None
+
+    questions = []
+    for question in key['review']:
+        item = stats.get(question['id'])
+        responses = sum(getattr(item, field) for field in OPTION_FIELDS.values()) if item else 0
+        questions.append({
+            'id': question['id'],
+            'order': question['order'],
+            'correct_answer': question['correct_answer'],
+            'responses': responses,
+            'p_value': item.p_value if item else None,
+            'discrimination': item.discrimination if item else None,
+            'options': {
+                option: round(getattr(item, field) / responses, 4) if responses else None
+                for option, field in OPTION_FIELDS.items()
+            },
+            'mean_time_correct': item.time_correct_sum / item.correct if item and item.correct else None,
+        })
+
+    return {
+        'test_id': test_id,
+        'attempts': attempts,
+        'mean_score': mean_score,
+        'mean_item_time': mean_time,
+        'analyzed_at': state.analyzed_at if state else None,
+        'questions': questions,
+    }
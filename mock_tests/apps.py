@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class MockTestsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'mock_tests'
+
+    def ready(self):
+        import mock_tests.signals
@@ -0,0 +1,171 @@
+"""
+Savollar banki va tasodifiy variantlar.
+
+Bank - barcha testlarning savollari; (fan, qiyinlik, mavzu) guruhi
+savolning testidan va topic maydonidan olinadi. QuestionBankSlot har bir
+guruhda savollarni 0..n-1 zich raqamlaydi: savol qo'shilsa oxiriga
+yoziladi, o'chirilsa oxirgi savol bo'shagan raqamga ko'chiriladi.
+Guruh hajmi MAX(slot) + 1 (indeksdan), tanlash - random.sample(range(n))
+va slot__in bo'yicha o'qish, ORDER BY RANDOM() ishlatilmaydi.
+
+Variant MockTest.variant_spec bo'yicha yig'iladi va seed ga bog'liq:
+bir xil seed va bir xil bank - bir xil savollar. Berilgan variant
+IssuedVariant da saqlanadi va submit shu ro'yxat bo'yicha baholaydi;
+tanlangan savollar urinishda ham qoladi (question_ids), shuning uchun bank
+keyin o'zgarsa ham urinishni qayta baholash mumkin.
+"""
+import random
+import secrets
+
+from django.db import IntegrityError, transaction
+from django.db.models import Max
+
+from .models import IssuedVariant, Question, QuestionBankSlot
+
+BATCH_SIZE = 2000
+SEED_BITS = 48
+
+
+def new_seed():
+    return secrets.randbits(SEED_BITS)
+
+
+def _group(question, test):
+    return test.subject, test.difficulty, question.topic or ''
+
+
+def _filter(group):
+    subject, difficulty, topic = group
+    return QuestionBankSlot.objects.filter(subject=subject, difficulty=difficulty, topic=topic)
+
+
+def group_size(group):
+    """Guruhdagi savollar soni (raqamlar zich bo'lgani uchun MAX + 1)"""
+    last = _filter(group).aggregate(last=Max('slot'))['last']
+    return 0 if last is None else last + 1
+
+
+def _slots(questions, test):
+    sizes = {}
+    slots = []
+    for question in questions:
+        group = _group(question, test)
+        if group not in sizes:
+            sizes[group] = group_size(group)
+        slots.append(QuestionBankSlot(
+            question=question, subject=group[0], difficulty=group[1], topic=group[2], slot=sizes[group]
+        ))
+        sizes[group] += 1
+    return slots
+
+
+def add_many(questions, test, attempts=3):
+    """Bitta testning yangi savollarini bankka qo'shish (bulk_create dan keyin)
+
+    Parallel qo'shish (import) xuddi shu raqamlarni olsa, guruh hajmi qayta
+    o'qilib yana uriniladi.
+    """
+    for attempt in range(attempts):
+        try:
+            with transaction.atomic():
+                QuestionBankSlot.objects.bulk_create(_slots(questions, test), batch_size=BATCH_SIZE)
+            return
+        except IntegrityError:
+            if attempt == attempts - 1:
+                raise
+
+
+def add(question, test):
+    """Savolni guruh oxiriga qo'shish"""
+    add_many([question], test)
+
+
+def fill_hole(group, slot):
+    """O'chirilgan raqamga guruhning oxirgi savolini ko'chirish"""
+    last = _filter(group).order_by('-slot').first()
+    if last is not None and last.slot > slot:
+        last.slot = slot
+        last.save(update_fields=['slot'])
+
+
+def sync(question, test):
+    """Savol bank indeksini uning joriy guruhiga moslash"""
+    group = _group(question, test)
+    current = QuestionBankSlot.objects.filter(question=question).first()
+    if current is not None:
+        if (current.subject, current.difficulty, current.topic) == group:
+            return
+        current.delete()    # bo'shagan raqam post_delete signalida to'ldiriladi
+    add(question, test)
+
+
+def sync_test(test):
+    """Test fani/qiyinligi o'zgarganda savollarini yangi guruhga o'tkazish"""
+    moved = QuestionBankSlot.objects.filter(question__test=test).exclude(
+        subject=test.subject, difficulty=test.difficulty
+    ).select_related('question')
+    for slot in moved:
+        sync(slot.question, test)
+
+
+def sample(rng, group, count):
+    """Guruhdan count ta tasodifiy savol ID si"""
+    size = group_size(group)
+    picks = rng.sample(range(size), min(count, size))
+    found = dict(_filter(group).filter(slot__in=picks).values_list('slot', 'question_id'))
+    return [found[slot] for slot in picks if slot in found]
+
+
+def assemble(test, seed):
+    """Test variantining savollar ID lari (seed bo'yicha takrorlanadigan)"""
+    rng = random.Random(f'{test.pk}:{seed}')
+    ids = []
+    for part in test.variant_spec:
+        group = (
+            part.get('subject') or test.subject,
+            part.get('difficulty') or test.difficulty,
+            part.get('topic') or '',
+        )
+        for question_id in sample(rng, group, int(part.get('count', 0))):
+            if question_id not in ids:
+                ids.append(question_id)
+    return ids
+
+
+def issue(user, test, seed=None):
+    """O'qituvchiga variant berish: tanlangan savollar saqlanadi (avval berilgan bo'lsa o'shasi)"""
+    if seed is None:
+        seed = new_seed()
+    else:
+        issued = IssuedVariant.objects.filter(teacher=user, test=test, seed=seed).first()
+        if issued is not None:
+            return issued
+    try:
+        with transaction.atomic():
+            return IssuedVariant.objects.create(teacher=user, test=test, seed=seed, question_ids=assemble(test, seed))
+    except IntegrityError:
+        # Parallel so'rov saqlab ulgurgan
+        return IssuedVariant.objects.get(teacher=user, test=test, seed=seed)
+
+
+def rebuild():
+    """Bank indeksini qayta qurish. Savollar soni qaytariladi."""
+    with transaction.atomic():
+        QuestionBankSlot.objects.all().delete()
+        sizes = {}
+        batch = []
+        count = 0
+        questions = Question.objects.select_related('test').order_by('id')
+        for question in questions.iterator(chunk_size=BATCH_SIZE):
+            group = _group(question, question.test)
+            slot = sizes.get(group, 0)
+            sizes[group] = slot + 1
+            batch.append(QuestionBankSlot(
+                question=question, subject=group[0], difficulty=group[1], topic=group[2], slot=slot
+            ))
+            if len(batch) >= BATCH_SIZE:
+                QuestionBankSlot.objects.bulk_create(batch)
+                count += len(batch)
+                batch = []
+        QuestionBankSlot.objects.bulk_create(batch)
+    return count + len(batch)
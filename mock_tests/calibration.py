@@ -0,0 +1,141 @@
+"""
+IRT parametrlarini kalibrlash (calibrate_items buyrug'i).
+
+Test bo'yicha barcha urinishlardan javoblar matritsasi tuziladi (urinish x
+savol, to'g'ri = 1). Moslashuvchan urinishlarda faqat berilgan savollar
+hisobga olinadi (niqob), tasodifiy variantdagilarda - testning o'z
+savollari. 2PL parametrlari qo'shma eng katta ehtimollik (JML) bilan
+topiladi: navbat bilan θ (N(0, 1) apriori bilan) va savollarning a, b
+qiymatlari bitta Nyuton qadami bilan yangilanadi, har qadamda θ shkalasi
+standartlashtiriladi. Hisob NumPy massivlarida, shuning uchun minglab
+urinishlar ham tez kalibrlanadi.
+
+Urinishlar IRT_MIN_ATTEMPTS dan kam bo'lsa test kalibrlanmaydi; oxirgi
+kalibrlashdan keyin yangi urinish bo'lmasa test o'tkazib yuboriladi.
+"""
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Max, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .adaptive import invalidate_items
+from .grading import answer_key
+from .packing import aligned, source_ids
+from .irt import THETA_LIMIT
+from .models import ItemParameters, MockTest, TestAttempt
+
+CHUNK_SIZE = 2000
+ITERATIONS = 100
+TOLERANCE = 1e-3
+A_LIMITS = (0.2, 4.0)
+
+
+def pending_tests():
+    """Oxirgi kalibrlashdan keyin yangi urinishlari bor testlar ID lari"""
+    calibrated = ItemParameters.objects.filter(question__test=OuterRef('pk')).order_by('-last_attempt_id')
+    return list(
+        MockTest.objects.filter(is_randomized=False).annotate(
+            last_attempt=Max('attempts__id'),
+            calibrated=Subquery(calibrated.values('last_attempt_id')[:1]),
+        ).filter(last_attempt__gt=Coalesce(F('calibrated'), 0)).values_list('id', flat=True)
+    )
+
+
+def _matrix(test_id, ids, expected):
+    """(javoblar, niqob, oxirgi urinish ID) - javoblar[i, j] = 1, agar to'g'ri"""
+    positions = {pk: position for position, pk in enumerate(ids)}
+    rows, partial, last_attempt_id = [], [], 0
+    attempts = TestAttempt.objects.filter(test_id=test_id).order_by('id').values_list(
+        'id', 'answers_packed', 'layout_version', 'question_ids'
+    )
+    for attempt_id, packed, version, question_ids in attempts.iterator(chunk_size=CHUNK_SIZE):
+        rows.append(aligned(ids, packed, source_ids(test_id, version, question_ids)).encode())
+        if question_ids is not None:
+            partial.append((len(rows) - 1, [positions[pk] for pk in question_ids if pk in positions]))
+        last_attempt_id = attempt_id
+
+    key = np.frombuffer(expected.encode(), dtype=np.uint8)
+    given = np.frombuffer(b''.join(rows), dtype=np.uint8).reshape(len(rows), len(ids))
+    mask = np.ones(given.shape)
+    for row, presented in partial:
+        mask[row] = 0
+        mask[row, presented] = 1
+    return (given == key) * mask, mask, last_attempt_id
+
+
+def _logit(share):
+    return np.log(share / (1 - share))
+
+
+def fit(responses, mask):
+    """JML bilan 2PL: (a, b) massivlari"""
+    a = np.ones(responses.shape[1])
+    b = -_logit((responses.sum(0) + 0.5) / (mask.sum(0) + 1))
+    theta = _logit((responses.sum(1) + 0.5) / (mask.sum(1) + 1))
+    theta = (theta - theta.mean()) / (theta.std() or 1)
+
+    for _ in range(ITERATIONS):
+        p = 1 / (1 + np.exp(-a * (theta[:, None] - b)))
+        residual, weight = (responses - p) * mask, p * (1 - p) * mask
+        theta = theta + ((residual * a).sum(1) - theta) / ((weight * a * a).sum(1) + 1)
+        theta = np.clip((theta - theta.mean()) / (theta.std() or 1), -THETA_LIMIT, THETA_LIMIT)
+
+        p = 1 / (1 + np.exp(-a * (theta[:, None] - b)))
+        residual, weight = (responses - p) * mask, p * (1 - p) * mask
+        distance = theta[:, None] - b
+        new_b = b - residual.sum(0) / (a * weight.sum(0) + 1e-9)
+        new_a = a + (residual * distance).sum(0) / ((weight * distance * distance).sum(0) + 1e-9)
+        new_a = np.clip(new_a, *A_LIMITS)
+        new_b = np.clip(new_b, -THETA_LIMIT, THETA_LIMIT)
+        change = max(np.abs(new_a - a).max(), np.abs(new_b - b).max())
+        a, b = new_a, new_b
+        if change < TOLERANCE:
+            break
+    return a, b
+
+
+def calibrate_test(test_id):
+    """Test savollarini kalibrlash. Kalibrlangan savollar soni qaytariladi."""
+    key = answer_key(test_id)
+    ids = key['ids']
+    if not ids:
+        return 0
+    responses, mask, last_attempt_id = _matrix(test_id, ids, key['key'])
+    if len(responses) < settings.IRT_MIN_ATTEMPTS:
+        return 0
+
+    a, b = fit(responses, mask)
+    counts = mask.sum(0)
+    now = timezone.now()
+    with transaction.atomic():
+        existing = ItemParameters.objects.in_bulk(ids, field_name='question_id')
+        created, updated = [], []
+        for position, question_id in enumerate(ids):
+            if not counts[position]:
+                continue
+            parameters = existing.get(question_id)
+            if parameters is None:
+                parameters = ItemParameters(question_id=question_id)
+                created.append(parameters)
+            else:
+                updated.append(parameters)
+            parameters.discrimination = float(a[position])
+            parameters.difficulty = float(b[position])
+            parameters.responses = int(counts[position])
+            parameters.last_attempt_id = last_attempt_id
+            parameters.calibrated_at = now
+        ItemParameters.objects.bulk_create(created)
+        ItemParameters.objects.bulk_update(
+            updated, ['discrimination', 'difficulty', 'responses', 'last_attempt_id', 'calibrated_at']
+        )
+        invalidate_items(test_id)
+    return len(created) + len(updated)
+
+
+def calibrate(test_ids=None):
+    """Testlarni kalibrlash (test_ids berilmasa - yangi urinishlari borlari)"""
+    if test_ids is None:
+        test_ids = pending_tests()
+    return sum(calibrate_test(test_id) for test_id in test_ids)
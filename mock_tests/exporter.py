@@ -0,0 +1,83 @@
+"""
+Test bankini oqim (streaming) ko'rinishida eksport qilish.
+
+Testlar iterator() bilan CHUNK_SIZE tadan o'qiladi (savollar har bir bo'lak
+uchun bitta prefetch so'rovi bilan), har biri alohida serializatsiya qilinib
+darhol javobga yoziladi - butun bank xotiraga yig'ilmaydi.
+
+Formatlar: JSON massiv (standart) yoki NDJSON (har qatorda bitta test),
+ixtiyoriy gzip siqish bilan.
+"""
+import json
+import zlib
+from datetime import datetime, time
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from .models import MockTest
+from .serializers import MockTestExportSerializer
+
+CHUNK_SIZE = 100
+
+CONTENT_TYPES = {
+    'json': 'application/json',
+    'ndjson': 'application/x-ndjson',
+}
+
+
+def parse_since(value):
+    """'YYYY-MM-DD' yoki ISO sana-vaqtni aware datetime ga aylantirish (bo'sh -> None)"""
+    if not value:
+        return None
+    since = parse_datetime(value)
+    if since is None:
+        day = parse_date(value)
+        if day is None:
+            raise ValueError(value)
+        since = datetime.combine(day, time.min)
+    if timezone.is_naive(since):
+        since = timezone.make_aware(since)
+    return since
+
+
+def export_queryset(subject=None, difficulty=None, updated_since=None):
+    """Eksport qilinadigan testlar (filtrlar bilan)"""
+    tests = MockTest.objects.prefetch_related('questions').order_by('id')
+    if subject:
+        tests = tests.filter(subject=subject)
+    if difficulty:
+        tests = tests.filter(difficulty=difficulty)
+    if updated_since:
+        tests = tests.filter(updated_at__gte=updated_since)
+    return tests
+
+
+def _dumps(test):
+    return json.dumps(MockTestExportSerializer(test).data, cls=DjangoJSONEncoder, ensure_ascii=False)
+
+
+def iter_tests(tests, fmt='json'):
+    """Testlarni matn bo'laklari sifatida chiqarish"""
+    if fmt == 'ndjson':
+        for test in tests.iterator(chunk_size=CHUNK_SIZE):
+            yield _dumps(test) + '\n'
+        return
+
+    yield '['
+    separator = ''
+    for test in tests.iterator(chunk_size=CHUNK_SIZE):
+        yield separator + _dumps(test)
+        separator = ','
+    yield ']'
+
+
+def gzip_stream(chunks):
+    """Matn bo'laklarini gzip formatida siqib chiqarish"""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode())
+        if data:
+            yield data
+    yield compressor.flush()
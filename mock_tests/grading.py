@@ -0,0 +1,119 @@
+"""
+Mock test javoblarini baholash.
+
+Har bir test uchun javoblar kaliti bir marta (bitta so'rov bilan) tuziladi
+va keshlanadi: savollar ID lari, to'g'ri javoblar satri ("ABDC...") va
+ko'rib chiqish uchun serializatsiya qilingan savollar. Savol qo'shilsa,
+o'zgarsa yoki o'chirilsa (signals.py) kalit eskiradi.
+
+Topshirishda savollar bazadan o'qilmaydi: yuborilgan javoblar kalit
+tartibida satrga yig'iladi va kalit bilan har bir pozitsiyada solishtiriladi.
+"""
+from django.db import transaction
+
+from utils.cache import cached, invalidate
+
+KEY_TIMEOUT = 24 * 60 * 60
+VARIANT_NAMESPACE = 'mock_variant'
+NO_ANSWER = '-'
+
+
+def _namespace(test_id):
+    return f'mock_key:{test_id}'
+
+
+def _build_key(questions):
+    from .serializers import QuestionWithAnswerSerializer
+
+    return {
+        'ids': [question.pk for question in questions],
+        'key': ''.join(question.correct_answer for question in questions),
+        'review': list(QuestionWithAnswerSerializer(questions, many=True).data),
+    }
+
+
+def _test_questions(test_id):
+    from .models import Question
+    return list(Question.objects.filter(test_id=test_id).order_by('order', 'id'))
+
+
+def _variant_questions(ids):
+    from .models import Question
+    questions = Question.objects.in_bulk(ids)
+    return [questions[pk] for pk in ids if pk in questions]
+
+
+def _test_key(test_id):
+    from .packing import current_layout
+
+    key = _build_key(_test_questions(test_id))
+    key['layout'] = current_layout(test_id, key['ids'])
+    return key
+
+
+def answer_key(test_id):
+    """{'ids': [...], 'key': 'ABDC...', 'review': [...], 'layout': versiya} - keshdan"""
+    return cached(_namespace(test_id), ['key', 'layout'], lambda: _test_key(test_id), KEY_TIMEOUT)
+
+
+def variant_key(question_ids):
+    """Tasodifiy variant (bank.py) kaliti - savollar berilgan tartibda"""
+    return cached(VARIANT_NAMESPACE, [question_ids], lambda: _build_key(_variant_questions(question_ids)), KEY_TIMEOUT)
+
+
+def attempt_key(attempt):
+    """Urinish/sessiya qaysi savollar bilan o'tgan bo'lsa, o'sha kalit"""
+    if attempt.question_ids is not None:
+        return variant_key(attempt.question_ids)
+    return answer_key(attempt.test_id)
+
+
+def public_questions(key):
+    """Kalitdagi savollar - to'g'ri javob va izohsiz (test topshirish uchun)"""
+    return [
+        {name: value for name, value in question.items() if name not in ('correct_answer', 'explanation')}
+        for question in key['review']
+    ]
+
+
+def invalidate_key(test_id):
+    """Test kalitini (va variant kalitlarini) tranzaksiya yakunlangach eskirtirish"""
+    from .packing import layout_namespace
+
+    # Layout lar o'zgarmaydi, lekin test o'chirilsa uning ID si qayta ishlatilishi mumkin
+    transaction.on_commit(lambda: invalidate(_namespace(test_id), VARIANT_NAMESPACE, layout_namespace(test_id)))
+
+
+def normalize_answer(value):
+    """Yuborilgan javobni bitta harfga keltirish ('a ' -> 'A', bo'sh -> '-')"""
+    if not isinstance(value, str):
+        return NO_ANSWER
+    value = value.strip().upper()
+    return value if len(value) == 1 else NO_ANSWER
+
+
+def answer_string(ids, answers):
+    """{question_id: javob} ni kalit tartibidagi satrga aylantirish"""
+    return ''.join(normalize_answer(answers.get(str(pk))) for pk in ids)
+
+
+def grade(key, answers, passing_score):
+    """Javoblarni baholash. TestAttempt maydonlari uchun qiymatlar qaytariladi."""
+    submitted = answer_string(key['ids'], answers)
+    total = len(key['key'])
+    correct = sum(1 for given, expected in zip(submitted, key['key']) if given == expected)
+    score = int(correct / total * 100) if total else 0
+    return {
+        'score': score,
+        'correct_answers': correct,
+        'wrong_answers': total - correct,
+        'total_questions': total,
+        'passed': score >= passing_score,
+    }
+
+
+def regrade(attempt):
+    """Urinishni saqlangan javoblar va savollar bo'yicha qayta baholash"""
+    from .packing import unpack
+
+    return grade(attempt_key(attempt), unpack(attempt), attempt.test.passing_score)
@@ -0,0 +1,190 @@
+"""
+Mock testlarni Excel (.xlsx) dan import qilish.
+
+Ustunlar test eksporti bilan bir xil: test_title, subject, difficulty,
+duration, passing_score, question_text, option_a..option_d, correct_answer,
+explanation (ixtiyoriy topic - bank mavzusi). Har bir varaq alohida test (test_title ustuni bo'lmasa varaq
+nomi sarlavha bo'ladi); bitta varaqda test_title bo'yicha bir nechta test
+ham bo'lishi mumkin. Test sozlamalari uning birinchi qatoridan olinadi.
+
+Fayl read_only rejimda qatorma-qator o'qiladi, savollar BATCH_SIZE tadan
+bulk_create bilan yoziladi. Noto'g'ri qatorlar o'tkazib yuboriladi va
+xatolar ro'yxatida qaytariladi - import to'xtamaydi.
+"""
+from django.db import transaction
+from openpyxl import load_workbook
+
+from . import bank
+from .models import MockTest, Question
+
+BATCH_SIZE = 500
+MAX_ERRORS = 500
+
+QUESTION_COLUMNS = ['question_text', 'option_a', 'option_b', 'option_c', 'option_d', 'correct_answer']
+OPTION_MAX_LENGTH = Question._meta.get_field('option_a').max_length
+ANSWERS = {'A', 'B', 'C', 'D'}
+SUBJECTS = dict(MockTest.SUBJECT_CHOICES)
+DIFFICULTIES = dict(MockTest.DIFFICULTY_CHOICES)
+
+
+def _text(value):
+    """Katak qiymatini satrga aylantirish (3.0 -> '3')"""
+    if value is None:
+        return ''
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value).strip()
+
+
+def _number(value, default):
+    """Katakdagi butun son, bo'sh bo'lsa default (forma maydoni - satr bo'lishi mumkin)"""
+    return int(_text(value) or _text(default))
+
+
+def _test_fields(row, title, defaults):
+    """Test sozlamalarini tekshirish. (maydonlar, xatolar) qaytariladi."""
+    errors = []
+    subject = _text(row.get('subject')) or defaults.get('subject', '')
+    difficulty = _text(row.get('difficulty')) or defaults.get('difficulty') or 'medium'
+    if subject not in SUBJECTS:
+        errors.append(f"Noma'lum fan: '{subject}'")
+    if difficulty not in DIFFICULTIES:
+        errors.append(f"Noma'lum qiyinlik: '{difficulty}'")
+    try:
+        duration = _number(row.get('duration'), defaults.get('duration') or 30)
+        passing_score = _number(row.get('passing_score'), defaults.get('passing_score') or 60)
+    except ValueError:
+        errors.append("duration va passing_score butun son bo'lishi kerak")
+    else:
+        if duration <= 0:
+            errors.append("duration musbat bo'lishi kerak")
+        if not 0 <= passing_score <= 100:
+            errors.append("passing_score 0 dan 100 gacha bo'lishi kerak")
+
+    if errors:
+        return None, errors
+    return {
+        'title': title[:255],
+        'subject': subject,
+        'difficulty': difficulty,
+        'duration': duration,
+        'passing_score': passing_score,
+        'description': _text(row.get('description')),
+    }, []
+
+
+def _question_fields(row):
+    """Savol qatorini tekshirish. (maydonlar, xatolar) qaytariladi."""
+    errors = []
+    fields = {name: _text(row.get(name)) for name in QUESTION_COLUMNS}
+    fields['correct_answer'] = fields['correct_answer'].upper()
+    fields['explanation'] = _text(row.get('explanation'))
+    fields['topic'] = _text(row.get('topic'))[:100]
+
+    if not fields['question_text']:
+        errors.append('Savol matni bo\'sh')
+    for name in ('option_a', 'option_b', 'option_c', 'option_d'):
+        if not fields[name]:
+            errors.append(f"{name} bo'sh")
+        elif len(fields[name]) > OPTION_MAX_LENGTH:
+            errors.append(f"{name} {OPTION_MAX_LENGTH} belgidan uzun")
+    if fields['correct_answer'] not in ANSWERS:
+        errors.append("correct_answer A, B, C yoki D bo'lishi kerak")
+    return (None if errors else fields), errors
+
+
+class _Import:
+    def __init__(self, defaults):
+        self.defaults = defaults
+        self.tests = {}         # (varaq, sarlavha) -> {'test', 'count'} yoki None (noto'g'ri)
+        self.batch = []
+        self.errors = []
+        self.error_count = 0
+
+    def error(self, sheet, row, messages):
+        self.error_count += 1
+        if len(self.errors) < MAX_ERRORS:
+            self.errors.append({'sheet': sheet, 'row': row, 'errors': messages})
+
+    def flush(self):
+        Question.objects.bulk_create(self.batch)
+        by_test = {}
+        for question in self.batch:
+            by_test.setdefault(question.test_id, (question.test, []))[1].append(question)
+        for test, questions in by_test.values():
+            bank.add_many(questions, test)
+        self.batch = []
+
+    def test_for(self, sheet, row_number, row):
+        title = _text(row.get('test_title')) or sheet
+        key = (sheet, title)
+        if key not in self.tests:
+            fields, errors = _test_fields(row, title, self.defaults)
+            if errors:
+                self.error(sheet, row_number, errors)
+                self.tests[key] = None
+            else:
+                self.tests[key] = {'sheet': sheet, 'test': MockTest.objects.create(**fields), 'count': 0}
+        return self.tests[key]
+
+    def add_row(self, sheet, row_number, row):
+        fields, errors = _question_fields(row)
+        if errors:
+            self.error(sheet, row_number, errors)
+            return
+        entry = self.test_for(sheet, row_number, row)
+        if entry is None:
+            return
+        entry['count'] += 1
+        self.batch.append(Question(test=entry['test'], order=entry['count'], **fields))
+        if len(self.batch) >= BATCH_SIZE:
+            self.flush()
+
+    def read_sheet(self, sheet):
+        rows = sheet.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        columns = [_text(value).lower() for value in header]
+        missing = [name for name in QUESTION_COLUMNS if name not in columns]
+        if missing:
+            self.error(sheet.title, 1, [f"Ustunlar yo'q: {', '.join(missing)}"])
+            return
+
+        for row_number, values in enumerate(rows, start=2):
+            if not any(value not in (None, '') for value in values):
+                continue
+            self.add_row(sheet.title, row_number, dict(zip(columns, values)))
+
+    def finish(self):
+        self.flush()
+        created = []
+        for entry in self.tests.values():
+            if entry is None:
+                continue
+            test = entry['test']
+            if entry['count']:
+                MockTest.objects.filter(pk=test.pk).update(questions_count=entry['count'])
+                created.append({'sheet': entry['sheet'], 'test_id': test.pk, 'title': test.title,
+                                'questions': entry['count']})
+            else:
+                test.delete()
+        return created
+
+
+def import_workbook(file, defaults=None):
+    """Excel faylidan testlarni import qilish
+
+    defaults - faylda ko'rsatilmagan test sozlamalari (subject, difficulty, ...).
+    {'tests': [...], 'errors': [...], 'error_count': n} qaytariladi.
+    """
+    workbook = load_workbook(file, read_only=True, data_only=True)
+    job = _Import(defaults or {})
+    try:
+        with transaction.atomic():
+            for sheet in workbook.worksheets:
+                job.read_sheet(sheet)
+            tests = job.finish()
+    finally:
+        workbook.close()
+    return {'tests': tests, 'errors': job.errors, 'error_count': job.error_count}
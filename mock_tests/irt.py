@@ -0,0 +1,67 @@
+"""
+IRT (2 parametrli logistik model) hisoblari - moslashuvchan test uchun.
+
+    P(θ) = 1 / (1 + exp(-a (θ - b)))
+    I(θ) = a² P (1 - P)          - savolning Fisher axboroti
+
+Qobiliyat (θ) MAP bilan baholanadi: N(0, 1) apriori taqsimot bilan
+Nyuton-Rafson. Apriori tufayli hamma javob to'g'ri/noto'g'ri bo'lganda
+ham baho chekli, standart xato esa 1 / sqrt(I(θ) + 1).
+
+Bu yerdagi hisoblar so'rov ichida bajariladi va o'nlab savol bilan
+ishlaydi, shuning uchun oddiy Python; parametrlarni kalibrlash
+(calibration.py) esa NumPy bilan.
+"""
+import math
+
+THETA_LIMIT = 4.0
+MAX_ITERATIONS = 30
+TOLERANCE = 1e-4
+
+
+def probability(a, b, theta):
+    """To'g'ri javob ehtimoli"""
+    z = a * (theta - b)
+    if z < -30:
+        return 0.0
+    return 1 / (1 + math.exp(-z))
+
+
+def information(a, b, theta):
+    """Savolning θ nuqtadagi Fisher axboroti"""
+    p = probability(a, b, theta)
+    return a * a * p * (1 - p)
+
+
+def estimate(responses):
+    """[(a, b, to'g'ri)] bo'yicha (θ, standart xato)"""
+    theta = 0.0
+    for _ in range(MAX_ITERATIONS):
+        gradient, info = -theta, 1.0
+        for a, b, correct in responses:
+            p = probability(a, b, theta)
+            gradient += a * ((1 if correct else 0) - p)
+            info += a * a * p * (1 - p)
+        step = gradient / info
+        theta = max(-THETA_LIMIT, min(THETA_LIMIT, theta + step))
+        if abs(step) < TOLERANCE:
+            break
+    info = 1.0 + sum(information(a, b, theta) for a, b, _ in responses)
+    return theta, 1 / math.sqrt(info)
+
+
+def best_item(items, asked, theta):
+    """Berilmagan savollardan θ da eng ko'p axborot beradigani ({id: (a, b)}) yoki None"""
+    best, best_info = None, -1.0
+    for question_id, (a, b) in items.items():
+        if question_id in asked:
+            continue
+        info = information(a, b, theta)
+        if info > best_info:
+            best, best_info = question_id, info
+    return best
+
+
+def score(theta):
+    """θ ni 0-100 ballga o'tkazish: kalibrlash guruhidagi persentil (θ ~ N(0, 1))"""
+    return int(round(50 * (1 + math.erf(theta / math.sqrt(2)))))
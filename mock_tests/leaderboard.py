@@ -0,0 +1,180 @@
+"""
+Mock test reyting jadvallari.
+
+Har bir test ('test:<id>') va fan ('subject:<fan>') uchun o'qituvchining eng
+yaxshi natijasi bitta LeaderboardEntry qatori: ball kamayishi, teng ballda
+sarflangan vaqt o'sishi bo'yicha tartiblanadi. Maktab reytingi - xuddi shu
+jadval school bo'yicha filtrlangan.
+
+Urinish yaratilganda (signals.py) yozuv INSERT ... ON CONFLICT DO NOTHING
+bilan qo'shiladi, mavjud bo'lsa shartli UPDATE bilan faqat natija
+yaxshilangan bo'lsa yangilanadi - urinishlar qayta saralanmaydi. O'rin
+yaxshiroq yozuvlar soni + 1: (board[, school], -score, time_spent)
+indeksidagi oraliq hisoblanadi. Sahifalar kalit bo'yicha (keyset) o'qiladi.
+
+Moslashuvchan (IRT) urinishlar jadvalga kirmaydi: ularning bali to'g'ri
+javoblar foizi emas, qobiliyat persentili (ability bor urinishlar).
+"""
+from django.db import transaction
+from django.db.models import Q
+
+from .models import LeaderboardEntry, TestAttempt
+
+BATCH_SIZE = 2000
+ORDERING = ('-score', 'time_spent', '-id')
+
+
+def test_board(test_id):
+    return f'test:{test_id}'
+
+
+def subject_board(subject):
+    return f'subject:{subject}'
+
+
+def _boards(test):
+    """(board, test_id yoki None)"""
+    return [(test_board(test.pk), test.pk), (subject_board(test.subject), None)]
+
+
+def ranked_attempts():
+    """Jadvalga kiradigan urinishlar - moslashuvchan rejimdagilardan tashqari"""
+    return TestAttempt.objects.filter(ability__isnull=True)
+
+
+def _school_id(user_id):
+    from teachers.models import Teacher
+    return Teacher.objects.filter(user_id=user_id).values_list('school_id', flat=True).first()
+
+
+def _better(score, time_spent):
+    return Q(score__gt=score) | Q(score=score, time_spent__lt=time_spent)
+
+
+def _worse(score, time_spent):
+    return Q(score__lt=score) | Q(score=score, time_spent__gt=time_spent)
+
+
+def _values(attempt, school_id):
+    return {
+        'score': attempt.score,
+        'time_spent': attempt.time_spent,
+        'best_attempt': attempt.pk,
+        'achieved_at': attempt.completed_at,
+        'school_id': school_id,
+    }
+
+
+def record(attempt):
+    """Yangi urinishni jadvallarga qo'shish (natija yaxshilangan bo'lsagina yoziladi)"""
+    if attempt.ability is not None:
+        return
+    school_id = _school_id(attempt.teacher_id)
+    values = _values(attempt, school_id)
+    boards = _boards(attempt.test)
+    # Avval INSERT: parallel birinchi urinishlardan biri qo'shadi, qolganlari
+    # keyingi UPDATE da (qo'shilgan qatorni ko'rib) natijasini solishtiradi
+    LeaderboardEntry.objects.bulk_create([
+        LeaderboardEntry(board=board, test_id=test_id, teacher_id=attempt.teacher_id, **values)
+        for board, test_id in boards
+    ], ignore_conflicts=True)
+    for board, _ in boards:
+        LeaderboardEntry.objects.filter(board=board, teacher_id=attempt.teacher_id).filter(
+            _worse(attempt.score, attempt.time_spent)
+        ).update(**values)
+
+
+def remove(attempt):
+    """O'chirilgan urinish eng yaxshisi bo'lgan jadvallarda keyingi eng yaxshisini tiklash"""
+    entries = LeaderboardEntry.objects.filter(teacher_id=attempt.teacher_id, best_attempt=attempt.pk)
+    for entry in entries:
+        filters = {'test_id': entry.test_id} if entry.test_id else {'test__subject': entry.board.split(':', 1)[1]}
+        best = ranked_attempts().filter(teacher_id=attempt.teacher_id, **filters).exclude(
+            pk=attempt.pk
+        ).order_by('-score', 'time_spent', 'id').first()
+        if best is None:
+            entry.delete()
+            continue
+        for name, value in _values(best, entry.school_id).items():
+            setattr(entry, name, value)
+        entry.save()
+
+
+def move_teacher(user_id, school_id):
+    """O'qituvchi maktabi o'zgarganda yozuvlarini ko'chirish"""
+    LeaderboardEntry.objects.filter(teacher_id=user_id).exclude(school_id=school_id).update(school_id=school_id)
+
+
+def entries(board, school_id=None):
+    queryset = LeaderboardEntry.objects.filter(board=board)
+    if school_id is not None:
+        queryset = queryset.filter(school_id=school_id)
+    return queryset
+
+
+def rank(entry, school_id=None):
+    """Yozuvning o'rni: yaxshiroq natijalar soni + 1 (teng natijalar bir xil o'rinda)"""
+    return entries(entry.board, school_id).filter(_better(entry.score, entry.time_spent)).count() + 1
+
+
+def ranked(page, school_id=None):
+    """Sahifadagi yozuvlar (ORDERING tartibida) va ularning o'rinlari"""
+    if not page:
+        return []
+    first = page[0]
+    tied = Q(score=first.score, time_spent=first.time_spent)
+    # Sahifadan oldingi yozuvlar soni (birinchi yozuv bilan teng bo'lganlari ham)
+    ahead = entries(first.board, school_id).filter(
+        _better(first.score, first.time_spent) | (tied & Q(id__gt=first.id))
+    ).count()
+    place = rank(first, school_id)
+    result, previous = [], None
+    for index, entry in enumerate(page):
+        if previous is not None and (entry.score, entry.time_spent) != previous:
+            place = ahead + index + 1
+        result.append((place, entry))
+        previous = (entry.score, entry.time_spent)
+    return result
+
+
+def position(board, user_id, school_id=None):
+    """Foydalanuvchining jadvaldagi yozuvi va o'rni: (o'rin, yozuv) yoki None"""
+    entry = entries(board, school_id).filter(teacher_id=user_id).first()
+    if entry is None:
+        return None
+    return rank(entry, school_id), entry
+
+
+def rebuild():
+    """Jadvallarni barcha urinishlardan qayta qurish. Yozuvlar soni qaytariladi."""
+    from teachers.models import Teacher
+
+    schools = dict(Teacher.objects.values_list('user_id', 'school_id'))
+    attempts = ranked_attempts().order_by('teacher_id', '-score', 'time_spent', 'id').values_list(
+        'id', 'teacher_id', 'test_id', 'test__subject', 'score', 'time_spent', 'completed_at'
+    )
+    count = 0
+    with transaction.atomic():
+        LeaderboardEntry.objects.all().delete()
+        batch, seen, current = [], set(), None
+        for attempt_id, teacher_id, test_id, subject, score, time_spent, completed_at in attempts.iterator(
+            chunk_size=BATCH_SIZE
+        ):
+            if teacher_id != current:
+                seen, current = set(), teacher_id
+            # Har bir o'qituvchi uchun birinchi uchragan urinish - eng yaxshisi
+            for board, board_test in ((test_board(test_id), test_id), (subject_board(subject), None)):
+                if board in seen:
+                    continue
+                seen.add(board)
+                batch.append(LeaderboardEntry(
+                    board=board, test_id=board_test, teacher_id=teacher_id, school_id=schools.get(teacher_id),
+                    score=score, time_spent=time_spent, best_attempt=attempt_id, achieved_at=completed_at,
+                ))
+            if len(batch) >= BATCH_SIZE:
+                LeaderboardEntry.objects.bulk_create(batch)
+                count += len(batch)
+                batch = []
+        LeaderboardEntry.objects.bulk_create(batch)
+        count += len(batch)
+    return count
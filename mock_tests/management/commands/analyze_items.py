@@ -0,0 +1,26 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from mock_tests.analysis import analyze
+
+
+class Command(BaseCommand):
+    help = "Mock test savollari tahlilini yangi urinishlar bilan yangilash"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--test', type=int, action='append', help="Faqat shu test(lar)")
+        parser.add_argument('--rebuild', action='store_true', help="Tahlilni boshidan hisoblash")
+        parser.add_argument('--watch', action='store_true', help="Yangi urinishlarni davriy qo'shib borish")
+        parser.add_argument('--interval', type=float, default=settings.ITEM_ANALYSIS_INTERVAL,
+                            help="--watch rejimida ishga tushirishlar orasidagi vaqt (soniya)")
+
+    def handle(self, *args, **options):
+        count = analyze(options['test'], rebuild=options['rebuild'])
+        self.stdout.write(self.style.SUCCESS(f"{count} ta urinish tahlil qilindi"))
+        while options['watch']:
+            time.sleep(options['interval'])
+            count = analyze(options['test'])
+            if count:
+                self.stdout.write(f"{count} ta urinish tahlil qilindi")
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from mock_tests.calibration import calibrate
+
+
+class Command(BaseCommand):
+    help = "Moslashuvchan test uchun savollarning IRT parametrlarini urinishlardan kalibrlash"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--test', type=int, action='append', help="Faqat shu test(lar), yangi urinish bo'lmasa ham")
+
+    def handle(self, *args, **options):
+        count = calibrate(options['test'])
+        self.stdout.write(self.style.SUCCESS(f"{count} ta savol kalibrlandi"))
@@ -0,0 +1,25 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from mock_tests.sessions import flush
+
+
+class Command(BaseCommand):
+    help = "Test sessiyalari javoblarini keshdan bazaga yozish va muddati o'tganlarini yakunlash"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help="Bir marta bajarish")
+        parser.add_argument('--interval', type=float, default=settings.ATTEMPT_FLUSH_INTERVAL,
+                            help="Yozishlar orasidagi vaqt (soniya)")
+
+    def handle(self, *args, **options):
+        while True:
+            saved, finished = flush()
+            if saved or finished:
+                self.stdout.write(f"{saved} ta sessiya yozildi, {finished} ta yakunlandi")
+
+            if options['once']:
+                return
+            time.sleep(options['interval'])
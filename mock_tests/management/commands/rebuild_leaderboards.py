@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from mock_tests.leaderboard import rebuild
+
+
+class Command(BaseCommand):
+    help = "Mock test reyting jadvallarini barcha urinishlardan qayta qurish"
+
+    def handle(self, *args, **options):
+        count = rebuild()
+        self.stdout.write(self.style.SUCCESS(f"{count} ta yozuv yaratildi"))
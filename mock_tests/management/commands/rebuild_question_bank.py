@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from mock_tests.bank import rebuild
+
+
+class Command(BaseCommand):
+    help = "Savollar banki indeksini (tasodifiy variantlar uchun) qayta qurish"
+
+    def handle(self, *args, **options):
+        count = rebuild()
+        self.stdout.write(self.style.SUCCESS(f"{count} ta savol indekslandi"))
@@ -0,0 +1,45 @@
+# Generated by Django 4.2.7 on 2026-10-18 11:49
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mock_tests', '0002_alter_mocktest_options'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QuestionStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('correct', models.IntegerField(default=0)),
+                ('option_a', models.IntegerField(default=0)),
+                ('option_b', models.IntegerField(default=0)),
+                ('option_c', models.IntegerField(default=0)),
+                ('option_d', models.IntegerField(default=0)),
+                ('blank', models.IntegerField(default=0)),
+                ('score_correct_sum', models.FloatField(default=0, help_text="To'g'ri javob berganlarning umumiy ballari yig'indisi")),
+                ('time_correct_sum', models.FloatField(default=0)),
+                ('p_value', models.FloatField(blank=True, help_text="To'g'ri javoblar ulushi", null=True)),
+                ('discrimination', models.FloatField(blank=True, help_text='Nuqta-biserial korrelyatsiya', null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('question', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='stats', to='mock_tests.question')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ItemAnalysis',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('last_attempt_id', models.BigIntegerField(default=0)),
+                ('attempts', models.IntegerField(default=0)),
+                ('score_sum', models.FloatField(default=0)),
+                ('score_sq_sum', models.FloatField(default=0)),
+                ('time_sum', models.FloatField(default=0, help_text="Savolga o'rtacha vaqtlar yig'indisi (soniya)")),
+                ('analyzed_at', models.DateTimeField(auto_now=True)),
+                ('test', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='item_analysis', to='mock_tests.mocktest')),
+            ],
+        ),
+    ]
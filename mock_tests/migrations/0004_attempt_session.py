@@ -0,0 +1,45 @@
+# Generated by Django 4.2.7 on 2026-10-18 11:51
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('mock_tests', '0003_item_analysis'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='testattempt',
+            name='started_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.CreateModel(
+            name='AttemptSession',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('active', 'Davom etmoqda'), ('finished', 'Yakunlangan')], default='active', max_length=20)),
+                ('answers', models.JSONField(default=dict)),
+                ('revision', models.IntegerField(default=0)),
+                ('started_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('expires_at', models.DateTimeField()),
+                ('saved_at', models.DateTimeField(blank=True, null=True)),
+                ('attempt', models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='session', to='mock_tests.testattempt')),
+                ('teacher', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='test_sessions', to=settings.AUTH_USER_MODEL)),
+                ('test', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='sessions', to='mock_tests.mocktest')),
+            ],
+            options={
+                'ordering': ['-started_at'],
+                'indexes': [models.Index(fields=['status', 'expires_at'], name='test_session_status_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='attemptsession',
+            constraint=models.UniqueConstraint(condition=models.Q(('status', 'active')), fields=('teacher', 'test'), name='unique_active_test_session'),
+        ),
+    ]
@@ -0,0 +1,86 @@
+# Generated by Django 4.2.7 on 2026-10-18 11:53
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def fill_bank(apps, schema_editor):
+    """Mavjud savollarni bank indeksiga qo'shish"""
+    Question = apps.get_model('mock_tests', 'Question')
+    QuestionBankSlot = apps.get_model('mock_tests', 'QuestionBankSlot')
+
+    sizes = {}
+    batch = []
+    questions = Question.objects.order_by('id').values_list('id', 'test__subject', 'test__difficulty', 'topic')
+    for question_id, subject, difficulty, topic in questions.iterator(chunk_size=2000):
+        group = (subject, difficulty, topic)
+        slot = sizes.get(group, 0)
+        sizes[group] = slot + 1
+        batch.append(QuestionBankSlot(
+            question_id=question_id, subject=subject, difficulty=difficulty, topic=topic, slot=slot
+        ))
+        if len(batch) >= 2000:
+            QuestionBankSlot.objects.bulk_create(batch)
+            batch = []
+    QuestionBankSlot.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mock_tests', '0004_attempt_session'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='attemptsession',
+            name='question_ids',
+            field=models.JSONField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='attemptsession',
+            name='variant_seed',
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='mocktest',
+            name='is_randomized',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='mocktest',
+            name='variant_spec',
+            field=models.JSONField(blank=True, default=list),
+        ),
+        migrations.AddField(
+            model_name='question',
+            name='topic',
+            field=models.CharField(blank=True, default='', max_length=100),
+        ),
+        migrations.AddField(
+            model_name='testattempt',
+            name='question_ids',
+            field=models.JSONField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='testattempt',
+            name='variant_seed',
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+        migrations.CreateModel(
+            name='QuestionBankSlot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('subject', models.CharField(max_length=50)),
+                ('difficulty', models.CharField(max_length=20)),
+                ('topic', models.CharField(blank=True, max_length=100)),
+                ('slot', models.IntegerField()),
+                ('question', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='bank_slot', to='mock_tests.question')),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='questionbankslot',
+            constraint=models.UniqueConstraint(fields=('subject', 'difficulty', 'topic', 'slot'), name='unique_question_bank_slot'),
+        ),
+        migrations.RunPython(fill_bank, migrations.RunPython.noop),
+    ]
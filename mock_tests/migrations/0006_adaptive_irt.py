@@ -0,0 +1,53 @@
+# Generated by Django 4.2.7 on 2026-10-18 11:57
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mock_tests', '0005_question_bank'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ItemParameters',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('discrimination', models.FloatField(help_text='a - diskriminatsiya')),
+                ('difficulty', models.FloatField(help_text='b - qiyinlik (θ shkalasida)')),
+                ('responses', models.IntegerField(default=0)),
+                ('last_attempt_id', models.BigIntegerField(default=0)),
+                ('calibrated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.RemoveConstraint(
+            model_name='attemptsession',
+            name='unique_active_test_session',
+        ),
+        migrations.AddField(
+            model_name='attemptsession',
+            name='mode',
+            field=models.CharField(choices=[('timed', 'Vaqtli'), ('adaptive', 'Moslashuvchan')], default='timed', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='testattempt',
+            name='ability',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='testattempt',
+            name='ability_se',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddConstraint(
+            model_name='attemptsession',
+            constraint=models.UniqueConstraint(condition=models.Q(('status', 'active')), fields=('teacher', 'test', 'mode'), name='unique_active_test_session'),
+        ),
+        migrations.AddField(
+            model_name='itemparameters',
+            name='question',
+            field=models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='irt', to='mock_tests.question'),
+        ),
+    ]
@@ -0,0 +1,91 @@
+from django.db import migrations, transaction
+
+CHUNK_SIZE = 2000
+CODES = 'ABCD'
+
+
+def _letter(value):
+    value = value.strip().upper() if isinstance(value, str) else ''
+    return value if len(value) == 1 and value in CODES else '-'
+
+
+def _encode(given):
+    """packing.encode nusxasi - migratsiya ilova kodiga bog'lanmasligi uchun"""
+    size = len(given)
+    mask = bytearray((size + 7) // 8)
+    codes = bytearray((size + 3) // 4)
+    for position, letter in enumerate(given):
+        if letter not in CODES:
+            continue
+        mask[position >> 3] |= 1 << (position & 7)
+        codes[position >> 2] |= CODES.index(letter) << ((position & 3) * 2)
+    return bytes(mask + codes)
+
+
+def _chunks(TestAttempt, fields):
+    """Urinishlar ID bo'yicha CHUNK_SIZE tadan"""
+    last_id = 0
+    while True:
+        chunk = list(TestAttempt.objects.filter(id__gt=last_id).order_by('id').only(*fields)[:CHUNK_SIZE])
+        if not chunk:
+            return
+        yield chunk
+        last_id = chunk[-1].id
+
+
+def _answered_ids(TestAttempt):
+    """Har bir test urinishlarida javob berilgan savollar ID lari (o'chirilganlari ham)"""
+    answered = {}
+    for chunk in _chunks(TestAttempt, ['id', 'test_id', 'answers', 'question_ids']):
+        for attempt in chunk:
+            if attempt.question_ids is not None or not isinstance(attempt.answers, dict):
+                continue
+            answered.setdefault(attempt.test_id, set()).update(
+                int(key) for key in attempt.answers if str(key).isdigit()
+            )
+    return answered
+
+
+def pack_answers(apps, schema_editor):
+    """Mavjud urinishlar javoblarini layout 1 tartibida joylash
+
+    Layout 1 - testning joriy savollari, oxirida urinishlarda javob berilgan,
+    lekin keyin o'chirilgan savollar: eski javoblar yo'qolmaydi.
+    """
+    MockTest = apps.get_model('mock_tests', 'MockTest')
+    Question = apps.get_model('mock_tests', 'Question')
+    TestAttempt = apps.get_model('mock_tests', 'TestAttempt')
+    AnswerLayout = apps.get_model('mock_tests', 'AnswerLayout')
+
+    answered = _answered_ids(TestAttempt)
+    layouts = {}
+    for test_id in MockTest.objects.values_list('id', flat=True):
+        ids = list(Question.objects.filter(test_id=test_id).order_by('order', 'id').values_list('id', flat=True))
+        ids += sorted(answered.get(test_id, set()) - set(ids))
+        AnswerLayout.objects.update_or_create(test_id=test_id, version=1, defaults={'question_ids': ids})
+        layouts[test_id] = ids
+
+    for chunk in _chunks(TestAttempt, ['id', 'test_id', 'answers', 'question_ids']):
+        for attempt in chunk:
+            answers = attempt.answers if isinstance(attempt.answers, dict) else {}
+            if attempt.question_ids is not None:
+                ids, attempt.layout_version = attempt.question_ids, None
+            else:
+                ids, attempt.layout_version = layouts[attempt.test_id], 1
+            attempt.answers_packed = _encode(''.join(_letter(answers.get(str(pk))) for pk in ids))
+        with transaction.atomic():
+            TestAttempt.objects.bulk_update(chunk, ['answers_packed', 'layout_version'])
+
+
+class Migration(migrations.Migration):
+    # Har bir bo'lak alohida tranzaksiyada yoziladi
+    atomic = False
+
+    dependencies = [
+        ('mock_tests', '0007_packed_answers'),
+    ]
+
+    operations = [
+        # JSON answers ustuni saqlanadi - orqaga qaytishda tiklash kerak emas
+        migrations.RunPython(pack_answers, migrations.RunPython.noop),
+    ]
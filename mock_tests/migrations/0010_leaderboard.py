@@ -0,0 +1,68 @@
+# Generated by Django 4.2.7 on 2026-10-18 12:05
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def fill_leaderboards(apps, schema_editor):
+    """Mavjud urinishlardan reyting jadvallarini qurish (leaderboard.rebuild bilan bir xil)"""
+    TestAttempt = apps.get_model('mock_tests', 'TestAttempt')
+    Teacher = apps.get_model('teachers', 'Teacher')
+    LeaderboardEntry = apps.get_model('mock_tests', 'LeaderboardEntry')
+
+    schools = dict(Teacher.objects.values_list('user_id', 'school_id'))
+    attempts = TestAttempt.objects.filter(ability__isnull=True).order_by('teacher_id', '-score', 'time_spent', 'id').values_list(
+        'id', 'teacher_id', 'test_id', 'test__subject', 'score', 'time_spent', 'completed_at'
+    )
+    batch, seen, current = [], set(), None
+    for attempt_id, teacher_id, test_id, subject, score, time_spent, completed_at in attempts.iterator(chunk_size=2000):
+        if teacher_id != current:
+            seen, current = set(), teacher_id
+        for board, board_test in ((f'test:{test_id}', test_id), (f'subject:{subject}', None)):
+            if board in seen:
+                continue
+            seen.add(board)
+            batch.append(LeaderboardEntry(
+                board=board, test_id=board_test, teacher_id=teacher_id, school_id=schools.get(teacher_id),
+                score=score, time_spent=time_spent, best_attempt=attempt_id, achieved_at=completed_at,
+            ))
+        if len(batch) >= 2000:
+            LeaderboardEntry.objects.bulk_create(batch)
+            batch = []
+    LeaderboardEntry.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('schools', '0002_initial'),
+        ('teachers', '0005_pointsentry'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('mock_tests', '0008_pack_existing_answers'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LeaderboardEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('board', models.CharField(max_length=64)),
+                ('score', models.IntegerField()),
+                ('time_spent', models.IntegerField(help_text='Soniyalarda')),
+                ('best_attempt', models.BigIntegerField(help_text='Eng yaxshi urinish ID si')),
+                ('achieved_at', models.DateTimeField()),
+                ('school', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='schools.school')),
+                ('teacher', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='leaderboard_entries', to=settings.AUTH_USER_MODEL)),
+                ('test', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='leaderboard_entries', to='mock_tests.mocktest')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['board', '-score', 'time_spent'], name='leaderboard_rank_idx'), models.Index(fields=['board', 'school', '-score', 'time_spent'], name='leaderboard_school_rank_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='leaderboardentry',
+            constraint=models.UniqueConstraint(fields=('board', 'teacher'), name='unique_leaderboard_entry'),
+        ),
+        migrations.RunPython(fill_leaderboards, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 4.2.7 on 2026-10-18 12:17
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('mock_tests', '0010_leaderboard'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IssuedVariant',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('seed', models.BigIntegerField()),
+                ('question_ids', models.JSONField(default=list)),
+                ('issued_at', models.DateTimeField(auto_now_add=True)),
+                ('teacher', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='issued_variants', to=settings.AUTH_USER_MODEL)),
+                ('test', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='issued_variants', to='mock_tests.mocktest')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['issued_at'], name='issued_variant_issued_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='issuedvariant',
+            constraint=models.UniqueConstraint(fields=('teacher', 'test', 'seed'), name='unique_issued_variant'),
+        ),
+    ]
@@ -1,4 +1,5 @@
 from django.db import models
+from django.utils import timezone
 from users.models import User
 
 
@@ -31,6 +32,10 @@ class MockTest(models.Model):
     passing_score = models.IntegerField(default=60, help_text="O'tish bali (foizda)")
     questions_count = models.IntegerField(default=20)
     description = models.TextField(blank=True)
+    # Tasodifiy variantlar: savollar bankdan olinadi (bank.py)
+    # [{"subject": "math", "difficulty": "easy", "topic": "", "count": 10}, ...]
+    is_randomized = models.BooleanField(default=False)
+    variant_spec = models.JSONField(default=list, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -50,6 +55,7 @@ class Question(models.Model):
     option_d = models.CharField(max_length=500)
     correct_answer = models.CharField(max_length=1, choices=[('A', 'A'), ('B', 'B'), ('C', 'C'), ('D', 'D')])
     explanation = models.TextField(blank=True)
+    topic = models.CharField(max_length=100, blank=True, default='')
     order = models.IntegerField(default=0)
 
     class Meta:
@@ -59,6 +65,54 @@ class Question(models.Model):
         return f"{self.test.title} - Q{self.order}"
 
 
+class QuestionBankSlot(models.Model):
+    """Savollar banki indeksi (bank.py)
+
+    Har bir (fan, qiyinlik, mavzu) guruhida savollar 0..n-1 zich raqamlangan,
+    shuning uchun tasodifiy tanlash ORDER BY RANDOM() siz - raqamlar
+    tanlanib, indeks bo'yicha o'qiladi.
+    """
+    question = models.OneToOneField(Question, on_delete=models.CASCADE, related_name='bank_slot')
+    subject = models.CharField(max_length=50)
+    difficulty = models.CharField(max_length=20)
+    topic = models.CharField(max_length=100, blank=True)
+    slot = models.IntegerField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['subject', 'difficulty', 'topic', 'slot'], name='unique_question_bank_slot'
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.subject}/{self.difficulty}/{self.topic or '-'} #{self.slot}"
+
+
+class IssuedVariant(models.Model):
+    """O'qituvchiga berilgan tasodifiy variant (bank.issue)
+
+    Submit savollarni bankdan qayta yig'maydi - shu yerda saqlangan ro'yxat
+    bo'yicha baholaydi, shuning uchun bank o'zgarsa ham natija o'zgarmaydi.
+    """
+    teacher = models.ForeignKey(User, on_delete=models.CASCADE, related_name='issued_variants')
+    test = models.ForeignKey(MockTest, on_delete=models.CASCADE, related_name='issued_variants')
+    seed = models.BigIntegerField()
+    question_ids = models.JSONField(default=list)
+    issued_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['teacher', 'test', 'seed'], name='unique_issued_variant'),
+        ]
+        indexes = [
+            models.Index(fields=['issued_at'], name='issued_variant_issued_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.teacher.username} - {self.test.title} #{self.seed}"
+
+
 class TestAttempt(models.Model):
     teacher = models.ForeignKey(User, on_delete=models.CASCADE, related_name='test_attempts')
     test = models.ForeignKey(MockTest, on_delete=models.CASCADE, related_name='attempts')
@@ -68,12 +122,177 @@ class TestAttempt(models.Model):
     total_questions = models.IntegerField()
     time_spent = models.IntegerField(help_text="Soniyalarda")
     passed = models.BooleanField(default=False)
+    # Asl javoblar (JSON). Hozircha packed bilan birga yoziladi: A-D dan
+    # boshqa qiymatlar yo'qolmaydi va eski versiyaga qaytish mumkin.
+    # O'qish answers_packed dan; ustun keyingi relizda o'chiriladi.
     answers = models.JSONField(default=dict)
-    started_at = models.DateTimeField(auto_now_add=True)
+    # Javoblar bitlarga joylangan (packing.py), layout_version tartibida;
+    # layout_version bo'lmasa question_ids tartibida
+    answers_packed = models.BinaryField(default=b'')
+    layout_version = models.IntegerField(null=True, blank=True)
+    # Tasodifiy variant: seed va qayta baholash uchun tanlangan savollar
+    variant_seed = models.BigIntegerField(null=True, blank=True)
+    question_ids = models.JSONField(null=True, blank=True)
+    # Moslashuvchan (IRT) rejim: baholangan qobiliyat va uning standart xatosi;
+    # faqat shu rejimda to'ldiriladi (score - persentil, reyting/statistikaga kirmaydi)
+    ability = models.FloatField(null=True, blank=True)
+    ability_se = models.FloatField(null=True, blank=True)
+    started_at = models.DateTimeField(default=timezone.now)
     completed_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['-started_at']
 
     def __str__(self):
-        return f"{self.teacher.username} - {self.test.title} - {self.score}%"
\ No newline at end of file
+        return f"{self.teacher.username} - {self.test.title} - {self.score}%"
+
+class AnswerLayout(models.Model):
+    """Testning urinish javoblari saqlanadigan savollar tartibi (packing.py)"""
+    test = models.ForeignKey(MockTest, on_delete=models.CASCADE, related_name='answer_layouts')
+    version = models.IntegerField()
+    question_ids = models.JSONField(default=list)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['test', 'version'], name='unique_answer_layout'),
+        ]
+
+    def __str__(self):
+        return f"{self.test.title} - v{self.version}"
+
+
+class AttemptSession(models.Model):
+    """Server tomonidan vaqti o'lchanadigan test urinishi (sessions.py)
+
+    Javoblar avval keshdagi buferga yoziladi, answers/revision esa bufer
+    bazaga oxirgi marta yozilgan holatni saqlaydi. Moslashuvchan rejimda
+    (adaptive.py) bufer yo'q: question_ids berilgan savollar tartibi.
+    """
+    STATUS_CHOICES = [
+        ('active', 'Davom etmoqda'),
+        ('finished', 'Yakunlangan'),
+    ]
+
+    MODE_CHOICES = [
+        ('timed', 'Vaqtli'),
+        ('adaptive', 'Moslashuvchan'),
+    ]
+
+    teacher = models.ForeignKey(User, on_delete=models.CASCADE, related_name='test_sessions')
+    test = models.ForeignKey(MockTest, on_delete=models.CASCADE, related_name='sessions')
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='active')
+    mode = models.CharField(max_length=20, choices=MODE_CHOICES, default='timed')
+    answers = models.JSONField(default=dict)
+    revision = models.IntegerField(default=0)
+    variant_seed = models.BigIntegerField(null=True, blank=True)
+    question_ids = models.JSONField(null=True, blank=True)
+    started_at = models.DateTimeField(default=timezone.now)
+    expires_at = models.DateTimeField()
+    saved_at = models.DateTimeField(null=True, blank=True)
+    attempt = models.OneToOneField(
+        TestAttempt, on_delete=models.SET_NULL, null=True, blank=True, related_name='session'
+    )
+
+    class Meta:
+        ordering = ['-started_at']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['teacher', 'test', 'mode'],
+                condition=models.Q(status='active'),
+                name='unique_active_test_session',
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['status', 'expires_at'], name='test_session_status_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.teacher.username} - {self.test.title} ({self.status})"
+
+
+class ItemAnalysis(models.Model):
+    """Test bo'yicha savollar tahlilining holati (analysis.py)
+
+    last_attempt_id gacha bo'lgan urinishlar hisobga olingan; keyingi
+    ishga tushirishda faqat yangi urinishlar qo'shiladi. Urinish darajasidagi
+    yig'indilar (ball, ball kvadrati, savolga o'rtacha vaqt) shu yerda saqlanadi.
+    """
+    test = models.OneToOneField(MockTest, on_delete=models.CASCADE, related_name='item_analysis')
+    last_attempt_id = models.BigIntegerField(default=0)
+    attempts = models.IntegerField(default=0)
+    score_sum = models.FloatField(default=0)
+    score_sq_sum = models.FloatField(default=0)
+    time_sum = models.FloatField(default=0, help_text="Savolga o'rtacha vaqtlar yig'indisi (soniya)")
+    analyzed_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.test.title} - {self.attempts} urinish"
+
+
+class QuestionStats(models.Model):
+    """Savol statistikasi: qiyinlik (p), diskriminatsiya, javob variantlari ulushi"""
+    question = models.OneToOneField(Question, on_delete=models.CASCADE, related_name='stats')
+    correct = models.IntegerField(default=0)
+    option_a = models.IntegerField(default=0)
+    option_b = models.IntegerField(default=0)
+    option_c = models.IntegerField(default=0)
+    option_d = models.IntegerField(default=0)
+    blank = models.IntegerField(default=0)
+    score_correct_sum = models.FloatField(default=0, help_text="To'g'ri javob berganlarning umumiy ballari yig'indisi")
+    time_correct_sum = models.FloatField(default=0)
+    p_value = models.FloatField(null=True, blank=True, help_text="To'g'ri javoblar ulushi")
+    discrimination = models.FloatField(null=True, blank=True, help_text="Nuqta-biserial korrelyatsiya")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.question} - p={self.p_value}"
+
+
+class ItemParameters(models.Model):
+    """Savolning IRT (2PL) parametrlari - calibration.py hisoblaydi
+
+    P(to'g'ri | θ) = 1 / (1 + exp(-a (θ - b))). last_attempt_id gacha bo'lgan
+    urinishlar kalibrlashda ishlatilgan.
+    """
+    question = models.OneToOneField(Question, on_delete=models.CASCADE, related_name='irt')
+    discrimination = models.FloatField(help_text="a - diskriminatsiya")
+    difficulty = models.FloatField(help_text="b - qiyinlik (θ shkalasida)")
+    responses = models.IntegerField(default=0)
+    last_attempt_id = models.BigIntegerField(default=0)
+    calibrated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.question} - a={self.discrimination:.2f}, b={self.difficulty:.2f}"
+
+
+class LeaderboardEntry(models.Model):
+    """Reyting jadvalida o'qituvchining eng yaxshi natijasi (leaderboard.py)
+
+    board - 'test:<id>' yoki 'subject:<fan>'. Tartib: ball kamayishi, teng
+    ballda sarflangan vaqt o'sishi; o'rin = yaxshiroq yozuvlar soni + 1.
+    """
+    board = models.CharField(max_length=64)
+    test = models.ForeignKey(
+        MockTest, on_delete=models.CASCADE, null=True, blank=True, related_name='leaderboard_entries'
+    )
+    teacher = models.ForeignKey(User, on_delete=models.CASCADE, related_name='leaderboard_entries')
+    school = models.ForeignKey(
+        'schools.School', on_delete=models.SET_NULL, null=True, blank=True, related_name='+'
+    )
+    score = models.IntegerField()
+    time_spent = models.IntegerField(help_text="Soniyalarda")
+    best_attempt = models.BigIntegerField(help_text="Eng yaxshi urinish ID si")
+    achieved_at = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['board', 'teacher'], name='unique_leaderboard_entry'),
+        ]
+        indexes = [
+            models.Index(fields=['board', '-score', 'time_spent'], name='leaderboard_rank_idx'),
+            models.Index(fields=['board', 'school', '-score', 'time_spent'], name='leaderboard_school_rank_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.board} - {self.teacher.username}: {self.score}"
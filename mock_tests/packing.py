@@ -0,0 +1,121 @@
+"""
+Urinish javoblarini ixcham saqlash.
+
+Javoblar savollar tartibida (layout) bitlarga joylanadi:
+
+    [belgilangan bitlar: ceil(n / 8) bayt][javob kodlari: ceil(n / 4) bayt]
+
+Har bir savolga javob kodi uchun 2 bit (A=0, B=1, C=2, D=3) va javob
+berilganini bildiruvchi 1 bit - 2 bit bo'sh javobni (yoki noma'lum harfni)
+ifodalay olmaydi. 40 savollik urinish JSON dagi ~500 bayt o'rniga 15 bayt.
+
+Tartib AnswerLayout da versiyalanadi: testning savollari o'zgarganda yangi
+versiya yaratiladi, eski urinishlar o'z versiyasidagi tartib bo'yicha
+o'qiladi. layout_version bo'lmagan urinishlar (tasodifiy variant,
+moslashuvchan rejim) o'zining question_ids tartibida saqlanadi.
+
+Ko'chish davrida JSON answers ustuni ham yoziladi va o'chirilmaydi -
+packed ko'rinish o'qish uchun, JSON esa asl ma'lumot sifatida qoladi.
+"""
+from django.db import IntegrityError, transaction
+
+from utils.cache import cached
+
+from .grading import KEY_TIMEOUT, NO_ANSWER, answer_string
+
+CODES = 'ABCD'
+_CODE = {letter: code for code, letter in enumerate(CODES)}
+
+
+def encode(given):
+    """Javoblar satrini ("AC-B...") baytlarga joylash"""
+    size = len(given)
+    mask = bytearray((size + 7) // 8)
+    codes = bytearray((size + 3) // 4)
+    for position, letter in enumerate(given):
+        code = _CODE.get(letter)
+        if code is None:
+            continue
+        mask[position >> 3] |= 1 << (position & 7)
+        codes[position >> 2] |= code << ((position & 3) * 2)
+    return bytes(mask + codes)
+
+
+def decode(data, size):
+    """Baytlardan javoblar satri (javob berilmagan joyda '-')"""
+    data = bytes(data)
+    offset = (size + 7) // 8
+    if len(data) < offset + (size + 3) // 4:
+        return NO_ANSWER * size
+    return ''.join(
+        CODES[(data[offset + (position >> 2)] >> ((position & 3) * 2)) & 3]
+        if data[position >> 3] >> (position & 7) & 1 else NO_ANSWER
+        for position in range(size)
+    )
+
+
+def current_layout(test_id, ids, retries=3):
+    """Savollar tartibi uchun layout versiyasi (tartib o'zgargan bo'lsa yangisi yaratiladi)"""
+    from .models import AnswerLayout
+
+    latest = AnswerLayout.objects.filter(test_id=test_id).order_by('-version').first()
+    if latest is not None and latest.question_ids == ids:
+        return latest.version
+    version = latest.version + 1 if latest else 1
+    try:
+        with transaction.atomic():
+            AnswerLayout.objects.create(test_id=test_id, version=version, question_ids=ids)
+    except IntegrityError:
+        # Parallel so'rov yaratib ulgurgan
+        if not retries:
+            raise
+        return current_layout(test_id, ids, retries - 1)
+    return version
+
+
+def layout_namespace(test_id):
+    return f'mock_layout:{test_id}'
+
+
+def layout_ids(test_id, version):
+    """Layout versiyasidagi savollar ID lari (versiyalar o'zgarmaydi - keshdan)"""
+    from .models import AnswerLayout
+
+    def compute():
+        return AnswerLayout.objects.get(test_id=test_id, version=version).question_ids
+    return cached(layout_namespace(test_id), [version], compute, KEY_TIMEOUT)
+
+
+def source_ids(test_id, version, question_ids):
+    """Urinish javoblari qaysi tartibda saqlangan"""
+    if version is None:
+        return question_ids or []
+    return layout_ids(test_id, version)
+
+
+def pack(key, answers):
+    """TestAttempt maydonlari: kalit (grading) tartibida joylangan javoblar
+
+    Asl JSON javoblar ham yoziladi (TestAttempt.answers - keyingi relizgacha).
+    """
+    return {
+        'answers': answers,
+        'answers_packed': encode(answer_string(key['ids'], answers)),
+        'layout_version': key.get('layout'),
+    }
+
+
+def aligned(ids, data, stored_ids):
+    """stored_ids tartibida saqlangan javoblarni ids tartibidagi satrga keltirish"""
+    given = decode(data, len(stored_ids))
+    if stored_ids == ids:
+        return given
+    by_question = dict(zip(stored_ids, given))
+    return ''.join(by_question.get(pk, NO_ANSWER) for pk in ids)
+
+
+def unpack(attempt):
+    """Urinish javoblari {question_id: javob} ko'rinishida"""
+    ids = source_ids(attempt.test_id, attempt.layout_version, attempt.question_ids)
+    given = decode(attempt.answers_packed, len(ids))
+    return {str(pk): answer for pk, answer in zip(ids, given) if answer != NO_ANSWER}
@@ -1,5 +1,5 @@
 from rest_framework import serializers
-from .models import MockTest, Question, TestAttempt
+from .models import LeaderboardEntry, MockTest, Question, TestAttempt
 
 
 class QuestionSerializer(serializers.ModelSerializer):
@@ -21,7 +21,34 @@ class MockTestSerializer(serializers.ModelSerializer):
     class Meta:
         model = MockTest
         fields = ['id', 'title', 'subject', 'difficulty', 'duration', 'passing_score',
-                  'questions_count', 'description', 'questions', 'created_at']
+                  'questions_count', 'description', 'is_randomized', 'variant_spec',
+                  'questions', 'created_at']
+
+    def validate_variant_spec(self, value):
+        """[{"subject", "difficulty", "topic", "count"}, ...] - fan/qiyinlik berilmasa testnikidan"""
+        if not isinstance(value, list):
+            raise serializers.ValidationError("Ro'yxat bo'lishi kerak")
+        subjects = dict(MockTest.SUBJECT_CHOICES)
+        difficulties = dict(MockTest.DIFFICULTY_CHOICES)
+        for part in value:
+            if not isinstance(part, dict):
+                raise serializers.ValidationError("Har bir element obyekt bo'lishi kerak")
+            if part.get('subject') and part['subject'] not in subjects:
+                raise serializers.ValidationError(f"Noma'lum fan: {part['subject']}")
+            if part.get('difficulty') and part['difficulty'] not in difficulties:
+                raise serializers.ValidationError(f"Noma'lum qiyinlik: {part['difficulty']}")
+            if not isinstance(part.get('count'), int) or part['count'] <= 0:
+                raise serializers.ValidationError("count musbat butun son bo'lishi kerak")
+        return value
+
+    def validate(self, attrs):
+        is_randomized = attrs.get('is_randomized', getattr(self.instance, 'is_randomized', False))
+        spec = attrs.get('variant_spec', getattr(self.instance, 'variant_spec', []))
+        if is_randomized:
+            if not spec:
+                raise serializers.ValidationError({'variant_spec': "Tasodifiy test uchun kerak"})
+            attrs['questions_count'] = sum(part['count'] for part in spec)
+        return attrs
 
 
 class MockTestExportSerializer(serializers.ModelSerializer):
@@ -31,26 +58,37 @@ class MockTestExportSerializer(serializers.ModelSerializer):
     class Meta:
         model = MockTest
         fields = ['id', 'title', 'subject', 'difficulty', 'duration', 'passing_score',
-                  'questions_count', 'description', 'questions', 'created_at']
+                  'questions_count', 'description', 'questions', 'created_at', 'updated_at']
 
 
 class MockTestListSerializer(serializers.ModelSerializer):
+    """Testlar ro'yxati; foydalanuvchi natijalari context['attempt_summary'] dan olinadi"""
     attempts_count = serializers.SerializerMethodField()
     best_score = serializers.SerializerMethodField()
+    last_attempt = serializers.SerializerMethodField()
+    passed = serializers.SerializerMethodField()
 
     class Meta:
         model = MockTest
         fields = ['id', 'title', 'subject', 'difficulty', 'duration', 'passing_score',
-                  'questions_count', 'description', 'attempts_count', 'best_score']
+                  'questions_count', 'description', 'is_randomized', 'attempts_count',
+                  'best_score', 'last_attempt', 'passed']
+
+    def _summary(self, obj):
+        return self.context.get('attempt_summary', {}).get(obj.pk, {})
 
     def get_attempts_count(self, obj):
-        user = self.context['request'].user
-        return obj.attempts.filter(teacher=user).count()
+        return self._summary(obj).get('attempts_count', 0)
 
     def get_best_score(self, obj):
-        user = self.context['request'].user
-        attempt = obj.attempts.filter(teacher=user).order_by('-score').first()
-        return attempt.score if attempt else None
+        return self._summary(obj).get('best_score')
+
+    def get_last_attempt(self, obj):
+        last_attempt = self._summary(obj).get('last_attempt')
+        return serializers.DateTimeField().to_representation(last_attempt) if last_attempt else None
+
+    def get_passed(self, obj):
+        return self._summary(obj).get('passed', False)
 
 
 class TestAttemptSerializer(serializers.ModelSerializer):
@@ -60,4 +98,23 @@ class TestAttemptSerializer(serializers.ModelSerializer):
     class Meta:
         model = TestAttempt
         fields = ['id', 'test', 'test_title', 'test_subject', 'score', 'correct_answers',
-                  'wrong_answers', 'total_questions', 'time_spent', 'passed', 'started_at', 'completed_at']
\ No newline at end of file
+                  'wrong_answers', 'total_questions', 'time_spent', 'passed', 'ability', 'ability_se',
+                  'started_at', 'completed_at']
+
+
+class LeaderboardEntrySerializer(serializers.ModelSerializer):
+    """Reyting jadvali qatori; o'rin context['ranks'] dan ({entry_id: o'rin})"""
+    rank = serializers.SerializerMethodField()
+    teacher_name = serializers.SerializerMethodField()
+    school_name = serializers.CharField(source='school.name', read_only=True, default=None)
+
+    class Meta:
+        model = LeaderboardEntry
+        fields = ['rank', 'teacher', 'teacher_name', 'school', 'school_name', 'score', 'time_spent',
+                  'best_attempt', 'achieved_at']
+
+    def get_rank(self, obj):
+        return self.context.get('ranks', {}).get(obj.pk)
+
+    def get_teacher_name(self, obj):
+        return obj.teacher.get_full_name() or obj.teacher.username
@@ -0,0 +1,269 @@
+"""
+Vaqt bilan cheklangan test sessiyalari.
+
+    start    - sessiya ochiladi, tugash vaqti serverda belgilanadi
+               (started_at + test davomiyligi);
+    autosave - javoblar o'zgarishi keshdagi buferga yoziladi; bazaga
+               murojaat qilinmaydi (bufer, javoblar kaliti va foydalanuvchi
+               keshda), shuning uchun butun sinf bir vaqtda yozsa ham
+               baza yuklanmaydi;
+    flush    - flush_attempt_sessions buyrug'i o'zgargan buferlarni
+               davriy ravishda bazaga yozadi, muddati o'tganlarini yakunlaydi
+               va topshirilmagan eski variantlarni (IssuedVariant) o'chiradi;
+    finish   - bufer bo'yicha baholanadi, TestAttempt yaratiladi, sarflangan
+               vaqt server soatidan olinadi (moslashuvchan sessiyalar
+               adaptive.py da yakunlanadi).
+
+Bufer ixcham: javoblar kalit tartibidagi satr ("AC-B..."), revision esa
+har bir autosave da oshadi - bazadagi revision bilan solishtirib faqat
+o'zgarganlari yoziladi. Bir sessiyaning parallel autosave lari keshdagi
+qulf (cache.add) bilan navbatlanadi, aks holda bir-birining javobini
+o'chirib yuboradi.
+
+Bufer alohida 'attempts' keshida (settings.ATTEMPT_CACHE_BACKEND): add
+atomar (baza yoki Redis) va yozuvlar cull bilan o'chirilmaydi. Deploy da
+flush_attempt_sessions start.sh orqali ishga tushadi.
+"""
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from django.utils.connection import ConnectionProxy
+
+from utils.cache import KEY_PREFIX
+
+from . import bank, grading, packing
+from .models import AttemptSession, IssuedVariant, TestAttempt
+
+
+cache = ConnectionProxy(caches, 'attempts')
+
+LOCK_TIMEOUT = 10   # qulf egasi to'xtab qolsa shuncha soniyada bo'shaydi
+LOCK_WAIT = 3
+
+
+class SessionError(Exception):
+    """Sessiya bilan bajarib bo'lmaydigan amal (yakunlangan, vaqti tugagan)"""
+
+
+def _buffer_key(session_id):
+    return f'{KEY_PREFIX}:mock_session:{session_id}'
+
+
+@contextmanager
+def _buffer_lock(session_id):
+    """Buferni o'qib-yozish uchun sessiya qulfi"""
+    key = f'{_buffer_key(session_id)}:lock'
+    deadline = time.monotonic() + LOCK_WAIT
+    while not cache.add(key, 1, LOCK_TIMEOUT):
+        if time.monotonic() > deadline:
+            raise SessionError('Sessiya band, qayta yuboring')
+        time.sleep(0.01)
+    try:
+        yield
+    finally:
+        cache.delete(key)
+
+
+def _buffer_timeout(expires):
+    remaining = expires - timezone.now().timestamp()
+    return int(max(remaining, 0)) + settings.ATTEMPT_SESSION_GRACE + 24 * 60 * 60
+
+
+def _to_dict(ids, answers):
+    return {str(pk): answer for pk, answer in zip(ids, answers) if answer != grading.NO_ANSWER}
+
+
+def _buffer_ids(buffer):
+    if buffer.get('questions') is not None:
+        return grading.variant_key(buffer['questions'])['ids']
+    return grading.answer_key(buffer['test'])['ids']
+
+
+def _seed(session):
+    """Bazadagi holatdan bufer yaratish"""
+    ids = grading.attempt_key(session)['ids']
+    buffer = {
+        'user': session.teacher_id,
+        'test': session.test_id,
+        'questions': session.question_ids,
+        'expires': session.expires_at.timestamp(),
+        'answers': grading.answer_string(ids, session.answers),
+        'revision': session.revision,
+    }
+    cache.set(_buffer_key(session.pk), buffer, _buffer_timeout(buffer['expires']))
+    return buffer
+
+
+def _load_buffer(session_id, user_id):
+    buffer = cache.get(_buffer_key(session_id))
+    if buffer is None:
+        # Bufer keshdan chiqib ketgan - bazadan tiklanadi
+        session = AttemptSession.objects.filter(pk=session_id, teacher_id=user_id).first()
+        if session is None:
+            raise AttemptSession.DoesNotExist
+        if session.status != 'active':
+            raise SessionError('Sessiya yakunlangan')
+        if session.mode != 'timed':
+            raise SessionError('Moslashuvchan sessiyada javoblar birma-bir yuboriladi')
+        buffer = _seed(session)
+    if buffer['user'] != user_id:
+        raise AttemptSession.DoesNotExist
+    return buffer
+
+
+def payload(session, answers=None):
+    """Sessiya holati (API javobi uchun). Tasodifiy variantda savollar ham qaytariladi."""
+    data = {
+        'id': session.pk,
+        'test': session.test_id,
+        'status': session.status,
+        'started_at': session.started_at,
+        'expires_at': session.expires_at,
+        'answers': session.answers if answers is None else answers,
+    }
+    if session.question_ids is not None:
+        data['seed'] = session.variant_seed
+        data['questions'] = grading.public_questions(grading.attempt_key(session))
+    return data
+
+
+def start(user, test):
+    """Sessiya ochish yoki davom etayotganini qaytarish. (sessiya, yangi) qaytariladi."""
+    now = timezone.now()
+    session = AttemptSession.objects.filter(teacher=user, test=test, mode='timed', status='active').first()
+    if session is not None:
+        if session.expires_at + timedelta(seconds=settings.ATTEMPT_SESSION_GRACE) > now:
+            buffer = cache.get(_buffer_key(session.pk)) or _seed(session)
+            ids = grading.attempt_key(session)['ids']
+            session.answers = _to_dict(ids, buffer['answers'])
+            return session, False
+        finish_expired(session.pk)
+
+    variant = {}
+    if test.is_randomized:
+        seed = bank.new_seed()
+        variant = {'variant_seed': seed, 'question_ids': bank.assemble(test, seed)}
+
+    try:
+        with transaction.atomic():
+            session = AttemptSession.objects.create(
+                teacher=user,
+                test=test,
+                started_at=now,
+                expires_at=now + timedelta(minutes=test.duration),
+                **variant
+            )
+    except IntegrityError:
+        # Parallel so'rov allaqachon ochgan
+        return start(user, test)
+    _seed(session)
+    return session, True
+
+
+def autosave(session_id, user_id, changes):
+    """Javoblar o'zgarishini buferga yozish. {question_id: javob} - None/'' javobni o'chiradi."""
+    with _buffer_lock(session_id):
+        buffer = _load_buffer(session_id, user_id)
+        if timezone.now().timestamp() > buffer['expires'] + settings.ATTEMPT_SESSION_GRACE:
+            raise SessionError('Vaqt tugagan')
+
+        ids = _buffer_ids(buffer)
+        positions = {str(pk): position for position, pk in enumerate(ids)}
+        answers = list(buffer['answers'].ljust(len(ids), grading.NO_ANSWER)[:len(ids)])
+        saved = 0
+        for question_id, answer in changes.items():
+            position = positions.get(str(question_id))
+            if position is not None:
+                answers[position] = grading.normalize_answer(answer)
+                saved += 1
+
+        buffer['answers'] = ''.join(answers)
+        buffer['revision'] += 1
+        cache.set(_buffer_key(session_id), buffer, _buffer_timeout(buffer['expires']))
+    return {'saved': saved, 'revision': buffer['revision']}
+
+
+def flush():
+    """O'zgargan buferlarni bazaga yozish, muddati o'tgan sessiyalarni yakunlash.
+
+    (yozilganlar, yakunlanganlar) soni qaytariladi.
+    """
+    now = timezone.now()
+    deadline = now - timedelta(seconds=settings.ATTEMPT_SESSION_GRACE)
+    expired = list(AttemptSession.objects.filter(status='active', expires_at__lt=deadline).values_list('id', flat=True))
+    finished = sum(finish_expired(session_id) for session_id in expired)
+    # Topshirilmagan eski variantlar
+    IssuedVariant.objects.filter(issued_at__lt=now - timedelta(seconds=settings.VARIANT_RETENTION)).delete()
+
+    sessions = list(
+        AttemptSession.objects.filter(status='active', mode='timed').only('id', 'test_id', 'question_ids', 'revision')
+    )
+    buffers = cache.get_many([_buffer_key(session.pk) for session in sessions])
+    changed = []
+    for session in sessions:
+        buffer = buffers.get(_buffer_key(session.pk))
+        if buffer is None or buffer['revision'] == session.revision:
+            continue
+        ids = grading.attempt_key(session)['ids']
+        session.answers = _to_dict(ids, buffer['answers'])
+        session.revision = buffer['revision']
+        session.saved_at = now
+        changed.append(session)
+    AttemptSession.objects.bulk_update(changed, ['answers', 'revision', 'saved_at'])
+    return len(changed), finished
+
+
+def finish_expired(session_id):
+    """Muddati o'tgan sessiyani yakunlash; boshqa so'rov yakunlab (o'chirib) ulgurgan bo'lsa False"""
+    try:
+        finish(session_id)
+    except (SessionError, AttemptSession.DoesNotExist):
+        return False
+    return True
+
+
+def finish(session_id, user_id=None):
+    """Sessiyani yakunlash: buferdagi javoblar baholanadi va TestAttempt yaratiladi"""
+    with transaction.atomic():
+        sessions = AttemptSession.objects.select_for_update().select_related('test')
+        if user_id is not None:
+            sessions = sessions.filter(teacher_id=user_id)
+        session = sessions.get(pk=session_id)
+        if session.status != 'active':
+            raise SessionError('Sessiya yakunlangan')
+        if session.mode == 'adaptive':
+            from . import adaptive
+            return adaptive.complete(session)
+
+        test = session.test
+        key = grading.attempt_key(session)
+        # Davom etayotgan autosave yakunlanguncha kutiladi
+        with _buffer_lock(session.pk):
+            buffer = cache.get(_buffer_key(session.pk))
+        if buffer is not None:
+            session.answers = _to_dict(key['ids'], buffer['answers'])
+            session.revision = buffer['revision']
+
+        now = timezone.now()
+        finished_at = min(now, session.expires_at)
+        attempt = TestAttempt.objects.create(
+            teacher_id=session.teacher_id,
+            test=test,
+            started_at=session.started_at,
+            time_spent=max(int((finished_at - session.started_at).total_seconds()), 0),
+            variant_seed=session.variant_seed,
+            question_ids=session.question_ids,
+            **packing.pack(key, session.answers),
+            **grading.grade(key, session.answers, test.passing_score)
+        )
+        session.status = 'finished'
+        session.attempt = attempt
+        session.saved_at = now
+        session.save(update_fields=['status', 'attempt', 'answers', 'revision', 'saved_at'])
+        transaction.on_commit(lambda: cache.delete(_buffer_key(session.pk)))
+    return attempt, key
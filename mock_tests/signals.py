@@ -0,0 +1,99 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+from teachers.models import Teacher
+from . import bank, leaderboard
+from .adaptive import invalidate_items
+from .analysis import reset as reset_analysis
+from .grading import invalidate_key
+from .models import ItemParameters, MockTest, Question, QuestionBankSlot, TestAttempt
+from .stats import invalidate_summary
+
+
+@receiver(post_save, sender=TestAttempt)
+@receiver(post_delete, sender=TestAttempt)
+def attempt_changed(sender, instance, **kwargs):
+    """Urinish yaratilganda/o'chirilganda foydalanuvchi natijalari keshini yangilash"""
+    invalidate_summary(instance.teacher_id)
+
+
+@receiver(post_save, sender=TestAttempt)
+def attempt_ranked(sender, instance, created, raw=False, **kwargs):
+    """Yangi urinish natijasini reyting jadvallariga qo'shish"""
+    if created and not raw:
+        leaderboard.record(instance)
+
+
+@receiver(post_delete, sender=TestAttempt)
+def attempt_unranked(sender, instance, **kwargs):
+    """O'chirilgan urinish o'rniga keyingi eng yaxshi natija"""
+    leaderboard.remove(instance)
+
+
+@receiver(post_save, sender=Teacher)
+def teacher_moved(sender, instance, created, raw=False, **kwargs):
+    """Maktab reytingi uchun o'qituvchi yozuvlaridagi maktabni yangilash"""
+    if not created and not raw:
+        leaderboard.move_teacher(instance.user_id, instance.school_id)
+
+
+@receiver(post_save, sender=Question)
+@receiver(post_delete, sender=Question)
+def question_changed(sender, instance, **kwargs):
+    """Savol o'zgarganda test javoblar kalitini eskirtirish"""
+    invalidate_key(instance.test_id)
+    invalidate_items(instance.test_id)
+    # Inkremental eksport (?updated_since=) test o'zgarganini ko'rishi uchun
+    MockTest.objects.filter(pk=instance.test_id).update(updated_at=timezone.now())
+
+
+@receiver(pre_save, sender=Question)
+def question_answer_before(sender, instance, raw=False, **kwargs):
+    """Tahrirlanayotgan savolning eski to'g'ri javobi (question_rekeyed uchun)"""
+    if instance.pk and not raw:
+        instance._saved_answer = Question.objects.filter(pk=instance.pk).values_list(
+            'correct_answer', flat=True
+        ).first()
+
+
+@receiver(post_save, sender=Question)
+@receiver(post_delete, sender=Question)
+def question_rekeyed(sender, instance, created=False, raw=False, **kwargs):
+    """Savollar to'plami yoki to'g'ri javob o'zgarsa tahlil boshidan hisoblanadi
+
+    Matn yoki tartib tahriri tahlilga ta'sir qilmaydi (statistika savol
+    ID si bo'yicha, eski tartib packing.aligned bilan moslanadi).
+    """
+    if raw:
+        return
+    if kwargs['signal'] is post_save and not created \
+            and getattr(instance, '_saved_answer', None) == instance.correct_answer:
+        return
+    reset_analysis([instance.test_id])
+
+
+@receiver(post_save, sender=Question)
+def question_banked(sender, instance, raw=False, **kwargs):
+    """Savolni bank indeksida (yangi) guruhiga joylash"""
+    if not raw:
+        bank.sync(instance, instance.test)
+
+
+@receiver(post_delete, sender=QuestionBankSlot)
+def bank_slot_deleted(sender, instance, **kwargs):
+    """Guruh raqamlari zich qolishi uchun bo'shagan raqamni to'ldirish"""
+    bank.fill_hole((instance.subject, instance.difficulty, instance.topic), instance.slot)
+
+
+@receiver(post_save, sender=MockTest)
+def test_regrouped(sender, instance, created, raw=False, **kwargs):
+    """Test fani/qiyinligi o'zgarsa savollari bankda boshqa guruhga o'tadi"""
+    if not created and not raw:
+        bank.sync_test(instance)
+
+
+@receiver(post_save, sender=Question)
+def question_recalibrate(sender, instance, created, raw=False, **kwargs):
+    """Tahrirlangan savol parametrlari eskiradi - qayta kalibrlanguncha moslashuvchan rejimda berilmaydi"""
+    if not created and not raw:
+        ItemParameters.objects.filter(question=instance).delete()
@@ -0,0 +1,49 @@
+"""
+Foydalanuvchining testlar bo'yicha natijalari (testlar ro'yxati uchun).
+
+Barcha testlar uchun urinishlar soni, eng yaxshi ball, oxirgi urinish va
+o'tganlik TestAttempt bo'yicha bitta GROUP BY so'rovi bilan olinadi va
+foydalanuvchi kesh nomlar fazosida saqlanadi. Yangi urinish saqlanganda
+(signals.py) shu foydalanuvchining keshi eskiradi. Moslashuvchan (IRT)
+urinishlar hisobga olinmaydi - ularning bali persentil.
+"""
+from django.db import transaction
+from django.db.models import Count, Max, Q
+
+from utils.cache import cached, invalidate
+
+from .models import TestAttempt
+
+SUMMARY_TIMEOUT = 60 * 60
+
+
+def _namespace(user_id):
+    return f'mock_attempts:{user_id}'
+
+
+def _summary(user_id):
+    rows = TestAttempt.objects.filter(teacher_id=user_id, ability__isnull=True).values('test_id').annotate(
+        attempts_count=Count('id'),
+        best_score=Max('score'),
+        last_attempt=Max('completed_at'),
+        passed_count=Count('id', filter=Q(passed=True)),
+    ).order_by()
+    return {
+        row['test_id']: {
+            'attempts_count': row['attempts_count'],
+            'best_score': row['best_score'],
+            'last_attempt': row['last_attempt'],
+            'passed': row['passed_count'] > 0,
+        }
+        for row in rows
+    }
+
+
+def attempt_summary(user_id):
+    """{test_id: {attempts_count, best_score, last_attempt, passed}}"""
+    return cached(_namespace(user_id), ['summary'], lambda: _summary(user_id), SUMMARY_TIMEOUT)
+
+
+def invalidate_summary(user_id):
+    """Foydalanuvchi natijalari keshini tranzaksiya yakunlangach eskirtirish"""
+    transaction.on_commit(lambda: invalidate(_namespace(user_id)))
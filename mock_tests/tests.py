@@ -1,3 +1,92 @@
-from django.test import TestCase
+import random
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase
+
+from . import grading, packing
+from .models import MockTest, Question, TestAttempt
+
+
+class EncodeDecodeTests(SimpleTestCase):
+    """packing.encode/decode: javoblar satri baytlarga va qaytib"""
+
+    def test_round_trip(self):
+        rng = random.Random(7)
+        # Bayt chegaralari atrofidagi barcha uzunliklar
+        for size in range(20):
+            given = ''.join(rng.choice('ABCD-') for _ in range(size))
+            self.assertEqual(packing.decode(packing.encode(given), size), given)
+
+    def test_size(self):
+        self.assertEqual(len(packing.encode('ABCD' * 10)), 15)
+
+    def test_unknown_letter_is_blank(self):
+        self.assertEqual(packing.decode(packing.encode('AXB'), 3), 'A-B')
+
+    def test_short_data_is_blank(self):
+        self.assertEqual(packing.decode(b'', 3), '---')
+        self.assertEqual(packing.decode(packing.encode('AB'), 9), '-' * 9)
+
+    def test_aligned(self):
+        data = packing.encode('ABC')
+        self.assertEqual(packing.aligned([1, 2, 3], data, [1, 2, 3]), 'ABC')
+        # Tartib o'zgargan, 4-savol keyin qo'shilgan, 2-savol o'chirilgan
+        self.assertEqual(packing.aligned([3, 1, 4], data, [1, 2, 3]), 'CA-')
+
+
+class LayoutTests(TestCase):
+    """Layout versiyalari: eski urinishlar o'z tartibi bo'yicha o'qiladi"""
+
+    def setUp(self):
+        self.test = MockTest.objects.create(
+            title='Test', subject='math', difficulty='easy', duration=10, passing_score=50
+        )
+        self.questions = [
+            Question.objects.create(
+                test=self.test, question_text=f'q{i}', option_a='a', option_b='b', option_c='c',
+                option_d='d', correct_answer='A', order=i,
+            )
+            for i in range(3)
+        ]
+        self.user = get_user_model().objects.create_user(username='teacher', password='x')
+
+    def reorder(self, question, order):
+        with self.captureOnCommitCallbacks(execute=True):
+            question.order = order
+            question.save()
+
+    def attempt(self, key, answers):
+        return TestAttempt.objects.create(
+            teacher=self.user, test=self.test, score=0, correct_answers=0, wrong_answers=0,
+            total_questions=len(key['ids']), time_spent=1, **packing.pack(key, answers),
+        )
+
+    def test_same_order_same_version(self):
+        key = grading.answer_key(self.test.pk)
+        self.assertEqual(packing.current_layout(self.test.pk, key['ids']), key['layout'])
+
+    def test_reorder_creates_version(self):
+        first, second, third = self.questions
+        old = grading.answer_key(self.test.pk)
+        attempt = self.attempt(old, {str(first.pk): 'B', str(third.pk): 'D'})
+
+        self.reorder(first, 10)
+        new = grading.answer_key(self.test.pk)
+        self.assertEqual(new['layout'], old['layout'] + 1)
+        self.assertEqual(new['ids'], [second.pk, third.pk, first.pk])
+        self.assertEqual(packing.layout_ids(self.test.pk, old['layout']), old['ids'])
+
+        attempt.refresh_from_db()
+        self.assertEqual(packing.unpack(attempt), {str(first.pk): 'B', str(third.pk): 'D'})
+        given = packing.aligned(
+            new['ids'], attempt.answers_packed,
+            packing.source_ids(self.test.pk, attempt.layout_version, attempt.question_ids),
+        )
+        self.assertEqual(given, '-DB')
+
+    def test_raw_answers_kept(self):
+        key = grading.answer_key(self.test.pk)
+        answers = {str(self.questions[0].pk): 'E', str(self.questions[1].pk): 'c'}
+        attempt = self.attempt(key, answers)
+        attempt.refresh_from_db()
+        self.assertEqual(attempt.answers, answers)
@@ -1,17 +1,22 @@
+from zipfile import BadZipFile
+from django.http import StreamingHttpResponse
+from openpyxl.utils.exceptions import InvalidFileException
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django.db import transaction
-from .models import MockTest, Question, TestAttempt
+from .models import AttemptSession, IssuedVariant, MockTest, Question, TestAttempt
 from .serializers import (
+    LeaderboardEntrySerializer,
     MockTestSerializer,
     MockTestListSerializer,
-    MockTestExportSerializer,
     TestAttemptSerializer,
-    QuestionWithAnswerSerializer
 )
-from teachers.models import Teacher
+from utils.pagination import KeysetPagination
+from .stats import attempt_summary
+from . import adaptive, analysis, bank, exporter, grading, leaderboard, packing, sessions
+from .importer import import_workbook
 
 
 # Teacher subject ni MockTest subject ga mapping
@@ -48,19 +53,15 @@ class MockTestViewSet(viewsets.ModelViewSet):
             pass  # Hamma testlar
         else:
             # O'qituvchi faqat o'z faniga tegishli testlarni ko'radi
-            try:
-                teacher = Teacher.objects.get(user=user)
-                teacher_subject = teacher.subject
-
+            # Teacher profili yo'q - barcha testlar
+            teacher = self.request.profile.teacher
+            if teacher is not None:
                 # Teacher subject ni MockTest subject ga map qilish
-                mock_test_subject = SUBJECT_MAPPING.get(teacher_subject)
+                mock_test_subject = SUBJECT_MAPPING.get(teacher.subject)
 
                 if mock_test_subject:
                     queryset = queryset.filter(subject=mock_test_subject)
                 # Agar 'other' bo'lsa yoki mapping yo'q bo'lsa - barcha testlar
-            except Teacher.DoesNotExist:
-                # Teacher profili yo'q - barcha testlar
-                pass
 
         # Query params orqali qo'shimcha filter (ixtiyoriy)
         subject = self.request.query_params.get('subject', None)
@@ -81,6 +82,8 @@ class MockTestViewSet(viewsets.ModelViewSet):
     def get_serializer_context(self):
         context = super().get_serializer_context()
         context['request'] = self.request
+        if self.action == 'list':
+            context['attempt_summary'] = attempt_summary(self.request.user.pk)
         return context
 
     def create(self, request, *args, **kwargs):
@@ -107,68 +110,215 @@ class MockTestViewSet(viewsets.ModelViewSet):
         test = self.get_object()
         answers = request.data.get('answers', {})
         time_spent = request.data.get('time_spent', 0)
+        if not isinstance(answers, dict):
+            return Response({'error': 'answers obyekt bo\'lishi kerak'}, status=status.HTTP_400_BAD_REQUEST)
+
+        with transaction.atomic():
+            variant, issued = {}, None
+            if test.is_randomized:
+                # Tasodifiy variant: /variant/ bergan va saqlangan savollar bo'yicha baholanadi
+                try:
+                    seed = int(request.data.get('seed'))
+                except (TypeError, ValueError):
+                    return Response({'error': 'seed kerak'}, status=status.HTTP_400_BAD_REQUEST)
+                issued = IssuedVariant.objects.select_for_update().filter(
+                    teacher=request.user, test=test, seed=seed
+                ).first()
+                if issued is None:
+                    return Response({'error': 'Variant topilmadi'}, status=status.HTTP_400_BAD_REQUEST)
+                variant = {'variant_seed': seed, 'question_ids': issued.question_ids}
+                key = grading.variant_key(issued.question_ids)
+            else:
+                # Kalit va ko'rib chiqish uchun savollar keshdan (savollar qayta o'qilmaydi)
+                key = grading.answer_key(test.pk)
+            result = grading.grade(key, answers, test.passing_score)
+
+            attempt = TestAttempt.objects.create(
+                teacher=request.user,
+                test=test,
+                time_spent=time_spent,
+                **packing.pack(key, answers),
+                **variant,
+                **result
+            )
+            if issued is not None:
+                # Variant bir marta topshiriladi
+                issued.delete()
 
-        correct_answers = 0
-        total_questions = test.questions.count()
-
-        for question in test.questions.all():
-            user_answer = answers.get(str(question.id))
-            if user_answer == question.correct_answer:
-                correct_answers += 1
-
-        wrong_answers = total_questions - correct_answers
-        score = int((correct_answers / total_questions) * 100) if total_questions > 0 else 0
-        passed = score >= test.passing_score
-
-        attempt = TestAttempt.objects.create(
-            teacher=request.user,
-            test=test,
-            score=score,
-            correct_answers=correct_answers,
-            wrong_answers=wrong_answers,
-            total_questions=total_questions,
-            time_spent=time_spent,
-            passed=passed,
-            answers=answers
+        return Response({
+            'attempt': TestAttemptSerializer(attempt).data,
+            'questions': key['review']
+        })
+
+    @action(detail=True, methods=['get'])
+    def variant(self, request, pk=None):
+        """Tasodifiy testning varianti: ?seed= berilmasa yangi seed tanlanadi"""
+        test = self.get_object()
+        if not test.is_randomized:
+            return Response({'error': 'Bu test tasodifiy emas'}, status=status.HTTP_400_BAD_REQUEST)
+        seed = request.query_params.get('seed')
+        try:
+            seed = int(seed) if seed else None
+        except ValueError:
+            return Response({'error': 'seed butun son bo\'lishi kerak'}, status=status.HTTP_400_BAD_REQUEST)
+
+        issued = bank.issue(request.user, test, seed)
+        key = grading.variant_key(issued.question_ids)
+        return Response({'seed': issued.seed, 'questions': grading.public_questions(key)})
+
+    @action(detail=True, methods=['post'])
+    def start(self, request, pk=None):
+        """Vaqtli sessiyani boshlash (ochiq sessiya bo'lsa u davom ettiriladi)"""
+        test = self.get_object()
+        session, created = sessions.start(request.user, test)
+        return Response(
+            sessions.payload(session),
+            status=status.HTTP_201_CREATED if created else status.HTTP_200_OK
         )
 
-        # Return questions with answers for review
-        questions = test.questions.all()
-        questions_data = QuestionWithAnswerSerializer(questions, many=True).data
+    @action(detail=False, methods=['post'], url_path=r'sessions/(?P<session_id>\d+)/autosave')
+    def session_autosave(self, request, session_id=None):
+        """Javoblarni saqlash: {"answers": {"<question_id>": "A", ...}} - faqat o'zgarganlari"""
+        changes = request.data.get('answers', {})
+        if not isinstance(changes, dict):
+            return Response({'error': 'answers obyekt bo\'lishi kerak'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            return Response(sessions.autosave(int(session_id), request.user.pk, changes))
+        except AttemptSession.DoesNotExist:
+            return Response({'error': 'Topilmadi'}, status=status.HTTP_404_NOT_FOUND)
+        except sessions.SessionError as e:
+            return Response({'error': str(e)}, status=status.HTTP_409_CONFLICT)
+
+    @action(detail=False, methods=['post'], url_path=r'sessions/(?P<session_id>\d+)/finish')
+    def session_finish(self, request, session_id=None):
+        """Sessiyani yakunlash va natijani olish (javob submit bilan bir xil, moslashuvchan sessiya ham)"""
+        try:
+            attempt, key = sessions.finish(int(session_id), request.user.pk)
+        except AttemptSession.DoesNotExist:
+            return Response({'error': 'Topilmadi'}, status=status.HTTP_404_NOT_FOUND)
+        except sessions.SessionError as e:
+            return Response({'error': str(e)}, status=status.HTTP_409_CONFLICT)
 
         return Response({
             'attempt': TestAttemptSerializer(attempt).data,
-            'questions': questions_data
+            'questions': key['review']
         })
 
+    @action(detail=True, methods=['post'], url_path='adaptive')
+    def adaptive_start(self, request, pk=None):
+        """Moslashuvchan (IRT) rejimni boshlash - birinchi savol qaytariladi"""
+        test = self.get_object()
+        try:
+            session, created = adaptive.start(request.user, test)
+        except sessions.SessionError as e:
+            return Response({'error': str(e)}, status=status.HTTP_409_CONFLICT)
+        return Response(
+            adaptive.payload(session),
+            status=status.HTTP_201_CREATED if created else status.HTTP_200_OK
+        )
+
+    @action(detail=False, methods=['post'], url_path=r'adaptive/(?P<session_id>\d+)/answer')
+    def adaptive_answer(self, request, session_id=None):
+        """Joriy savolga javob: {"question": id, "answer": "A"} - keyingi savol yoki natija"""
+        try:
+            question_id = int(request.data.get('question'))
+        except (TypeError, ValueError):
+            return Response({'error': 'question kerak'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            session, attempt = adaptive.answer(int(session_id), request.user.pk, question_id, request.data.get('answer'))
+        except AttemptSession.DoesNotExist:
+            return Response({'error': 'Topilmadi'}, status=status.HTTP_404_NOT_FOUND)
+        except sessions.SessionError as e:
+            return Response({'error': str(e)}, status=status.HTTP_409_CONFLICT)
+
+        if attempt is None:
+            return Response(adaptive.payload(session))
+        return Response({
+            'attempt': TestAttemptSerializer(attempt).data,
+            'questions': grading.attempt_key(attempt)['review']
+        })
+
+    @action(detail=True, methods=['get'])
+    def item_analysis(self, request, pk=None):
+        """Savollar tahlili: qiyinlik, diskriminatsiya, variantlar ulushi (Admin only)"""
+        if not request.user.is_staff and request.user.role not in ['admin', 'superadmin']:
+            return Response({'error': 'Ruxsat yo\'q'}, status=status.HTTP_403_FORBIDDEN)
+
+        test = self.get_object()
+        # Faqat o'qish: tahlil analyze_items buyrug'ida yangilanadi (analyzed_at)
+        return Response(analysis.report(test.pk))
+
+    @action(detail=True, methods=['get'], url_path='leaderboard')
+    def test_leaderboard(self, request, pk=None):
+        """Test bo'yicha reyting (?school= - maktab ichida)"""
+        test = self.get_object()
+        return self.leaderboard_response(request, leaderboard.test_board(test.pk))
+
+    @action(detail=False, methods=['get'], url_path=r'leaderboard/(?P<subject>[a-z_]+)')
+    def subject_leaderboard(self, request, subject=None):
+        """Fan bo'yicha reyting - o'qituvchining shu fandagi eng yaxshi natijasi"""
+        if subject not in dict(MockTest.SUBJECT_CHOICES):
+            return Response({'error': 'Noma\'lum fan'}, status=status.HTTP_404_NOT_FOUND)
+        return self.leaderboard_response(request, leaderboard.subject_board(subject))
+
+    def leaderboard_response(self, request, board):
+        """Reyting sahifasi (eng yaxshilari birinchi) va foydalanuvchining o'z o'rni"""
+        try:
+            school_id = int(request.query_params['school']) if request.query_params.get('school') else None
+        except ValueError:
+            return Response({'error': 'school butun son bo\'lishi kerak'}, status=status.HTTP_400_BAD_REQUEST)
+
+        entries = leaderboard.entries(board, school_id).select_related('teacher', 'school')
+        paginator = KeysetPagination(ordering=leaderboard.ORDERING)
+        page = paginator.paginate_queryset(entries, request, view=self)
+        ranks = {entry.pk: place for place, entry in leaderboard.ranked(page, school_id)}
+        data = paginator.get_paginated_data(
+            LeaderboardEntrySerializer(page, many=True, context={'ranks': ranks}).data
+        )
+
+        mine = leaderboard.position(board, request.user.pk, school_id)
+        if mine is not None:
+            place, entry = mine
+            mine = LeaderboardEntrySerializer(entry, context={'ranks': {entry.pk: place}}).data
+        data['me'] = mine
+        return Response(data)
+
     @action(detail=False, methods=['get'])
     def my_attempts(self, request):
         """Foydalanuvchining barcha urinishlari"""
-        attempts = TestAttempt.objects.filter(teacher=request.user).order_by('-completed_at')
-        serializer = TestAttemptSerializer(attempts, many=True)
-        return Response(serializer.data)
+        attempts = TestAttempt.objects.filter(teacher=request.user)
+        paginator = KeysetPagination(ordering=('-completed_at',))
+        page = paginator.paginate_queryset(attempts, request, view=self)
+        serializer = TestAttemptSerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
 
     @action(detail=False, methods=['get'], url_path='attempt/(?P<attempt_id>[^/.]+)')
     def attempt_detail(self, request, attempt_id=None):
         """Bitta urinish detallari"""
         try:
-            attempt = TestAttempt.objects.get(id=attempt_id, teacher=request.user)
-            questions = attempt.test.questions.all()
-            questions_data = QuestionWithAnswerSerializer(questions, many=True).data
+            attempt = TestAttempt.objects.select_related('test').get(id=attempt_id, teacher=request.user)
 
             return Response({
                 'attempt': TestAttemptSerializer(attempt).data,
-                'questions': questions_data
+                'questions': grading.attempt_key(attempt)['review']
             })
         except TestAttempt.DoesNotExist:
             return Response({'error': 'Topilmadi'}, status=status.HTTP_404_NOT_FOUND)
 
     @action(detail=False, methods=['post'], url_path='import')
     def import_test(self, request):
-        """Excel dan testlarni import qilish (Admin only)"""
+        """Testlarni import qilish (Admin only)
+
+        multipart 'file' (.xlsx) - varaqlardagi barcha testlar (importer.py);
+        aks holda JSON: bitta test va uning questions ro'yxati.
+        """
         if not request.user.is_staff and request.user.role not in ['admin', 'superadmin']:
             return Response({'error': 'Ruxsat yo\'q'}, status=status.HTTP_403_FORBIDDEN)
 
+        upload = request.FILES.get('file')
+        if upload is not None:
+            return self.import_excel(request, upload)
+
         try:
             with transaction.atomic():
                 # Test yaratish
@@ -183,8 +333,8 @@ class MockTestViewSet(viewsets.ModelViewSet):
                 )
 
                 # Savollarni yaratish
-                for idx, q_data in enumerate(request.data.get('questions', []), 1):
-                    Question.objects.create(
+                questions = Question.objects.bulk_create([
+                    Question(
                         test=test,
                         question_text=q_data.get('question_text'),
                         option_a=q_data.get('option_a'),
@@ -193,8 +343,12 @@ class MockTestViewSet(viewsets.ModelViewSet):
                         option_d=q_data.get('option_d'),
                         correct_answer=q_data.get('correct_answer'),
                         explanation=q_data.get('explanation', ''),
+                        topic=q_data.get('topic', ''),
                         order=idx
                     )
+                    for idx, q_data in enumerate(request.data.get('questions', []), 1)
+                ])
+                bank.add_many(questions, test)
 
                 return Response({
                     'message': 'Test muvaffaqiyatli yaratildi',
@@ -203,12 +357,53 @@ class MockTestViewSet(viewsets.ModelViewSet):
         except Exception as e:
             return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
+    def import_excel(self, request, upload):
+        """Excel faylidan import - noto'g'ri qatorlar xatolar ro'yxatida qaytariladi"""
+        if not upload.name.lower().endswith('.xlsx'):
+            return Response({'error': 'Faqat .xlsx fayl qabul qilinadi'}, status=status.HTTP_400_BAD_REQUEST)
+
+        defaults = {
+            name: request.data.get(name)
+            for name in ('subject', 'difficulty', 'duration', 'passing_score')
+            if request.data.get(name)
+        }
+        try:
+            result = import_workbook(upload, defaults)
+        except (InvalidFileException, BadZipFile, KeyError):
+            return Response({'error': 'Excel faylini o\'qib bo\'lmadi'}, status=status.HTTP_400_BAD_REQUEST)
+
+        result['message'] = f"{len(result['tests'])} ta test import qilindi"
+        code = status.HTTP_201_CREATED if result['tests'] else status.HTTP_400_BAD_REQUEST
+        return Response(result, status=code)
+
     @action(detail=False, methods=['get'], url_path='export')
     def export_tests(self, request):
-        """Barcha testlarni export qilish (Admin only)"""
+        """Barcha testlarni export qilish (Admin only)
+
+        Javob oqim bilan yuboriladi (exporter.py). Parametrlar:
+        ?subject=, ?difficulty=, ?updated_since=YYYY-MM-DD[THH:MM] - faqat
+        shundan keyin o'zgargan testlar, ?output=ndjson, ?gzip=1.
+        """
         if not request.user.is_staff and request.user.role not in ['admin', 'superadmin']:
             return Response({'error': 'Ruxsat yo\'q'}, status=status.HTTP_403_FORBIDDEN)
 
-        tests = MockTest.objects.all().prefetch_related('questions')
-        serializer = MockTestExportSerializer(tests, many=True)
-        return Response(serializer.data)
\ No newline at end of file
+        params = request.query_params
+        fmt = params.get('output', 'json')
+        if fmt not in exporter.CONTENT_TYPES:
+            return Response({'error': 'output json yoki ndjson bo\'lishi kerak'}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            updated_since = exporter.parse_since(params.get('updated_since'))
+        except ValueError:
+            return Response({'error': 'updated_since noto\'g\'ri formatda'}, status=status.HTTP_400_BAD_REQUEST)
+
+        tests = exporter.export_queryset(params.get('subject'), params.get('difficulty'), updated_since)
+        chunks = exporter.iter_tests(tests, fmt)
+        filename = f'mock_tests.{fmt}'
+        if params.get('gzip') in ('1', 'true'):
+            response = StreamingHttpResponse(exporter.gzip_stream(chunks), content_type='application/gzip')
+            filename += '.gz'
+        else:
+            response = StreamingHttpResponse(chunks, content_type=f'{exporter.CONTENT_TYPES[fmt]}; charset=utf-8')
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
\ No newline at end of file
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import TeacherRating, SchoolRating
+from .models import TeacherRating, SchoolRating, MonthClose
 
 
 @admin.register(TeacherRating)
@@ -13,4 +13,8 @@ class TeacherRatingAdmin(admin.ModelAdmin):
 class SchoolRatingAdmin(admin.ModelAdmin):
     list_display = ['school', 'month', 'total_points', 'rank', 'teachers_count']
     list_filter = ['month']
-    raw_id_fields = ['school']
\ No newline at end of file
+    raw_id_fields = ['school']
+
+@admin.register(MonthClose)
+class MonthCloseAdmin(admin.ModelAdmin):
+    list_display = ['month', 'teachers_count', 'schools_count', 'closed_at']
@@ -0,0 +1,203 @@
+"""
+Reyting hisoblash.
+
+Oylik ball PointsEntry jurnalidan olinadi, o'rinlar RANK() OVER (...) window
+funksiyasi bilan hisoblanadi (baza qo'llamasa - Python da). Natija
+TeacherRating/SchoolRating ga bulk upsert bilan yoziladi.
+
+Ball berish so'rovi reytingga tegmaydi: joriy oy o'rinlari compute_ratings
+--watch buyrug'ida davriy ravishda, faqat bali o'zgarganlar uchun
+(rerank_teachers) yangilanadi.
+"""
+from datetime import date, datetime, time
+
+from django.db import connection, transaction
+from django.db.models import Count, F, Q, Sum, Window
+from django.db.models.functions import Coalesce, Rank
+from django.utils import timezone
+
+from schools.models import School
+from utils.cache import invalidate
+from teachers.models import PointsEntry, Teacher
+from .models import SchoolRating, TeacherRating
+
+BATCH_SIZE = 1000
+
+
+def invalidate_cache():
+    """Reyting keshini tranzaksiya tasdiqlangandan keyin eskirtirish"""
+    transaction.on_commit(lambda: invalidate('ratings'))
+
+
+def month_start(value=None):
+    """Oyning birinchi kuni"""
+    value = value or timezone.localdate()
+    return date(value.year, value.month, 1)
+
+
+def month_range(month):
+    """Oy chegaralari (mahalliy vaqt bo'yicha) - [boshi, keyingi oy boshi)"""
+    start = month_start(month)
+    end = date(start.year + start.month // 12, start.month % 12 + 1, 1)
+    return start, end
+
+
+def latest_month(model=TeacherRating):
+    """Reyting hisoblangan oxirgi oy"""
+    return model.objects.order_by('-month').values_list('month', flat=True).first()
+
+
+def _entries_filter(month, prefix):
+    # created_at indeksidan foydalanish uchun sana emas, vaqt oralig'i
+    start, end = (timezone.make_aware(datetime.combine(day, time.min)) for day in month_range(month))
+    return Q(**{
+        f'{prefix}created_at__gte': start,
+        f'{prefix}created_at__lt': end,
+    })
+
+
+def _month_points(month, prefix):
+    return Coalesce(Sum(f'{prefix}points', filter=_entries_filter(month, prefix)), 0)
+
+
+def _ranked(queryset):
+    """(id, ball, o'rin) qatorlarini berish - RANK() yoki Python fallback"""
+    if connection.features.supports_over_clause:
+        rows = queryset.annotate(
+            rank=Window(expression=Rank(), order_by=F('month_points').desc())
+        ).values_list('id', 'month_points', 'rank').order_by('rank', 'id')
+        yield from rows.iterator(chunk_size=BATCH_SIZE)
+        return
+
+    rows = queryset.values_list('id', 'month_points').order_by('-month_points', 'id')
+    rank, previous, position = 0, None, 0
+    for pk, points in rows.iterator(chunk_size=BATCH_SIZE):
+        position += 1
+        if points != previous:
+            rank, previous = position, points
+        yield pk, points, rank
+
+
+def _teacher_totals(month):
+    return Teacher.objects.annotate(month_points=_month_points(month, 'points_entries__'))
+
+
+def _upsert(model, objects, key, update_fields):
+    model.objects.bulk_create(
+        objects,
+        update_conflicts=True,
+        unique_fields=[key, 'month'],
+        update_fields=update_fields,
+        batch_size=BATCH_SIZE,
+    )
+
+
+def compute_teacher_ratings(month=None):
+    """O'qituvchilar reytingini to'liq hisoblash"""
+    month = month_start(month)
+    batch, count = [], 0
+    with transaction.atomic():
+        for teacher_id, points, rank in _ranked(_teacher_totals(month)):
+            batch.append(TeacherRating(teacher_id=teacher_id, month=month, total_points=points, rank=rank))
+            if len(batch) >= BATCH_SIZE:
+                _upsert(TeacherRating, batch, 'teacher', ['total_points', 'rank'])
+                count += len(batch)
+                batch = []
+        _upsert(TeacherRating, batch, 'teacher', ['total_points', 'rank'])
+        invalidate_cache()
+    return count + len(batch)
+
+
+def compute_school_ratings(month=None):
+    """Maktablar reytingini to'liq hisoblash"""
+    month = month_start(month)
+    schools = School.objects.annotate(month_points=_month_points(month, 'teachers__points_entries__'))
+    teachers_count = dict(School.objects.annotate(n=Count('teachers')).values_list('id', 'n'))
+
+    batch, count = [], 0
+    with transaction.atomic():
+        for school_id, points, rank in _ranked(schools):
+            batch.append(SchoolRating(
+                school_id=school_id,
+                month=month,
+                total_points=points,
+                rank=rank,
+                teachers_count=teachers_count.get(school_id, 0),
+            ))
+            if len(batch) >= BATCH_SIZE:
+                _upsert(SchoolRating, batch, 'school', ['total_points', 'rank', 'teachers_count'])
+                count += len(batch)
+                batch = []
+        _upsert(SchoolRating, batch, 'school', ['total_points', 'rank', 'teachers_count'])
+        invalidate_cache()
+    return count + len(batch)
+
+
+def compute_ratings(month=None):
+    """O'qituvchilar va maktablar reytingini hisoblash"""
+    return compute_teacher_ratings(month), compute_school_ratings(month)
+
+
+def rerank_teachers(teacher_ids, month=None):
+    """Faqat bir nechta o'qituvchi bali o'zgarganda reytingni qayta hisoblash
+
+    Bali o'zgargan o'qituvchilar eski va yangi ball oralig'ida harakatlanadi,
+    shu oraliqdan tashqaridagi qatorlarning o'rni o'zgarmaydi. Shuning uchun
+    faqat [min, max] oralig'idagi qatorlar qayta tartiblanadi.
+    """
+    month = month_start(month)
+    teacher_ids = set(teacher_ids)
+    if not teacher_ids:
+        return 0
+
+    with transaction.atomic():
+        ratings = TeacherRating.objects.filter(month=month)
+        if not ratings.exists():
+            # Oy hali hisoblanmagan - compute_ratings buyrug'i to'liq hisoblaydi
+            return 0
+
+        new_totals = dict(
+            _teacher_totals(month).filter(id__in=teacher_ids).values_list('id', 'month_points')
+        )
+        old_totals = dict(ratings.filter(teacher_id__in=teacher_ids).values_list('teacher_id', 'total_points'))
+        if not new_totals:
+            return 0
+
+        values = list(new_totals.values()) + list(old_totals.values())
+        low, high = min(values), max(values)
+        if set(new_totals) - set(old_totals):
+            # Yangi qator o'zidan pastdagi barcha qatorlarni bir o'ringa suradi
+            low = None
+
+        for teacher_id, points in new_totals.items():
+            if teacher_id in old_totals:
+                if old_totals[teacher_id] != points:
+                    ratings.filter(teacher_id=teacher_id).update(total_points=points)
+            else:
+                TeacherRating.objects.create(teacher_id=teacher_id, month=month, total_points=points)
+
+        offset = ratings.filter(total_points__gt=high).count()
+        band = ratings.filter(total_points__lte=high)
+        if low is not None:
+            band = band.filter(total_points__gte=low)
+        band = list(band.order_by('-total_points', 'id'))
+
+        changed = []
+        rank, previous = offset, None
+        for position, rating in enumerate(band, start=offset + 1):
+            if rating.total_points != previous:
+                rank, previous = position, rating.total_points
+            if rating.rank != rank:
+                rating.rank = rank
+                changed.append(rating)
+        TeacherRating.objects.bulk_update(changed, ['rank'], batch_size=BATCH_SIZE)
+        invalidate_cache()
+
+    return len(changed)
+
+
+def changed_teachers(since):
+    """since dan keyin ball olgan o'qituvchilar"""
+    return set(
+        PointsEntry.objects.filter(created_at__gte=since).order_by().values_list('teacher_id', flat=True).distinct()
+    )
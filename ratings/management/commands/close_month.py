@@ -0,0 +1,32 @@
+from datetime import datetime
+from django.core.management.base import BaseCommand, CommandError
+from ratings.month_close import MonthNotFinished, close_month
+
+
+class Command(BaseCommand):
+    help = "Oyni yopish: reyting snapshotlari va monthly_points ni nolga tushirish"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--month', help="Yopiladigan oy (YYYY-MM), standart - o'tgan oy")
+
+    def handle(self, *args, **options):
+        month = None
+        if options['month']:
+            try:
+                month = datetime.strptime(options['month'], '%Y-%m').date()
+            except ValueError:
+                raise CommandError("Oy formati noto'g'ri, YYYY-MM kutilmoqda")
+
+        try:
+            watermark = close_month(month)
+        except MonthNotFinished as e:
+            raise CommandError(str(e))
+
+        if watermark is None:
+            self.stdout.write(self.style.WARNING("Bu oy allaqachon yopilgan"))
+            return
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{watermark} yopildi: {watermark.teachers_count} ta o'qituvchi, "
+            f"{watermark.schools_count} ta maktab"
+        ))
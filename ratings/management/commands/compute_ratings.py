@@ -0,0 +1,70 @@
+import time
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from ratings import engine
+
+
+class Command(BaseCommand):
+    help = "O'qituvchilar va maktablar oylik reytingini hisoblash"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--month', help="Oy (YYYY-MM), standart - joriy oy")
+        parser.add_argument(
+            '--teachers',
+            help="Faqat shu o'qituvchilar uchun qayta tartiblash (vergul bilan ID lar)",
+        )
+        parser.add_argument(
+            '--watch', action='store_true',
+            help="Joriy oy reytingini davriy yangilash: bali o'zgarganlar qayta tartiblanadi",
+        )
+        parser.add_argument('--interval', type=float, default=settings.RATING_RERANK_INTERVAL,
+                            help="--watch rejimida yangilashlar orasidagi vaqt (soniya)")
+
+    def handle(self, *args, **options):
+        if options['watch']:
+            return self.watch(options['interval'])
+
+        month = None
+        if options['month']:
+            try:
+                month = datetime.strptime(options['month'], '%Y-%m').date()
+            except ValueError:
+                raise CommandError("Oy formati noto'g'ri, YYYY-MM kutilmoqda")
+
+        if options['teachers']:
+            try:
+                teacher_ids = [int(pk) for pk in options['teachers'].split(',') if pk.strip()]
+            except ValueError:
+                raise CommandError("O'qituvchi ID lari butun son bo'lishi kerak")
+            changed = engine.rerank_teachers(teacher_ids, month)
+            self.stdout.write(self.style.SUCCESS(f"{changed} ta o'rin yangilandi"))
+            return
+
+        teachers, schools = engine.compute_ratings(month)
+        self.stdout.write(self.style.SUCCESS(
+            f"{teachers} ta o'qituvchi va {schools} ta maktab reytingi hisoblandi"
+        ))
+
+    def watch(self, interval):
+        """Birinchi va har oy boshida to'liq hisoblash, keyin faqat o'zgarganlar
+
+        Kech tasdiqlangan tranzaksiyalar o'tkazib yuborilmasligi uchun har
+        safar oldingi oraliq ham qayta ko'riladi.
+        """
+        month, since = None, None
+        while True:
+            started = timezone.now()
+            if month != engine.month_start():
+                month = engine.month_start()
+                teachers, schools = engine.compute_ratings(month)
+                self.stdout.write(f"{month:%Y-%m}: {teachers} ta o'qituvchi va {schools} ta maktab hisoblandi")
+            else:
+                changed = engine.rerank_teachers(engine.changed_teachers(since), month)
+                if changed:
+                    self.stdout.write(f"{changed} ta o'rin yangilandi")
+            since = started - timedelta(seconds=interval)
+            time.sleep(interval)
@@ -0,0 +1,28 @@
+# Generated by Django 4.2.7 on 2026-10-18 11:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ratings', '0003_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MonthClose',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField(unique=True, verbose_name='Oy')),
+                ('teachers_count', models.IntegerField(default=0, verbose_name="O'qituvchilar soni")),
+                ('schools_count', models.IntegerField(default=0, verbose_name='Maktablar soni')),
+                ('closed_at', models.DateTimeField(auto_now_add=True, verbose_name='Yopilgan vaqt')),
+            ],
+            options={
+                'verbose_name': 'Yopilgan oy',
+                'verbose_name_plural': 'Yopilgan oylar',
+                'ordering': ['-month'],
+            },
+        ),
+    ]
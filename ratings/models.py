@@ -35,4 +35,20 @@ class SchoolRating(models.Model):
         ordering = ['-month', 'rank']
 
     def __str__(self):
-        return f"{self.school.name} - {self.month.strftime('%Y-%m')}"
\ No newline at end of file
+        return f"{self.school.name} - {self.month.strftime('%Y-%m')}"
+
+class MonthClose(models.Model):
+    """Yopilgan oylar (oy yopish jarayoni uchun watermark)"""
+
+    month = models.DateField(unique=True, verbose_name='Oy')
+    teachers_count = models.IntegerField(default=0, verbose_name='O\'qituvchilar soni')
+    schools_count = models.IntegerField(default=0, verbose_name='Maktablar soni')
+    closed_at = models.DateTimeField(auto_now_add=True, verbose_name='Yopilgan vaqt')
+
+    class Meta:
+        verbose_name = 'Yopilgan oy'
+        verbose_name_plural = 'Yopilgan oylar'
+        ordering = ['-month']
+
+    def __str__(self):
+        return self.month.strftime('%Y-%m')
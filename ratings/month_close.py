@@ -0,0 +1,143 @@
+"""
+Oyni yopish.
+
+Bitta tranzaksiyada:
+1. har bir o'qituvchi va maktabning shu oydagi bali PointsEntry jurnalidan
+   (engine.compute_ratings bilan bir xil) TeacherRating/SchoolRating ga
+   INSERT ... SELECT bilan yoziladi (Python ga qator yuklanmaydi);
+2. Teacher.monthly_points bitta UPDATE bilan nolga tushiriladi; oy tugagandan
+   keyin (yopishdan oldin) berilgan ballar jurnaldan qayta hisoblanadi;
+3. MonthClose watermark yoziladi - qayta ishga tushirish hech narsa qilmaydi.
+"""
+from datetime import datetime, time, timedelta
+
+from django.db import IntegrityError, connection, transaction
+from django.db.models import OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from schools.models import School
+from teachers.models import PointsEntry, Teacher
+from .engine import invalidate_cache, month_range, month_start
+from .models import MonthClose, SchoolRating, TeacherRating
+
+
+class MonthNotFinished(Exception):
+    """Hali tugamagan oyni yopishga urinish"""
+
+
+def previous_month(today=None):
+    """O'tgan oyning birinchi kuni"""
+    return month_start(month_start(today) - timedelta(days=1))
+
+
+def _rank_sql(points, table, alias):
+    """RANK() yoki window funksiyasiz bazalar uchun korrelyatsion subquery"""
+    if connection.features.supports_over_clause:
+        return f"RANK() OVER (ORDER BY {points} DESC)"
+    return f"1 + (SELECT COUNT(*) FROM {table} other WHERE other.points > {alias}.points)"
+
+
+def _month_edges(month):
+    """Oy chegaralari PointsEntry.created_at uchun: [boshi, keyingi oy boshi)"""
+    return [timezone.make_aware(datetime.combine(day, time.min)) for day in month_range(month)]
+
+
+def _month_bounds(month):
+    """Oy chegaralari bazaga uzatiladigan ko'rinishda (xom SQL uchun)"""
+    return [connection.ops.adapt_datetimefield_value(edge) for edge in _month_edges(month)]
+
+
+def _snapshot_teachers(month):
+    qn = connection.ops.quote_name
+    teachers = qn(Teacher._meta.db_table)
+    entries = qn(PointsEntry._meta.db_table)
+    ratings = qn(TeacherRating._meta.db_table)
+    sql = f"""
+        WITH totals AS (
+            SELECT t.id AS teacher_id, COALESCE(SUM(p.{qn('points')}), 0) AS points
+            FROM {teachers} t
+            LEFT JOIN {entries} p ON p.{qn('teacher_id')} = t.id
+                AND p.{qn('created_at')} >= %s AND p.{qn('created_at')} < %s
+            GROUP BY t.id
+        )
+        INSERT INTO {ratings} ({qn('teacher_id')}, {qn('month')}, {qn('total_points')}, {qn('rank')})
+        SELECT x.teacher_id, %s, x.points, {_rank_sql('x.points', 'totals', 'x')}
+        FROM totals x
+        WHERE 1 = 1
+        ON CONFLICT ({qn('teacher_id')}, {qn('month')}) DO UPDATE SET
+            {qn('total_points')} = EXCLUDED.{qn('total_points')},
+            {qn('rank')} = EXCLUDED.{qn('rank')}
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(sql, _month_bounds(month) + [month])
+
+
+def _snapshot_schools(month):
+    qn = connection.ops.quote_name
+    schools = qn(School._meta.db_table)
+    teachers = qn(Teacher._meta.db_table)
+    entries = qn(PointsEntry._meta.db_table)
+    ratings = qn(SchoolRating._meta.db_table)
+    sql = f"""
+        WITH totals AS (
+            SELECT s.id AS school_id,
+                   COALESCE(SUM(p.{qn('points')}), 0) AS points,
+                   COUNT(DISTINCT t.id) AS teachers
+            FROM {schools} s
+            LEFT JOIN {teachers} t ON t.{qn('school_id')} = s.id
+            LEFT JOIN {entries} p ON p.{qn('teacher_id')} = t.id
+                AND p.{qn('created_at')} >= %s AND p.{qn('created_at')} < %s
+            GROUP BY s.id
+        )
+        INSERT INTO {ratings} (
+            {qn('school_id')}, {qn('month')}, {qn('total_points')}, {qn('rank')}, {qn('teachers_count')}
+        )
+        SELECT x.school_id, %s, x.points, {_rank_sql('x.points', 'totals', 'x')}, x.teachers
+        FROM totals x
+        WHERE 1 = 1
+        ON CONFLICT ({qn('school_id')}, {qn('month')}) DO UPDATE SET
+            {qn('total_points')} = EXCLUDED.{qn('total_points')},
+            {qn('rank')} = EXCLUDED.{qn('rank')},
+            {qn('teachers_count')} = EXCLUDED.{qn('teachers_count')}
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(sql, _month_bounds(month) + [month])
+
+
+def _reset_monthly_points(month):
+    """monthly_points ni nolga tushirish
+
+    Oy tugagandan keyin berilgan ballar (yopish kechikkan bo'lsa) jurnaldan
+    qayta hisoblanadi - ular yangi oyniki.
+    """
+    _, end = _month_edges(month)
+    later = PointsEntry.objects.filter(teacher=OuterRef('pk'), created_at__gte=end).order_by().values(
+        'teacher'
+    ).annotate(total=Sum('points')).values('total')
+    return Teacher.objects.update(monthly_points=Coalesce(Subquery(later), 0))
+
+
+def close_month(month=None):
+    """Oyni yopish. Oy allaqachon yopilgan bo'lsa None qaytaradi."""
+    month = month_start(month) if month else previous_month()
+    if month >= month_start(timezone.localdate()):
+        raise MonthNotFinished(f"{month:%Y-%m} oyi hali tugamagan")
+
+    with transaction.atomic():
+        try:
+            with transaction.atomic():
+                watermark = MonthClose.objects.create(month=month)
+        except IntegrityError:
+            return None
+
+        _snapshot_teachers(month)
+        _snapshot_schools(month)
+        _reset_monthly_points(month)
+
+        watermark.teachers_count = TeacherRating.objects.filter(month=month).count()
+        watermark.schools_count = SchoolRating.objects.filter(month=month).count()
+        watermark.save(update_fields=['teachers_count', 'schools_count'])
+        invalidate_cache()
+
+    return watermark
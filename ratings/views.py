@@ -1,22 +1,38 @@
-from rest_framework import viewsets
+from datetime import datetime
+from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from .models import TeacherRating, SchoolRating
 from .serializers import TeacherRatingSerializer, SchoolRatingSerializer
+from .engine import latest_month
+from utils.cache import cache_view
+
+
+def resolve_month(request, model):
+    """?month=YYYY-MM parametri yoki oxirgi hisoblangan oy"""
+    month = request.query_params.get('month')
+    if month:
+        return datetime.strptime(month, '%Y-%m').date()
+    return latest_month(model)
 
 
 class TeacherRatingViewSet(viewsets.ReadOnlyModelViewSet):
     """O'qituvchilar reytingi"""
-    queryset = TeacherRating.objects.select_related('teacher').all()
+    queryset = TeacherRating.objects.select_related('teacher__user', 'teacher__school').all()
     serializer_class = TeacherRatingSerializer
     permission_classes = [IsAuthenticated]
 
     @action(detail=False, methods=['get'])
+    @cache_view('ratings', vary=None)
     def top_teachers(self, request):
         """Top o'qituvchilar"""
         limit = request.query_params.get('limit', 10)
-        ratings = TeacherRating.objects.order_by('rank')[:int(limit)]
+        try:
+            month = resolve_month(request, TeacherRating)
+        except ValueError:
+            return Response({'error': 'Oy formati noto\'g\'ri (YYYY-MM)'}, status=status.HTTP_400_BAD_REQUEST)
+        ratings = self.get_queryset().filter(month=month).order_by('rank')[:int(limit)]
         serializer = self.get_serializer(ratings, many=True)
         return Response(serializer.data)
 
@@ -28,9 +44,14 @@ class SchoolRatingViewSet(viewsets.ReadOnlyModelViewSet):
     permission_classes = [IsAuthenticated]
 
     @action(detail=False, methods=['get'])
+    @cache_view('ratings', vary=None)
     def top_schools(self, request):
         """Top maktablar"""
         limit = request.query_params.get('limit', 10)
-        ratings = SchoolRating.objects.order_by('rank')[:int(limit)]
+        try:
+            month = resolve_month(request, SchoolRating)
+        except ValueError:
+            return Response({'error': 'Oy formati noto\'g\'ri (YYYY-MM)'}, status=status.HTTP_400_BAD_REQUEST)
+        ratings = self.get_queryset().filter(month=month).order_by('rank')[:int(limit)]
         serializer = self.get_serializer(ratings, many=True)
-        return Response(serializer.data)
\ No newline at end of file
+        return Response(serializer.data)
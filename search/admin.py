@@ -0,0 +1,10 @@
+from django.contrib import admin
+from .models import SearchDocument
+
+
+@admin.register(SearchDocument)
+class SearchDocumentAdmin(admin.ModelAdmin):
+    list_display = ['kind', 'object_id', 'title', 'subject', 'grade', 'is_public', 'indexed_at']
+    list_filter = ['kind', 'is_public']
+    search_fields = ['title']
+    raw_id_fields = ['owner', 'school']
@@ -0,0 +1,65 @@
+"""
+Baza turiga qarab to'liq matnli qidiruv.
+
+- PostgreSQL: search_vector @@ to_tsquery('simple', ...), reyting ts_rank_cd;
+- SQLite: FTS5 MATCH, reyting bm25 (sarlavha 10 barobar og'irroq);
+- boshqa bazalar: icontains (reytingsiz).
+
+Har bir so'z prefiks sifatida izlanadi va barcha so'zlar mos kelishi kerak.
+"""
+from django.db import connection
+from django.db.models import BooleanField, FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+
+from .models import SearchDocument
+from .text import tokens
+
+TABLE = SearchDocument._meta.db_table
+FTS_TABLE = f'{TABLE}_fts'
+
+
+def _postgresql(queryset, words):
+    query = ' & '.join(f'{word}:*' for word in words)
+    return queryset.alias(
+        search_match=RawSQL(
+            f"{TABLE}.search_vector @@ to_tsquery('simple', %s)", [query], output_field=BooleanField()
+        )
+    ).filter(search_match=True).annotate(
+        rank=RawSQL(
+            f"ts_rank_cd({TABLE}.search_vector, to_tsquery('simple', %s))", [query], output_field=FloatField()
+        )
+    )
+
+
+def _sqlite(queryset, words):
+    query = ' '.join(f'"{word}"*' for word in words)
+    return queryset.filter(
+        id__in=RawSQL(f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", [query])
+    ).annotate(
+        rank=RawSQL(
+            f"(SELECT -bm25({FTS_TABLE}, 10.0, 1.0) FROM {FTS_TABLE} "
+            f"WHERE {FTS_TABLE} MATCH %s AND {FTS_TABLE}.rowid = {TABLE}.id)",
+            [query],
+            output_field=FloatField(),
+        )
+    )
+
+
+def _fallback(queryset, words):
+    for word in words:
+        queryset = queryset.filter(Q(search_title__icontains=word) | Q(search_body__icontains=word))
+    return queryset.annotate(rank=Value(0.0, output_field=FloatField()))
+
+
+BACKENDS = {
+    'postgresql': _postgresql,
+    'sqlite': _sqlite,
+}
+
+
+def match(queryset, q):
+    """SearchDocument querysetini so'rov bo'yicha filtrlash va 'rank' bilan belgilash"""
+    words = tokens(q)
+    if not words:
+        return queryset.none()
+    return BACKENDS.get(connection.vendor, _fallback)(queryset, words)
@@ -0,0 +1,18 @@
+from rest_framework.filters import BaseFilterBackend
+from .index import search_objects
+
+
+class FullTextSearchFilter(BaseFilterBackend):
+    """?q= - to'liq matnli qidiruv (view da search_kind ko'rsatilgan bo'lsa)
+
+    Natija mosligi bo'yicha tartiblanadi; ?ordering= berilsa OrderingFilter
+    tartibni o'zgartiradi.
+    """
+    search_param = 'q'
+
+    def filter_queryset(self, request, queryset, view):
+        kind = getattr(view, 'search_kind', None)
+        q = request.query_params.get(self.search_param, '').strip()
+        if not kind or not q:
+            return queryset
+        return search_objects(queryset, kind, q)
@@ -0,0 +1,178 @@
+"""
+Qidiruv indeksini yuritish.
+
+Har bir indekslanadigan model uchun hujjat quruvchi funksiya bor. Obyekt
+saqlanganda/o'chirilganda (search/signals.py) hujjat yangilanadi,
+rebuild() esa indeksni to'liq qayta quradi.
+"""
+from django.apps import apps
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Case, IntegerField, When
+
+from .backends import match
+from .models import SearchDocument
+from .text import normalize
+
+BATCH_SIZE = 1000
+
+
+def _material(material):
+    return {
+        'title': material.title,
+        'body': material.description,
+        'subject': material.subject,
+        'grade': material.grade,
+        'owner_id': material.teacher_id,
+        'school_id': material.teacher.school_id,
+        'is_public': material.is_approved,
+        'created_at': material.created_at,
+    }
+
+
+def _video(video):
+    return {
+        'title': video.title,
+        'body': video.description,
+        'subject': video.subject,
+        'grade': video.grade,
+        'owner_id': video.teacher_id,
+        'school_id': video.teacher.school_id,
+        'is_public': video.is_approved,
+        'created_at': video.created_at,
+    }
+
+
+def _library(resource):
+    return {
+        'title': resource.title,
+        'body': f"{resource.author}\n{resource.description}",
+        'subject': resource.resource_type,
+        'is_public': True,
+        'created_at': resource.created_at,
+    }
+
+
+def _mocktest(test):
+    return {
+        'title': test.title,
+        'body': test.description,
+        'subject': test.subject,
+        'is_public': True,
+        'created_at': test.created_at,
+    }
+
+
+def _teacher(teacher):
+    school = teacher.school
+    return {
+        'title': teacher.user.get_full_name() or teacher.user.username,
+        'body': f"{teacher.get_subject_display()}\n{school.name if school else ''}\n{teacher.bio}",
+        'subject': teacher.subject,
+        'owner_id': teacher.pk,
+        'school_id': teacher.school_id,
+        'is_public': True,
+        'created_at': teacher.created_at,
+    }
+
+
+# turi: (model, hujjat quruvchi, rebuild uchun select_related)
+INDEXED = {
+    'material': ('materials.Material', _material, ['teacher']),
+    'video': ('videos.Video', _video, ['teacher']),
+    'library': ('library.LibraryResource', _library, []),
+    'mocktest': ('mock_tests.MockTest', _mocktest, []),
+    'teacher': ('teachers.Teacher', _teacher, ['user', 'school']),
+}
+
+
+def kind_for(model):
+    """Model uchun indeks turi (indekslanmasa None)"""
+    label = model._meta.label
+    for kind, (model_label, _, _) in INDEXED.items():
+        if model_label == label:
+            return kind
+    return None
+
+
+def _document(kind, obj):
+    fields = INDEXED[kind][1](obj)
+    return SearchDocument(
+        kind=kind,
+        object_id=obj.pk,
+        title=fields['title'][:300],
+        search_title=normalize(fields['title']),
+        search_body=normalize(fields['body']),
+        subject=fields.get('subject') or '',
+        grade=fields.get('grade'),
+        owner_id=fields.get('owner_id'),
+        school_id=fields.get('school_id'),
+        is_public=fields.get('is_public', True),
+        created_at=fields.get('created_at'),
+    )
+
+
+def update_document(obj):
+    """Obyekt hujjatini yaratish yoki yangilash"""
+    kind = kind_for(type(obj))
+    document = _document(kind, obj)
+    values = {
+        field.attname: getattr(document, field.attname)
+        for field in SearchDocument._meta.concrete_fields
+        if field.attname not in ('id', 'kind', 'object_id', 'indexed_at')
+    }
+    SearchDocument.objects.update_or_create(kind=kind, object_id=obj.pk, defaults=values)
+
+
+def refresh_public(model, pks, is_public=True):
+    """queryset.update() dan keyin (signal ishlamaydi) hujjatlar ko'rinishini yangilash"""
+    return SearchDocument.objects.filter(kind=kind_for(model), object_id__in=pks).update(is_public=is_public)
+
+
+def delete_document(obj):
+    """Obyekt hujjatini indeksdan o'chirish"""
+    SearchDocument.objects.filter(kind=kind_for(type(obj)), object_id=obj.pk).delete()
+
+
+def rebuild(kinds=None):
+    """Indeksni qayta qurish. Indekslangan hujjatlar soni qaytariladi."""
+    count = 0
+    for kind in kinds or INDEXED:
+        model_label, _, related = INDEXED[kind]
+        model = apps.get_model(model_label)
+        with transaction.atomic():
+            SearchDocument.objects.filter(kind=kind).delete()
+            batch = []
+            for obj in model.objects.select_related(*related).iterator(chunk_size=BATCH_SIZE):
+                batch.append(_document(kind, obj))
+                if len(batch) >= BATCH_SIZE:
+                    SearchDocument.objects.bulk_create(batch)
+                    count += len(batch)
+                    batch = []
+            SearchDocument.objects.bulk_create(batch)
+            count += len(batch)
+    return count
+
+
+def ranked_ids(kind, q, limit=None, within=None):
+    """So'rovga mos obyekt ID lari (eng mosi birinchi)
+
+    within - model querysetini (foydalanuvchi ko'radigan obyektlar) subquery
+    sifatida qo'llash: natijalar soni chegarasi ko'rinmaydigan hujjatlarga
+    sarflanmaydi.
+    """
+    documents = match(SearchDocument.objects.filter(kind=kind), q)
+    if within is not None:
+        documents = documents.filter(object_id__in=within.values('pk'))
+    limit = limit or settings.SEARCH_MAX_RESULTS
+    return list(documents.order_by('-rank', '-created_at').values_list('object_id', flat=True)[:limit])
+
+
+def search_objects(queryset, kind, q):
+    """Model querysetini qidiruv natijasi bilan cheklash va reyting bo'yicha tartiblash"""
+    ids = ranked_ids(kind, q, within=queryset)
+    if not ids:
+        return queryset.none()
+    return queryset.filter(pk__in=ids).order_by(
+        Case(*[When(pk=pk, then=position) for position, pk in enumerate(ids)], output_field=IntegerField())
+    )
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from search.index import INDEXED, rebuild
+
+
+class Command(BaseCommand):
+    help = "To'liq matnli qidiruv indeksini qayta qurish"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--kind', action='append', choices=list(INDEXED), help="Faqat shu turdagi hujjatlar")
+
+    def handle(self, *args, **options):
+        count = rebuild(options['kind'])
+        self.stdout.write(self.style.SUCCESS(f"{count} ta hujjat indekslandi"))
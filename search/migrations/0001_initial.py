@@ -0,0 +1,110 @@
+# Generated by Django 4.2.7 on 2026-10-18 11:40
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+POSTGRES_SQL = [
+    """
+    ALTER TABLE search_searchdocument ADD COLUMN search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(search_title, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(search_body, '')), 'B')
+    ) STORED
+    """,
+    "CREATE INDEX search_document_vector_idx ON search_searchdocument USING GIN (search_vector)",
+]
+
+SQLITE_SQL = [
+    """
+    CREATE VIRTUAL TABLE search_searchdocument_fts USING fts5(
+        search_title, search_body,
+        content='search_searchdocument', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER search_searchdocument_ai AFTER INSERT ON search_searchdocument BEGIN
+        INSERT INTO search_searchdocument_fts(rowid, search_title, search_body)
+        VALUES (new.id, new.search_title, new.search_body);
+    END
+    """,
+    """
+    CREATE TRIGGER search_searchdocument_ad AFTER DELETE ON search_searchdocument BEGIN
+        INSERT INTO search_searchdocument_fts(search_searchdocument_fts, rowid, search_title, search_body)
+        VALUES ('delete', old.id, old.search_title, old.search_body);
+    END
+    """,
+    """
+    CREATE TRIGGER search_searchdocument_au AFTER UPDATE ON search_searchdocument BEGIN
+        INSERT INTO search_searchdocument_fts(search_searchdocument_fts, rowid, search_title, search_body)
+        VALUES ('delete', old.id, old.search_title, old.search_body);
+        INSERT INTO search_searchdocument_fts(rowid, search_title, search_body)
+        VALUES (new.id, new.search_title, new.search_body);
+    END
+    """,
+]
+
+SQLITE_REVERSE_SQL = [
+    "DROP TRIGGER IF EXISTS search_searchdocument_au",
+    "DROP TRIGGER IF EXISTS search_searchdocument_ad",
+    "DROP TRIGGER IF EXISTS search_searchdocument_ai",
+    "DROP TABLE IF EXISTS search_searchdocument_fts",
+]
+
+
+def create_text_index(apps, schema_editor):
+    """Postgres - tsvector + GIN, SQLite - FTS5 + triggerlar"""
+    statements = {
+        'postgresql': POSTGRES_SQL,
+        'sqlite': SQLITE_SQL,
+    }.get(schema_editor.connection.vendor, [])
+    for sql in statements:
+        schema_editor.execute(sql)
+
+
+def drop_text_index(apps, schema_editor):
+    # Postgres da ustun va indeks jadval bilan birga o'chadi
+    if schema_editor.connection.vendor == 'sqlite':
+        for sql in SQLITE_REVERSE_SQL:
+            schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('schools', '0002_initial'),
+        ('teachers', '0005_pointsentry'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchDocument',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('material', 'Material'), ('video', 'Video'), ('library', 'Kutubxona')], max_length=20, verbose_name='Turi')),
+                ('object_id', models.BigIntegerField(verbose_name='Obyekt ID')),
+                ('title', models.CharField(max_length=300, verbose_name='Sarlavha')),
+                ('search_title', models.TextField(blank=True)),
+                ('search_body', models.TextField(blank=True)),
+                ('subject', models.CharField(blank=True, max_length=50, verbose_name='Fan/turkum')),
+                ('is_public', models.BooleanField(default=True, verbose_name="Hammaga ko'rinadi")),
+                ('created_at', models.DateTimeField(blank=True, null=True, verbose_name='Yaratilgan')),
+                ('indexed_at', models.DateTimeField(auto_now=True, verbose_name='Indekslangan')),
+                ('owner', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='teachers.teacher', verbose_name='Egasi')),
+                ('school', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='schools.school', verbose_name='Maktab')),
+            ],
+            options={
+                'verbose_name': 'Qidiruv hujjati',
+                'verbose_name_plural': 'Qidiruv hujjatlari',
+                'indexes': [models.Index(fields=['kind', 'subject'], name='search_doc_kind_subject_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='searchdocument',
+            constraint=models.UniqueConstraint(fields=('kind', 'object_id'), name='unique_search_document'),
+        ),
+        migrations.RunPython(create_text_index, drop_text_index),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.7 on 2026-10-18 11:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('search', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='searchdocument',
+            name='grade',
+            field=models.IntegerField(blank=True, null=True, verbose_name='Sinf'),
+        ),
+        migrations.AlterField(
+            model_name='searchdocument',
+            name='kind',
+            field=models.CharField(choices=[('material', 'Material'), ('video', 'Video'), ('library', 'Kutubxona'), ('mocktest', 'Mock test'), ('teacher', "O'qituvchi")], max_length=20, verbose_name='Turi'),
+        ),
+    ]
@@ -0,0 +1,61 @@
+from django.db import models
+
+
+class SearchDocument(models.Model):
+    """To'liq matnli qidiruv indeksidagi hujjat (har bir obyekt uchun bitta qator)
+
+    search_title/search_body normallashtirilgan matn. Postgres da ulardan
+    search_vector (tsvector, GIN indeks) generatsiya qilinadi, SQLite da
+    FTS5 jadvali triggerlar orqali yangilanadi (0001 migratsiyasi).
+    """
+
+    KIND_CHOICES = [
+        ('material', 'Material'),
+        ('video', 'Video'),
+        ('library', 'Kutubxona'),
+        ('mocktest', 'Mock test'),
+        ('teacher', 'O\'qituvchi'),
+    ]
+
+    # Egasi/maktabi yo'q, barcha foydalanuvchilarga ko'rinadigan turlar
+    UNSCOPED_KINDS = ['library', 'mocktest']
+
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES, verbose_name='Turi')
+    object_id = models.BigIntegerField(verbose_name='Obyekt ID')
+    title = models.CharField(max_length=300, verbose_name='Sarlavha')
+    search_title = models.TextField(blank=True)
+    search_body = models.TextField(blank=True)
+    subject = models.CharField(max_length=50, blank=True, verbose_name='Fan/turkum')
+    grade = models.IntegerField(null=True, blank=True, verbose_name='Sinf')
+    owner = models.ForeignKey(
+        'teachers.Teacher',
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='+',
+        verbose_name='Egasi'
+    )
+    school = models.ForeignKey(
+        'schools.School',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+',
+        verbose_name='Maktab'
+    )
+    is_public = models.BooleanField(default=True, verbose_name='Hammaga ko\'rinadi')
+    created_at = models.DateTimeField(null=True, blank=True, verbose_name='Yaratilgan')
+    indexed_at = models.DateTimeField(auto_now=True, verbose_name='Indekslangan')
+
+    class Meta:
+        verbose_name = 'Qidiruv hujjati'
+        verbose_name_plural = 'Qidiruv hujjatlari'
+        constraints = [
+            models.UniqueConstraint(fields=['kind', 'object_id'], name='unique_search_document'),
+        ]
+        indexes = [
+            models.Index(fields=['kind', 'subject'], name='search_doc_kind_subject_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} #{self.object_id}: {self.title}"
@@ -0,0 +1,52 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from library.models import LibraryResource
+from materials.models import Material
+from mock_tests.models import MockTest
+from teachers.models import Teacher
+from videos.models import Video
+from . import index
+from .models import SearchDocument
+
+
+@receiver(post_save, sender=Material)
+@receiver(post_save, sender=Video)
+@receiver(post_save, sender=LibraryResource)
+@receiver(post_save, sender=MockTest)
+@receiver(post_save, sender=Teacher)
+def document_saved(sender, instance, raw=False, **kwargs):
+    if not raw:
+        index.update_document(instance)
+
+
+@receiver(post_delete, sender=Material)
+@receiver(post_delete, sender=Video)
+@receiver(post_delete, sender=LibraryResource)
+@receiver(post_delete, sender=MockTest)
+@receiver(post_delete, sender=Teacher)
+def document_deleted(sender, instance, **kwargs):
+    index.delete_document(instance)
+
+
+@receiver(post_save, sender=Teacher)
+def teacher_moved(sender, instance, created, raw=False, **kwargs):
+    # O'qituvchi boshqa maktabga o'tsa hujjatlari ham o'tadi
+    if not created and not raw:
+        SearchDocument.objects.filter(owner_id=instance.pk).exclude(
+            school_id=instance.school_id
+        ).update(school_id=instance.school_id)
+
+
+NAME_FIELDS = {'username', 'first_name', 'last_name'}
+
+
+@receiver(post_save, sender=get_user_model())
+def user_renamed(sender, instance, created, update_fields=None, raw=False, **kwargs):
+    # O'qituvchi hujjati sarlavhasi - foydalanuvchi ismi (last_login kabi yangilanishlar o'tkazib yuboriladi)
+    if created or raw or (update_fields and not NAME_FIELDS & set(update_fields)):
+        return
+    teacher = Teacher.objects.select_related('school').filter(user=instance).first()
+    if teacher is not None:
+        teacher.user = instance
+        index.update_document(teacher)
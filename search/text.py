@@ -0,0 +1,43 @@
+"""
+Qidiruv uchun matnni normallashtirish.
+
+Indeks va so'rov bir xil normallashtiriladi:
+- kichik harflarga o'tkaziladi;
+- o'zbekcha apostroflar (o', o‘, oʻ, g’ ...) olib tashlanadi - "o'qituvchi",
+  "o‘qituvchi" va "oqituvchi" bir xil topiladi;
+- kirill yozuvi lotinga o'giriladi (o'zbek lotin alifbosi bo'yicha) -
+  "ўқитувчи" ham "oqituvchi" bo'ladi, rus so'zlari ham lotincha izlanadi;
+- diakritik belgilar olib tashlanadi.
+"""
+import re
+import unicodedata
+
+MAX_TOKENS = 10
+
+APOSTROPHES = str.maketrans('', '', "'`ʻʼ‘’‛′´")
+
+CYRILLIC = {
+    'а': 'a', 'б': 'b', 'в': 'v', 'г': 'g', 'д': 'd', 'е': 'e', 'ё': 'yo',
+    'ж': 'j', 'з': 'z', 'и': 'i', 'й': 'y', 'к': 'k', 'л': 'l', 'м': 'm',
+    'н': 'n', 'о': 'o', 'п': 'p', 'р': 'r', 'с': 's', 'т': 't', 'у': 'u',
+    'ф': 'f', 'х': 'x', 'ц': 'ts', 'ч': 'ch', 'ш': 'sh', 'щ': 'sh', 'ъ': '',
+    'ы': 'i', 'ь': '', 'э': 'e', 'ю': 'yu', 'я': 'ya',
+    'ў': 'o', 'қ': 'q', 'ғ': 'g', 'ҳ': 'h',
+}
+
+WORD_RE = re.compile(r'\w+')
+
+
+def normalize(text):
+    """Matnni indeks/so'rov uchun normallashtirish"""
+    if not text:
+        return ''
+    text = text.casefold().translate(APOSTROPHES)
+    text = ''.join(CYRILLIC.get(char, char) for char in text)
+    text = unicodedata.normalize('NFKD', text)
+    return ''.join(char for char in text if not unicodedata.combining(char))
+
+
+def tokens(text):
+    """So'rovdagi so'zlar (normallashtirilgan, ko'pi bilan MAX_TOKENS ta)"""
+    return WORD_RE.findall(normalize(text))[:MAX_TOKENS]
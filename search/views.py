@@ -0,0 +1,108 @@
+from django.db.models import Count, Q
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .backends import match
+from .models import SearchDocument
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+
+
+def scope(request):
+    """Foydalanuvchi ko'ra oladigan hujjatlar (MaterialViewSet.get_queryset bilan bir xil qoidalar)"""
+    user = request.user
+    documents = SearchDocument.objects.all()
+    unscoped = Q(kind__in=SearchDocument.UNSCOPED_KINDS)
+
+    if user.role == 'admin':
+        documents = documents.filter(unscoped | Q(school__director=user))
+    elif user.role == 'teacher':
+        teacher = request.profile.teacher
+        visible = unscoped | Q(is_public=True)
+        if teacher is not None:
+            visible |= Q(owner=teacher)
+        documents = documents.filter(visible)
+    return documents
+
+
+def facet_counts(documents, kinds=None, subject=None, grade=None):
+    """Tur, fan va sinf bo'yicha sonlar - bitta GROUP BY so'rovi
+
+    Fasetlar filtrlarsiz, jami son esa tanlangan filtrlar bo'yicha shu
+    guruhlardan hisoblanadi.
+    """
+    facets = {'type': {}, 'subject': {}, 'grade': {}}
+    total = 0
+    rows = documents.order_by().values_list('kind', 'subject', 'grade').annotate(n=Count('id'))
+    for row_kind, row_subject, row_grade, n in rows:
+        if (not kinds or row_kind in kinds) and (not subject or row_subject == subject) \
+                and (grade is None or row_grade == grade):
+            total += n
+        facets['type'][row_kind] = facets['type'].get(row_kind, 0) + n
+        if row_subject:
+            facets['subject'][row_subject] = facets['subject'].get(row_subject, 0) + n
+        if row_grade is not None:
+            facets['grade'][row_grade] = facets['grade'].get(row_grade, 0) + n
+    return total, facets
+
+
+class SearchView(APIView):
+    """Materiallar, videolar, kutubxona, mock testlar va o'qituvchilar bo'yicha umumiy qidiruv
+
+    ?q= - so'rov, ?type=material,video / ?subject= / ?grade= - filtrlar,
+    ?limit= va ?offset= - sahifalash. count - filtrlangan natijalar soni; faset
+    sonlari filtrlarsiz (faqat so'rov bo'yicha) hisoblanadi, shunda boshqa
+    qiymatlarni tanlash mumkin.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        q = request.query_params.get('q', '').strip()
+        if not q:
+            return Response({'error': 'q parametri kerak'}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            limit = min(int(request.query_params.get('limit', DEFAULT_LIMIT)), MAX_LIMIT)
+            offset = max(int(request.query_params.get('offset', 0)), 0)
+            grade = request.query_params.get('grade')
+            grade = int(grade) if grade else None
+        except ValueError:
+            return Response({'error': 'limit, offset va grade butun son bo\'lishi kerak'},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        documents = match(scope(request), q)
+        kinds = [kind for kind in request.query_params.get('type', '').split(',') if kind]
+        subject = request.query_params.get('subject')
+        total, facets = facet_counts(documents, kinds=kinds, subject=subject, grade=grade)
+
+        if kinds:
+            documents = documents.filter(kind__in=kinds)
+        if subject:
+            documents = documents.filter(subject=subject)
+        if grade is not None:
+            documents = documents.filter(grade=grade)
+
+        hits = documents.order_by('-rank', '-created_at').values(
+            'kind', 'object_id', 'title', 'subject', 'grade', 'created_at', 'rank'
+        )[offset:offset + limit]
+
+        return Response({
+            'query': q,
+            'count': total,
+            'facets': facets,
+            'results': [
+                {
+                    'type': hit['kind'],
+                    'id': hit['object_id'],
+                    'title': hit['title'],
+                    'subject': hit['subject'],
+                    'grade': hit['grade'],
+                    'created_at': hit['created_at'],
+                    'score': hit['rank'],
+                }
+                for hit in hits
+            ],
+        })
@@ -0,0 +1,27 @@
+#!/bin/sh
+# Konteyner ishga tushishi (Dockerfile CMD): migratsiyalar, fon workerlari
+# va gunicorn. Railway faqat Dockerfile dan quradi, Procfile ishlatilmaydi -
+# shuning uchun Procfile dagi workerlar shu yerda ham ishga tushiriladi.
+set -e
+
+python manage.py migrate --noinput
+python manage.py createcachetable
+
+# Fon workeri: to'xtab qolsa bir necha soniyadan keyin qayta ishga tushadi
+worker() {
+    while true; do
+        python manage.py "$@" || echo "$1 to'xtadi, qayta ishga tushirilmoqda"
+        sleep 5
+    done
+}
+
+# Fon rejimidagi hisobotlar (?async=1 eksportlar)
+worker run_report_jobs &
+# Test sessiyalari buferlarini bazaga yozish va muddati o'tganlarini yakunlash
+worker flush_attempt_sessions &
+# Joriy oy reytingi (ball berish so'rovlari reytingni qayta tartiblamaydi)
+worker compute_ratings --watch &
+# Mock test savollari tahlili (item_analysis API faqat o'qiydi)
+worker analyze_items --watch &
+
+exec gunicorn edu_monitoring.wsgi --bind 0.0.0.0:${PORT:-8000} --workers 2 --threads 4 --worker-class gthread --timeout 120
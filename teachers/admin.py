@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Teacher, TeacherActivity
+from .models import Teacher, TeacherActivity, TeacherActivityDaily, PointsEntry
 
 
 @admin.register(Teacher)
@@ -15,4 +15,19 @@ class TeacherActivityAdmin(admin.ModelAdmin):
     list_display = ['teacher', 'activity_type', 'title', 'points', 'date']
     list_filter = ['activity_type', 'date']
     search_fields = ['title', 'description']
-    raw_id_fields = ['teacher']
\ No newline at end of file
+    raw_id_fields = ['teacher']
+
+
+@admin.register(TeacherActivityDaily)
+class TeacherActivityDailyAdmin(admin.ModelAdmin):
+    list_display = ['day', 'teacher', 'school', 'activity_type', 'count', 'points']
+    list_filter = ['activity_type', 'day']
+    raw_id_fields = ['teacher', 'school']
+
+
+
+@admin.register(PointsEntry)
+class PointsEntryAdmin(admin.ModelAdmin):
+    list_display = ['teacher', 'points', 'reason', 'source_type', 'source_id', 'created_at']
+    list_filter = ['reason', 'created_at']
+    raw_id_fields = ['teacher']
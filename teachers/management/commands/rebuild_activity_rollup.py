@@ -0,0 +1,24 @@
+from datetime import date
+from django.core.management.base import BaseCommand, CommandError
+from teachers import rollup
+
+
+class Command(BaseCommand):
+    help = "Kunlik faoliyat rollup jadvalini TeacherActivity dan qayta qurish"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--since',
+            help="Faqat shu sanadan boshlab qayta qurish (YYYY-MM-DD)",
+        )
+
+    def handle(self, *args, **options):
+        since = None
+        if options['since']:
+            try:
+                since = date.fromisoformat(options['since'])
+            except ValueError:
+                raise CommandError("Sana formati noto'g'ri, YYYY-MM-DD kutilmoqda")
+
+        count = rollup.rebuild(since=since)
+        self.stdout.write(self.style.SUCCESS(f"{count} ta kunlik qator yozildi"))
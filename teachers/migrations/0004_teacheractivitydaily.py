@@ -0,0 +1,34 @@
+# Generated by Django 4.2.7 on 2026-10-18 11:24
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('schools', '0002_initial'),
+        ('teachers', '0003_alter_teacher_subject'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TeacherActivityDaily',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(verbose_name='Kun')),
+                ('activity_type', models.CharField(max_length=20, verbose_name='Faoliyat turi')),
+                ('count', models.IntegerField(default=0, verbose_name='Soni')),
+                ('points', models.IntegerField(default=0, verbose_name='Ball')),
+                ('school', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_activities', to='schools.school', verbose_name='Maktab')),
+                ('teacher', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_activities', to='teachers.teacher')),
+            ],
+            options={
+                'verbose_name': 'Kunlik faoliyat',
+                'verbose_name_plural': 'Kunlik faoliyatlar',
+                'ordering': ['day'],
+                'indexes': [models.Index(fields=['day', 'activity_type'], name='teacher_act_daily_day_idx'), models.Index(fields=['teacher', 'day'], name='teacher_act_daily_teacher_idx')],
+                'unique_together': {('day', 'teacher', 'school', 'activity_type')},
+            },
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 4.2.7 on 2026-10-18 11:25
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('teachers', '0004_teacheractivitydaily'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PointsEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('points', models.IntegerField(verbose_name='Ball')),
+                ('reason', models.CharField(choices=[('material_approved', 'Material tasdiqlandi'), ('video_approved', 'Video tasdiqlandi'), ('analysis_received', 'Dars tahlili qabul qilindi'), ('analysis_given', 'Dars tahlili berildi'), ('consultation_completed', 'Maslahat yakunlandi'), ('adjustment', 'Tuzatish')], max_length=30, verbose_name='Sabab')),
+                ('source_type', models.CharField(blank=True, max_length=30, verbose_name='Manba turi')),
+                ('source_id', models.PositiveBigIntegerField(blank=True, null=True, verbose_name='Manba ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Yaratilgan')),
+                ('teacher', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='points_entries', to='teachers.teacher')),
+            ],
+            options={
+                'verbose_name': 'Ball yozuvi',
+                'verbose_name_plural': 'Ball yozuvlari',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['teacher', 'created_at'], name='points_entry_teacher_idx'), models.Index(fields=['created_at'], name='points_entry_created_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='pointsentry',
+            constraint=models.UniqueConstraint(condition=models.Q(('source_id__isnull', False)), fields=('teacher', 'reason', 'source_type', 'source_id'), name='unique_points_entry_source'),
+        ),
+    ]
@@ -91,4 +91,72 @@ class TeacherActivity(models.Model):
         ordering = ['-date']
 
     def __str__(self):
-        return f"{self.teacher.user.get_full_name()} - {self.title}"
\ No newline at end of file
+        return f"{self.teacher.user.get_full_name()} - {self.title}"
+
+class TeacherActivityDaily(models.Model):
+    """Faoliyatlarning kunlik yig'indisi (grafiklar uchun)"""
+
+    day = models.DateField(verbose_name='Kun')
+    teacher = models.ForeignKey(Teacher, on_delete=models.CASCADE, related_name='daily_activities')
+    school = models.ForeignKey(
+        'schools.School',
+        on_delete=models.CASCADE,
+        related_name='daily_activities',
+        verbose_name='Maktab'
+    )
+    activity_type = models.CharField(max_length=20, verbose_name='Faoliyat turi')
+    count = models.IntegerField(default=0, verbose_name='Soni')
+    points = models.IntegerField(default=0, verbose_name='Ball')
+
+    class Meta:
+        verbose_name = 'Kunlik faoliyat'
+        verbose_name_plural = 'Kunlik faoliyatlar'
+        unique_together = ['day', 'teacher', 'school', 'activity_type']
+        indexes = [
+            models.Index(fields=['day', 'activity_type'], name='teacher_act_daily_day_idx'),
+            models.Index(fields=['teacher', 'day'], name='teacher_act_daily_teacher_idx'),
+        ]
+        ordering = ['day']
+
+    def __str__(self):
+        return f"{self.teacher_id} - {self.day} - {self.activity_type}"
+
+
+class PointsEntry(models.Model):
+    """Ballar jurnali - faqat yoziladi, o'zgartirilmaydi"""
+
+    REASON_CHOICES = [
+        ('material_approved', 'Material tasdiqlandi'),
+        ('video_approved', 'Video tasdiqlandi'),
+        ('analysis_received', 'Dars tahlili qabul qilindi'),
+        ('analysis_given', 'Dars tahlili berildi'),
+        ('consultation_completed', 'Maslahat yakunlandi'),
+        ('adjustment', 'Tuzatish'),
+    ]
+
+    teacher = models.ForeignKey(Teacher, on_delete=models.CASCADE, related_name='points_entries')
+    points = models.IntegerField(verbose_name='Ball')
+    reason = models.CharField(max_length=30, choices=REASON_CHOICES, verbose_name='Sabab')
+    source_type = models.CharField(max_length=30, blank=True, verbose_name='Manba turi')
+    source_id = models.PositiveBigIntegerField(null=True, blank=True, verbose_name='Manba ID')
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name='Yaratilgan')
+
+    class Meta:
+        verbose_name = 'Ball yozuvi'
+        verbose_name_plural = 'Ball yozuvlari'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['teacher', 'created_at'], name='points_entry_teacher_idx'),
+            models.Index(fields=['created_at'], name='points_entry_created_idx'),
+        ]
+        constraints = [
+            # Bitta manba uchun ball ikki marta berilmasligi kerak
+            models.UniqueConstraint(
+                fields=['teacher', 'reason', 'source_type', 'source_id'],
+                condition=models.Q(source_id__isnull=False),
+                name='unique_points_entry_source'
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.teacher_id}: {self.points:+d} ({self.reason})"
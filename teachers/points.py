@@ -0,0 +1,151 @@
+"""
+Ballar xizmati.
+
+Barcha ball o'zgarishlari shu yerdan o'tadi: PointsEntry jurnaliga yozuv
+qo'shiladi va Teacher balansi hamda darajasi bitta F() UPDATE bilan
+o'zgartiriladi. Read-modify-write bo'lmagani uchun parallel tasdiqlashlarda
+ballar yo'qolmaydi.
+"""
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Case, F, Value, When
+from django.db.models.lookups import GreaterThanOrEqual
+
+from .models import PointsEntry, Teacher
+
+POINT_VALUES = {
+    'material_approved': 10,
+    'video_approved': 15,
+    'analysis_received': 5,
+    'analysis_given': 10,
+    'consultation_completed': 5,
+}
+
+
+def level_expression(delta):
+    """Yangi balans bo'yicha darajani SQL ichida hisoblash
+
+    delta - butun son yoki har bir qator uchun farqni beruvchi ifoda.
+    """
+    new_total = F('total_points') + delta
+    thresholds = sorted(settings.LEVEL_THRESHOLDS.items(), key=lambda item: item[1], reverse=True)
+    return Case(
+        *[
+            When(GreaterThanOrEqual(new_total, threshold), then=Value(level))
+            for level, threshold in thresholds
+        ],
+        default=Value('teacher'),
+    )
+
+
+def _source_key(source):
+    """Manba obyekti yoki (manba_turi, id) juftligi"""
+    if source is None:
+        return '', None
+    if isinstance(source, tuple):
+        return source
+    return source._meta.model_name, source.pk
+
+
+def _apply_balances(totals):
+    """{teacher_id: ball} ni bitta UPDATE bilan qo'llash"""
+    totals = {teacher_id: points for teacher_id, points in totals.items() if points}
+    if not totals:
+        return 0
+
+    if len(totals) == 1:
+        (teacher_id, delta), = totals.items()
+        queryset = Teacher.objects.filter(pk=teacher_id)
+    else:
+        delta = Case(
+            *[When(pk=pk, then=Value(points)) for pk, points in totals.items()],
+            default=Value(0),
+        )
+        queryset = Teacher.objects.filter(pk__in=totals)
+
+    return queryset.update(
+        total_points=F('total_points') + delta,
+        monthly_points=F('monthly_points') + delta,
+        level=level_expression(delta),
+    )
+
+
+def award(teacher, reason, source=None, points=None):
+    """O'qituvchiga ball berish
+
+    Bitta manba uchun qayta chaqirilsa ball ikkinchi marta berilmaydi va
+    False qaytariladi.
+    """
+    teacher_id = getattr(teacher, 'pk', teacher)
+    if points is None:
+        points = POINT_VALUES[reason]
+    source_type, source_id = _source_key(source)
+
+    with transaction.atomic():
+        try:
+            with transaction.atomic():
+                PointsEntry.objects.create(
+                    teacher_id=teacher_id,
+                    points=points,
+                    reason=reason,
+                    source_type=source_type,
+                    source_id=source_id,
+                )
+        except IntegrityError:
+            return False
+        _apply_balances({teacher_id: points})
+    return True
+
+
+def award_many(awards):
+    """Bir nechta ballni bitta tranzaksiyada berish
+
+    awards - (teacher, reason, source) yoki (teacher, reason, source, points)
+    ko'rinishidagi qatorlar. Jurnalga bulk_create bilan yoziladi, balanslar
+    o'qituvchilar bo'yicha yig'ilib bitta UPDATE bilan qo'llanadi.
+    Allaqachon ball berilgan manbalar o'tkazib yuboriladi.
+    Berilgan yozuvlar soni qaytariladi.
+    """
+    entries = []
+    for item in awards:
+        teacher, reason, source = item[:3]
+        points = item[3] if len(item) > 3 else POINT_VALUES[reason]
+        source_type, source_id = _source_key(source)
+        entries.append(PointsEntry(
+            teacher_id=getattr(teacher, 'pk', teacher),
+            points=points,
+            reason=reason,
+            source_type=source_type,
+            source_id=source_id,
+        ))
+    if not entries:
+        return 0
+
+    with transaction.atomic():
+        existing = set()
+        keyed = [entry for entry in entries if entry.source_id is not None]
+        if keyed:
+            existing = set(PointsEntry.objects.filter(
+                source_id__in={entry.source_id for entry in keyed},
+                reason__in={entry.reason for entry in keyed},
+            ).values_list('teacher_id', 'reason', 'source_type', 'source_id'))
+
+        seen = set()
+        new_entries = []
+        for entry in entries:
+            key = (entry.teacher_id, entry.reason, entry.source_type, entry.source_id)
+            if entry.source_id is not None and (key in existing or key in seen):
+                continue
+            seen.add(key)
+            new_entries.append(entry)
+
+        PointsEntry.objects.bulk_create(new_entries, batch_size=1000)
+
+        totals = defaultdict(int)
+        for entry in new_entries:
+            totals[entry.teacher_id] += entry.points
+        _apply_balances(totals)
+
+    return len(new_entries)
@@ -0,0 +1,96 @@
+"""
+Faoliyatlarning kunlik rollup jadvali.
+
+Grafiklar xom TeacherActivity jadvalini emas, TeacherActivityDaily ni
+yig'adi: (kun, o'qituvchi, maktab, faoliyat turi) bo'yicha bitta qator.
+"""
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncDay
+from django.utils import timezone
+
+from .models import Teacher, TeacherActivity, TeacherActivityDaily
+
+
+def activity_day(value):
+    """Faoliyat vaqtini mahalliy kunga aylantirish (TruncDay bilan bir xil)"""
+    if timezone.is_aware(value):
+        return timezone.localdate(value)
+    return value.date()
+
+
+def record(day, teacher_id, activity_type, count=1, points=0):
+    """Rollup qatoriga qo'shish (qator bo'lmasa yaratiladi)
+
+    Qator o'qituvchining joriy maktabi bo'yicha olinadi - boshqa maktabga
+    o'tgandan keyingi faoliyat yangi maktab qatoriga yoziladi.
+    """
+    if not count and not points:
+        return
+
+    school_id = Teacher.objects.filter(pk=teacher_id).values_list('school_id', flat=True).first()
+    if school_id is None:
+        return
+    changes = {'count': F('count') + count, 'points': F('points') + points}
+    rows = TeacherActivityDaily.objects.filter(
+        day=day, teacher_id=teacher_id, school_id=school_id, activity_type=activity_type
+    )
+    if rows.update(**changes):
+        return
+
+    if count < 0 or points < 0:
+        # Ayirish: faoliyat o'qituvchi oldingi maktabida bo'lganida yozilgan
+        previous = TeacherActivityDaily.objects.filter(
+            day=day, teacher_id=teacher_id, activity_type=activity_type
+        ).order_by('-id').values_list('id', flat=True)[:1]
+        if TeacherActivityDaily.objects.filter(id__in=list(previous)).update(**changes):
+            return
+
+    try:
+        with transaction.atomic():
+            TeacherActivityDaily.objects.create(
+                day=day,
+                teacher_id=teacher_id,
+                school_id=school_id,
+                activity_type=activity_type,
+                count=count,
+                points=points,
+            )
+    except IntegrityError:
+        # Parallel yozuv qatorni yaratib ulgurdi
+        rows.update(**changes)
+
+
+def rebuild(since=None):
+    """Rollupni TeacherActivity dan qayta qurish (backfill)"""
+    activities = TeacherActivity.objects.all()
+    existing = TeacherActivityDaily.objects.all()
+    if since:
+        activities = activities.filter(date__date__gte=since)
+        existing = existing.filter(day__gte=since)
+
+    rows = activities.annotate(
+        day=TruncDay('date')
+    ).values(
+        'day', 'teacher_id', 'teacher__school_id', 'activity_type'
+    ).annotate(
+        count=Count('id'),
+        points=Sum('points'),
+    ).order_by()
+
+    objects = [
+        TeacherActivityDaily(
+            day=activity_day(row['day']),
+            teacher_id=row['teacher_id'],
+            school_id=row['teacher__school_id'],
+            activity_type=row['activity_type'],
+            count=row['count'],
+            points=row['points'] or 0,
+        )
+        for row in rows.iterator()
+    ]
+
+    with transaction.atomic():
+        existing.delete()
+        TeacherActivityDaily.objects.bulk_create(objects, batch_size=1000)
+    return len(objects)
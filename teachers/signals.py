@@ -1,8 +1,9 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_init, post_save
 from django.dispatch import receiver
 from materials.models import Material
 from videos.models import Video
 from .models import TeacherActivity
+from . import rollup
 
 
 @receiver(post_save, sender=Material)
@@ -28,4 +29,43 @@ def create_video_activity(sender, instance, created, **kwargs):
             title=instance.title,
             description=f"Video yuklandi: {instance.title}",
             points=0  # Tasdiqlangandan keyin ball qo'shiladi
-        )
\ No newline at end of file
+        )
+
+
+@receiver(post_init, sender=TeacherActivity)
+def remember_activity_state(sender, instance, **kwargs):
+    """Rollup farqini hisoblash uchun boshlang'ich holatni eslab qolish"""
+    instance._rollup_state = (
+        instance.__dict__.get('teacher_id'),
+        instance.__dict__.get('activity_type'),
+        instance.__dict__.get('date'),
+        instance.__dict__.get('points'),
+    )
+
+
+@receiver(post_save, sender=TeacherActivity)
+def update_activity_rollup(sender, instance, created, raw=False, **kwargs):
+    """Kunlik rollupni yangilash"""
+    if raw:
+        return
+
+    day = rollup.activity_day(instance.date)
+    if created:
+        rollup.record(day, instance.teacher_id, instance.activity_type, 1, instance.points)
+    else:
+        teacher_id, activity_type, date, points = instance._rollup_state
+        if teacher_id is None or date is None:
+            # Oldingi holat noma'lum (deferred yuklash)
+            pass
+        elif (teacher_id, activity_type, date) != (instance.teacher_id, instance.activity_type, instance.date):
+            rollup.record(rollup.activity_day(date), teacher_id, activity_type, -1, -(points or 0))
+            rollup.record(day, instance.teacher_id, instance.activity_type, 1, instance.points)
+        elif points != instance.points:
+            rollup.record(day, instance.teacher_id, instance.activity_type, 0, instance.points - (points or 0))
+
+    remember_activity_state(sender, instance)
+
+
+@receiver(post_delete, sender=TeacherActivity)
+def remove_activity_rollup(sender, instance, **kwargs):
+    rollup.record(rollup.activity_day(instance.date), instance.teacher_id, instance.activity_type, -1, -instance.points)
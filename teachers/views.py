@@ -8,6 +8,7 @@ from .serializers import (
     TeacherActivitySerializer,
     TeacherCreateSerializer
 )
+from utils.pagination import KeysetPagination
 
 
 class TeacherViewSet(viewsets.ModelViewSet):
@@ -30,16 +31,16 @@ class TeacherViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'])
     def my_profile(self, request):
         """O'qituvchining o'z profili"""
-        try:
-            teacher = Teacher.objects.get(user=request.user)
-            serializer = self.get_serializer(teacher)
-            return Response(serializer.data)
-        except Teacher.DoesNotExist:
+        teacher = request.profile.teacher
+        if teacher is None:
             return Response(
                 {'error': 'O\'qituvchi profili topilmadi'},
                 status=status.HTTP_404_NOT_FOUND
             )
 
+        serializer = self.get_serializer(teacher)
+        return Response(serializer.data)
+
     @action(detail=False, methods=['get'])
     def top_teachers(self, request):
         """Top o'qituvchilar"""
@@ -54,18 +55,19 @@ class TeacherActivityViewSet(viewsets.ModelViewSet):
     queryset = TeacherActivity.objects.select_related('teacher').all()
     serializer_class = TeacherActivitySerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
+    keyset_ordering = ('-date',)
 
     def get_queryset(self):
-        user = self.request.user
-        try:
-            teacher = Teacher.objects.get(user=user)
-            return TeacherActivity.objects.filter(teacher=teacher)
-        except Teacher.DoesNotExist:
+        teacher = self.request.profile.teacher
+        if teacher is None:
             return TeacherActivity.objects.none()
+        return TeacherActivity.objects.filter(teacher=teacher)
 
     @action(detail=False, methods=['get'])
     def my_activities(self, request):
         """Mening faoliyatlarim"""
         activities = self.get_queryset()
-        serializer = self.get_serializer(activities, many=True)
-        return Response(serializer.data)
\ No newline at end of file
+        page = self.paginate_queryset(activities)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
\ No newline at end of file
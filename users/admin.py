@@ -1,6 +1,7 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from django.contrib.auth import get_user_model
+from .models import DashboardSnapshot, ReportJob
 
 User = get_user_model()
 
@@ -14,4 +15,19 @@ class UserAdmin(BaseUserAdmin):
     )
     add_fieldsets = BaseUserAdmin.add_fieldsets + (
         ('Qo\'shimcha', {'fields': ('role', 'phone')}),
-    )
\ No newline at end of file
+    )
+
+
+@admin.register(DashboardSnapshot)
+class DashboardSnapshotAdmin(admin.ModelAdmin):
+    list_display = ['scope', 'school', 'teacher', 'total_materials', 'total_videos', 'updated_at']
+    list_filter = ['scope']
+    raw_id_fields = ['school', 'teacher']
+
+
+@admin.register(ReportJob)
+class ReportJobAdmin(admin.ModelAdmin):
+    list_display = ['id', 'kind', 'status', 'requested_by', 'created_at', 'finished_at']
+    list_filter = ['kind', 'status']
+    raw_id_fields = ['requested_by']
+    readonly_fields = ['params_hash', 'started_at', 'finished_at']
@@ -0,0 +1,92 @@
+"""
+Keshlangan autentifikatsiya.
+
+Token -> foydalanuvchi va JWT user_id -> foydalanuvchi natijalari umumiy
+keshda qisqa muddat (AUTH_CACHE_TTL) saqlanadi - barqaror holatda API
+so'rovlari autentifikatsiya uchun bazaga murojaat qilmaydi.
+Foydalanuvchi saqlanganda (parol, is_active, rol o'zgarishi), o'chirilganda
+yoki token o'chirilganda (logout) kesh yozuvlari o'chiriladi (users/signals.py).
+"""
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from utils.cache import KEY_PREFIX
+
+
+def _token_key(key):
+    return f'{KEY_PREFIX}:auth:token:{hashlib.sha256(key.encode()).hexdigest()}'
+
+
+def _user_key(user_id):
+    return f'{KEY_PREFIX}:auth:user:{user_id}'
+
+
+def _user_token_key(user_id):
+    return f'{KEY_PREFIX}:auth:user-token:{user_id}'
+
+
+def forget_token(key):
+    """Token bo'yicha keshlangan foydalanuvchini o'chirish"""
+    cache.delete(_token_key(key))
+
+
+def forget_user(user_id):
+    """Foydalanuvchining barcha keshlangan autentifikatsiya yozuvlarini o'chirish"""
+    token = cache.get(_user_token_key(user_id))
+    keys = [_user_key(user_id), _user_token_key(user_id)]
+    if token:
+        keys.append(_token_key(token))
+    cache.delete_many(keys)
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """TokenAuthentication + (foydalanuvchi, token) keshi"""
+
+    def authenticate_credentials(self, key):
+        cache_key = _token_key(key)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        user, token = super().authenticate_credentials(key)
+        cache.set_many({
+            cache_key: (user, token),
+            _user_token_key(user.pk): key,
+        }, settings.AUTH_CACHE_TTL)
+        return user, token
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """JWTAuthentication + user_id bo'yicha foydalanuvchi keshi"""
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        cache_key = _user_key(user_id)
+        user = cache.get(cache_key)
+        if user is None:
+            user = super().get_user(validated_token)
+            cache.set(cache_key, user, settings.AUTH_CACHE_TTL)
+            return user
+
+        if not user.is_active:
+            raise exceptions.AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        if api_settings.CHECK_REVOKE_TOKEN and validated_token.get(
+            api_settings.REVOKE_TOKEN_CLAIM
+        ) != get_md5_hash_password(user.password):
+            raise exceptions.AuthenticationFailed(
+                _("The user's password has been changed."), code="password_changed"
+            )
+        return user
@@ -0,0 +1,288 @@
+"""
+Dashboard snapshotlari.
+
+DashboardStatsView har so'rovda COUNT(*) yubormasligi uchun statistika
+DashboardSnapshot jadvalida saqlanadi. Signallar hisoblagichlarni F() orqali
+o'zgartiradi, qator yo'q bo'lsa u birinchi o'qishda qayta hisoblanadi.
+"""
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, transaction
+from django.db.models import Case, Count, F, Q, Value, When
+from django.utils import timezone
+
+from .models import DashboardSnapshot
+
+
+def adjust(deltas, teacher_id=None, school_id=None, include_global=True):
+    """Global, maktab va o'qituvchi snapshotlarini bitta UPDATE bilan o'zgartirish
+
+    Maktab teacher_id orqali ham topiladi, shuning uchun chaqiruvchi
+    teacher.school ni yuklashi shart emas.
+    """
+    updates = {field: F(field) + delta for field, delta in deltas.items() if delta}
+    if not updates:
+        return
+
+    condition = Q(scope='global') if include_global else Q()
+    if school_id:
+        condition |= Q(scope='school', school_id=school_id)
+    if teacher_id:
+        condition |= Q(scope='school', school__teachers=teacher_id)
+        condition |= Q(scope='teacher', teacher_id=teacher_id)
+    if not condition:
+        return
+
+    updates['updated_at'] = timezone.now()
+    DashboardSnapshot.objects.filter(condition).update(**updates)
+
+
+def adjust_many(field, counts_by_teacher):
+    """Ko'p o'qituvchi uchun bitta maydonni o'zgartirish (bulk operatsiyalar uchun)
+
+    Signal ishlamaydigan queryset.update() dan keyin chaqiriladi: global,
+    maktab va o'qituvchi qatorlari uchun bittadan UPDATE.
+    """
+    from teachers.models import Teacher
+
+    counts_by_teacher = {pk: n for pk, n in counts_by_teacher.items() if n}
+    if not counts_by_teacher:
+        return
+
+    counts_by_school = {}
+    for teacher_id, school_id in Teacher.objects.filter(
+        id__in=counts_by_teacher
+    ).values_list('id', 'school_id'):
+        counts_by_school[school_id] = counts_by_school.get(school_id, 0) + counts_by_teacher[teacher_id]
+
+    now = timezone.now()
+    DashboardSnapshot.objects.filter(scope='global').update(
+        **{field: F(field) + sum(counts_by_teacher.values()), 'updated_at': now}
+    )
+    for scope, key, counts in (
+        ('school', 'school_id', counts_by_school),
+        ('teacher', 'teacher_id', counts_by_teacher),
+    ):
+        if not counts:
+            continue
+        delta = Case(
+            *[When(**{key: pk}, then=Value(n)) for pk, n in counts.items()],
+            default=Value(0),
+        )
+        DashboardSnapshot.objects.filter(scope=scope, **{f'{key}__in': counts}).update(
+            **{field: F(field) + delta, 'updated_at': now}
+        )
+
+
+def _content_counts(queryset):
+    return queryset.aggregate(
+        total=Count('id'),
+        approved=Count('id', filter=Q(is_approved=True)),
+    )
+
+
+def compute_global():
+    """Umumiy statistika"""
+    from teachers.models import Teacher
+    from materials.models import Material
+    from videos.models import Video
+    from schools.models import School
+    from consultations.models import Consultation
+
+    materials = _content_counts(Material.objects.all())
+    videos = _content_counts(Video.objects.all())
+    return {
+        'total_users': get_user_model().objects.count(),
+        'total_teachers': Teacher.objects.count(),
+        'total_schools': School.objects.count(),
+        'total_materials': materials['total'],
+        'approved_materials': materials['approved'],
+        'total_videos': videos['total'],
+        'approved_videos': videos['approved'],
+        'total_consultations': Consultation.objects.count(),
+    }
+
+
+def compute_school(school):
+    """Maktab statistikasi"""
+    from teachers.models import Teacher
+    from materials.models import Material
+    from videos.models import Video
+
+    materials = _content_counts(Material.objects.filter(teacher__school=school))
+    videos = _content_counts(Video.objects.filter(teacher__school=school))
+    return {
+        'total_teachers': Teacher.objects.filter(school=school).count(),
+        'total_materials': materials['total'],
+        'approved_materials': materials['approved'],
+        'total_videos': videos['total'],
+        'approved_videos': videos['approved'],
+    }
+
+
+def compute_teacher(teacher):
+    """O'qituvchi statistikasi"""
+    from teachers.models import TeacherActivity
+    from materials.models import Material
+    from videos.models import Video
+
+    materials = _content_counts(Material.objects.filter(teacher=teacher))
+    videos = _content_counts(Video.objects.filter(teacher=teacher))
+    return {
+        'total_materials': materials['total'],
+        'approved_materials': materials['approved'],
+        'total_videos': videos['total'],
+        'approved_videos': videos['approved'],
+        'total_activities': TeacherActivity.objects.filter(teacher=teacher).count(),
+    }
+
+
+def _store(lookup, values):
+    try:
+        snapshot, _ = DashboardSnapshot.objects.update_or_create(defaults=values, **lookup)
+    except IntegrityError:
+        # Parallel so'rov qatorni allaqachon yaratgan
+        snapshot = DashboardSnapshot.objects.get(**lookup)
+    return snapshot
+
+
+def rebuild_global():
+    return _store({'scope': 'global'}, compute_global())
+
+
+def rebuild_school(school):
+    return _store({'scope': 'school', 'school': school}, compute_school(school))
+
+
+def rebuild_teacher(teacher):
+    return _store({'scope': 'teacher', 'teacher': teacher}, compute_teacher(teacher))
+
+
+def rebuild_for_teachers(teacher_ids):
+    """Berilgan o'qituvchilar, ularning maktablari va global snapshotni qayta hisoblash"""
+    from teachers.models import Teacher
+
+    teachers = list(Teacher.objects.select_related('school').filter(id__in=set(teacher_ids)))
+    for school in {teacher.school for teacher in teachers}:
+        rebuild_school(school)
+    for teacher in teachers:
+        rebuild_teacher(teacher)
+    rebuild_global()
+
+
+def rebuild_all():
+    """Barcha snapshotlarni GROUP BY so'rovlari bilan qayta qurish (tiklash uchun)"""
+    from teachers.models import Teacher, TeacherActivity
+    from materials.models import Material
+    from videos.models import Video
+    from schools.models import School
+
+    def grouped(queryset, key):
+        rows = queryset.values(key).annotate(
+            total=Count('id'),
+            approved=Count('id', filter=Q(is_approved=True)),
+        )
+        return {row[key]: row for row in rows}
+
+    empty = {'total': 0, 'approved': 0}
+    materials_by_teacher = grouped(Material.objects.all(), 'teacher_id')
+    videos_by_teacher = grouped(Video.objects.all(), 'teacher_id')
+    materials_by_school = grouped(Material.objects.all(), 'teacher__school_id')
+    videos_by_school = grouped(Video.objects.all(), 'teacher__school_id')
+    activities_by_teacher = dict(
+        TeacherActivity.objects.values_list('teacher_id').annotate(n=Count('id'))
+    )
+    teachers_by_school = dict(
+        Teacher.objects.values_list('school_id').annotate(n=Count('id'))
+    )
+
+    snapshots = [DashboardSnapshot(scope='global', **compute_global())]
+    for school_id in School.objects.values_list('id', flat=True):
+        materials = materials_by_school.get(school_id, empty)
+        videos = videos_by_school.get(school_id, empty)
+        snapshots.append(DashboardSnapshot(
+            scope='school',
+            school_id=school_id,
+            total_teachers=teachers_by_school.get(school_id, 0),
+            total_materials=materials['total'],
+            approved_materials=materials['approved'],
+            total_videos=videos['total'],
+            approved_videos=videos['approved'],
+        ))
+    for teacher_id in Teacher.objects.values_list('id', flat=True):
+        materials = materials_by_teacher.get(teacher_id, empty)
+        videos = videos_by_teacher.get(teacher_id, empty)
+        snapshots.append(DashboardSnapshot(
+            scope='teacher',
+            teacher_id=teacher_id,
+            total_materials=materials['total'],
+            approved_materials=materials['approved'],
+            total_videos=videos['total'],
+            approved_videos=videos['approved'],
+            total_activities=activities_by_teacher.get(teacher_id, 0),
+        ))
+
+    with transaction.atomic():
+        DashboardSnapshot.objects.all().delete()
+        DashboardSnapshot.objects.bulk_create(snapshots, batch_size=1000)
+    return len(snapshots)
+
+
+def get_stats(user):
+    """Foydalanuvchi roli bo'yicha dashboard statistikasi (odatda bitta SELECT)"""
+    if user.is_superuser or user.role == 'superadmin':
+        snapshot = DashboardSnapshot.objects.filter(scope='global').first() or rebuild_global()
+        return {
+            'total_users': snapshot.total_users,
+            'total_teachers': snapshot.total_teachers,
+            'total_schools': snapshot.total_schools,
+            'total_materials': snapshot.total_materials,
+            'total_videos': snapshot.total_videos,
+            'pending_materials': snapshot.total_materials - snapshot.approved_materials,
+            'pending_videos': snapshot.total_videos - snapshot.approved_videos,
+            'total_consultations': snapshot.total_consultations,
+        }
+
+    if user.role == 'admin':
+        from schools.models import School
+
+        snapshot = DashboardSnapshot.objects.select_related('school').filter(
+            scope='school', school__director=user
+        ).order_by('school__name').first()
+        if snapshot is None:
+            school = School.objects.filter(director=user).first()
+            if school is None:
+                return {}
+            snapshot = rebuild_school(school)
+        return {
+            'school_name': snapshot.school.name,
+            'total_teachers': snapshot.total_teachers,
+            'total_materials': snapshot.total_materials,
+            'total_videos': snapshot.total_videos,
+            'pending_materials': snapshot.total_materials - snapshot.approved_materials,
+            'pending_videos': snapshot.total_videos - snapshot.approved_videos,
+        }
+
+    if user.role == 'teacher':
+        from teachers.models import Teacher
+
+        snapshot = DashboardSnapshot.objects.select_related('teacher').filter(
+            scope='teacher', teacher__user=user
+        ).first()
+        if snapshot is None:
+            teacher = Teacher.objects.filter(user=user).first()
+            if teacher is None:
+                return {}
+            snapshot = rebuild_teacher(teacher)
+        teacher = snapshot.teacher
+        return {
+            'total_points': teacher.total_points,
+            'monthly_points': teacher.monthly_points,
+            'level': teacher.level,
+            'total_materials': snapshot.total_materials,
+            'approved_materials': snapshot.approved_materials,
+            'total_videos': snapshot.total_videos,
+            'approved_videos': snapshot.approved_videos,
+            'total_activities': snapshot.total_activities,
+        }
+
+    return {}
@@ -0,0 +1,211 @@
+"""
+Hisobotlarni eksport qilish.
+
+Qatorlar values_list(...).iterator(chunk_size=...) orqali bo'laklab o'qiladi,
+Excel fayl openpyxl write-only rejimida vaqtinchalik faylga yoziladi va
+javob sifatida bo'laklab uzatiladi - xotira sarfi qatorlar soniga bog'liq emas.
+"""
+import tempfile
+from datetime import datetime
+
+from django.http import FileResponse
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Font, PatternFill
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.lib.units import inch
+from reportlab.platypus import Paragraph, SimpleDocTemplate, Table, TableStyle
+
+CHUNK_SIZE = 2000
+XLSX_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+PDF_CONTENT_TYPE = 'application/pdf'
+
+HEADER_FONT = Font(bold=True, color='FFFFFF')
+HEADER_FILL = PatternFill(start_color='4472C4', end_color='4472C4', fill_type='solid')
+
+
+def parse_filters(params, statuses=None):
+    """month, school, region va status parametrlarini tekshirish
+
+    Noto'g'ri qiymatda ValueError ko'tariladi.
+    """
+    filters = {}
+    if params.get('month'):
+        try:
+            filters['month'] = datetime.strptime(params['month'], '%Y-%m').date()
+        except ValueError:
+            raise ValueError("Oy formati noto'g'ri (YYYY-MM)")
+    if params.get('school'):
+        try:
+            filters['school'] = int(params['school'])
+        except ValueError:
+            raise ValueError("Maktab ID si noto'g'ri")
+    if params.get('region'):
+        filters['region'] = params['region']
+    if statuses is not None and params.get('status'):
+        if params['status'] not in statuses:
+            raise ValueError("Holat noto'g'ri")
+        filters['status'] = params['status']
+    return filters
+
+
+def _full_name(first_name, last_name):
+    return f"{first_name} {last_name}".strip()
+
+
+def rating_rows(filters, user=None):
+    """O'qituvchilar reytingi qatorlari: [#, o'qituvchi, maktab, ball, o'rin]"""
+    from ratings.engine import latest_month
+    from ratings.models import TeacherRating
+
+    queryset = TeacherRating.objects.filter(month=filters.get('month') or latest_month())
+    if filters.get('school'):
+        queryset = queryset.filter(teacher__school_id=filters['school'])
+    if filters.get('region'):
+        queryset = queryset.filter(teacher__school__region=filters['region'])
+    if user is not None and user.role == 'admin':
+        queryset = queryset.filter(teacher__school__director=user)
+
+    queryset = queryset.order_by('rank', 'id').values_list(
+        'teacher__user__first_name',
+        'teacher__user__last_name',
+        'teacher__school__name',
+        'total_points',
+        'rank',
+    )
+
+    for idx, (first_name, last_name, school, points, rank) in enumerate(
+        queryset.iterator(chunk_size=CHUNK_SIZE), 1
+    ):
+        yield [idx, _full_name(first_name, last_name), school, points, rank]
+
+
+def analysis_rows(filters, user=None):
+    """Dars tahlillari qatorlari: [#, o'qituvchi, tahlilchi, mavzu, fan, sinf, baho, sana]"""
+    from lesson_analysis.models import LessonAnalysis
+    from ratings.engine import month_range
+
+    queryset = LessonAnalysis.objects.filter(status=filters.get('status', 'approved'))
+    if filters.get('month'):
+        start, end = month_range(filters['month'])
+        queryset = queryset.filter(lesson_date__date__gte=start, lesson_date__date__lt=end)
+    if filters.get('school'):
+        queryset = queryset.filter(teacher__school_id=filters['school'])
+    if filters.get('region'):
+        queryset = queryset.filter(teacher__school__region=filters['region'])
+    if user is not None and user.role == 'admin':
+        queryset = queryset.filter(teacher__school__director=user)
+
+    queryset = queryset.order_by('-lesson_date', '-id').values_list(
+        'teacher__user__first_name',
+        'teacher__user__last_name',
+        'analyzer__user__first_name',
+        'analyzer__user__last_name',
+        'topic',
+        'subject',
+        'grade',
+        'overall_rating',
+        'lesson_date',
+    )
+
+    for idx, row in enumerate(queryset.iterator(chunk_size=CHUNK_SIZE), 1):
+        (teacher_first, teacher_last, analyzer_first, analyzer_last,
+         topic, subject, grade, rating, lesson_date) = row
+        yield [
+            idx,
+            _full_name(teacher_first, teacher_last),
+            _full_name(analyzer_first, analyzer_last),
+            topic,
+            subject,
+            grade,
+            float(rating),
+            lesson_date.strftime('%Y-%m-%d'),
+        ]
+
+
+RATINGS_SHEET = {
+    'title': "O'qituvchilar Reytingi",
+    'sheet': "O'qituvchilar Reytingi",
+    'headers': ['#', 'O\'qituvchi', 'Maktab', 'Ball', 'O\'rin'],
+    'widths': [5, 30, 40, 12, 12],
+}
+
+ANALYSES_SHEET = {
+    'title': "Dars Tahlillari Hisoboti",
+    'sheet': "Dars Tahlillari",
+    'headers': ['#', 'O\'qituvchi', 'Tahlilchi', 'Mavzu', 'Fan', 'Sinf', 'Baho', 'Sana'],
+    'widths': [5, 25, 25, 40, 15, 8, 10, 12],
+}
+
+
+def write_workbook(layout, rows, output):
+    """Write-only workbook ga qatorlarni yozish (xotirada faqat joriy qator)"""
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(layout['sheet'])
+
+    for idx, width in enumerate(layout['widths']):
+        ws.column_dimensions[chr(ord('A') + idx)].width = width
+
+    title = WriteOnlyCell(ws, value=layout['title'])
+    title.font = Font(size=16, bold=True)
+    ws.append([title])
+    ws.append([])
+
+    headers = []
+    for header in layout['headers']:
+        cell = WriteOnlyCell(ws, value=header)
+        cell.font = HEADER_FONT
+        cell.fill = HEADER_FILL
+        cell.alignment = Alignment(horizontal='center')
+        headers.append(cell)
+    ws.append(headers)
+
+    for row in rows:
+        ws.append(row)
+
+    wb.save(output)
+
+
+def write_ratings_pdf(rows, output):
+    """Reyting jadvalini PDF ga yozish"""
+    doc = SimpleDocTemplate(output, pagesize=A4)
+    styles = getSampleStyleSheet()
+
+    data = [RATINGS_SHEET['headers']]
+    for idx, name, school, points, rank in rows:
+        data.append([str(idx), name, (school or '')[:30], str(points), str(rank)])
+
+    table = Table(data, colWidths=[0.5 * inch, 2 * inch, 3 * inch, 1 * inch, 1 * inch], repeatRows=1)
+    table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#4472C4')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 12),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black),
+        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+        ('FONTSIZE', (0, 1), (-1, -1), 9),
+    ]))
+
+    doc.build([
+        Paragraph(RATINGS_SHEET['title'], styles['Title']),
+        Paragraph("<br/><br/>", styles['Normal']),
+        table,
+    ])
+
+
+def file_response(output, filename, content_type):
+    """Tayyor faylni bo'laklab uzatish"""
+    output.seek(0)
+    return FileResponse(output, as_attachment=True, filename=filename, content_type=content_type)
+
+
+def excel_response(layout, rows, filename):
+    """Excel faylni vaqtinchalik faylga yozib, bo'laklab uzatish"""
+    output = tempfile.TemporaryFile()
+    write_workbook(layout, rows, output)
+    return file_response(output, filename, XLSX_CONTENT_TYPE)
@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from users import dashboard
+
+
+class Command(BaseCommand):
+    help = "Dashboard snapshotlarini noldan qayta hisoblash"
+
+    def handle(self, *args, **options):
+        count = dashboard.rebuild_all()
+        self.stdout.write(self.style.SUCCESS(f"{count} ta snapshot qayta hisoblandi"))
@@ -0,0 +1,28 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from users.reports import purge_expired, run_pending
+
+
+class Command(BaseCommand):
+    help = "Navbatdagi hisobotlarni (Excel/PDF) fon rejimida tayyorlash"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help="Navbatni bir marta bo'shatib chiqish")
+        parser.add_argument('--interval', type=float, default=5, help="Navbat bo'sh bo'lganda kutish (soniya)")
+
+    def handle(self, *args, **options):
+        while True:
+            purged = purge_expired()
+            if purged:
+                self.stdout.write(f"{purged} ta eski hisobot o'chirildi")
+
+            count = run_pending()
+            if count:
+                self.stdout.write(self.style.SUCCESS(f"{count} ta hisobot tayyorlandi"))
+
+            if options['once']:
+                return
+            if not count:
+                time.sleep(options['interval'])
@@ -0,0 +1,70 @@
+"""
+So'rov davomida joriy foydalanuvchi profilini bir marta aniqlash.
+
+DRF autentifikatsiyasi middleware dan keyin ishlaydi, lekin aniqlangan
+foydalanuvchini asl HttpRequest ga ham yozadi. Shuning uchun profil lazy:
+birinchi murojaatda (view yoki serializer ichida) so'rovdagi haqiqiy
+foydalanuvchi bo'yicha bitta so'rov bajariladi va natija saqlanadi.
+
+    teacher = request.profile.teacher          # Teacher yoki None
+    school = request.profile.directed_school   # direktor maktabi yoki None
+"""
+
+
+class RequestProfile:
+    """Joriy foydalanuvchining o'qituvchi profili va boshqaradigan maktabi"""
+
+    def __init__(self, request):
+        self._request = request
+        self._cache = {}
+
+    def _user(self):
+        user = getattr(self._request, 'user', None)
+        if user is None or not user.is_authenticated:
+            return None
+        return user
+
+    def _resolve(self, name, lookup):
+        user = self._user()
+        if user is None:
+            return None
+        # Kalitda foydalanuvchi bor - autentifikatsiyadan oldin murojaat
+        # qilingan bo'lsa ham keyingi murojaat to'g'ri profilni qaytaradi
+        key = (name, user.pk)
+        if key not in self._cache:
+            self._cache[key] = lookup(user)
+        return self._cache[key]
+
+    @property
+    def teacher(self):
+        from teachers.models import Teacher
+
+        def lookup(user):
+            teacher = Teacher.objects.select_related('school').filter(user=user).first()
+            if teacher is not None:
+                teacher.user = user
+            return teacher
+
+        return self._resolve('teacher', lookup)
+
+    @property
+    def directed_school(self):
+        from schools.models import School
+
+        def lookup(user):
+            if user.role != 'admin':
+                return None
+            return School.objects.filter(director=user).first()
+
+        return self._resolve('directed_school', lookup)
+
+
+class RequestProfileMiddleware:
+    """Har bir so'rovga lazy request.profile qo'shish"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.profile = RequestProfile(request)
+        return self.get_response(request)
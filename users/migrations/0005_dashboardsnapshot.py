@@ -0,0 +1,43 @@
+# Generated by Django 4.2.7 on 2026-10-18 11:23
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('schools', '0002_initial'),
+        ('teachers', '0003_alter_teacher_subject'),
+        ('users', '0004_reset_superadmin_password_v2'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DashboardSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('scope', models.CharField(choices=[('global', 'Umumiy'), ('school', 'Maktab'), ('teacher', "O'qituvchi")], max_length=10, verbose_name='Scope')),
+                ('total_users', models.IntegerField(default=0, verbose_name='Foydalanuvchilar')),
+                ('total_teachers', models.IntegerField(default=0, verbose_name="O'qituvchilar")),
+                ('total_schools', models.IntegerField(default=0, verbose_name='Maktablar')),
+                ('total_materials', models.IntegerField(default=0, verbose_name='Materiallar')),
+                ('approved_materials', models.IntegerField(default=0, verbose_name='Tasdiqlangan materiallar')),
+                ('total_videos', models.IntegerField(default=0, verbose_name='Videolar')),
+                ('approved_videos', models.IntegerField(default=0, verbose_name='Tasdiqlangan videolar')),
+                ('total_consultations', models.IntegerField(default=0, verbose_name='Maslahatlar')),
+                ('total_activities', models.IntegerField(default=0, verbose_name='Faoliyatlar')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Yangilangan')),
+                ('school', models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='dashboard_snapshot', to='schools.school', verbose_name='Maktab')),
+                ('teacher', models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='dashboard_snapshot', to='teachers.teacher', verbose_name="O'qituvchi")),
+            ],
+            options={
+                'verbose_name': 'Dashboard snapshot',
+                'verbose_name_plural': 'Dashboard snapshotlar',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='dashboardsnapshot',
+            constraint=models.UniqueConstraint(condition=models.Q(('scope', 'global')), fields=('scope',), name='unique_global_dashboard_snapshot'),
+        ),
+    ]
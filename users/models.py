@@ -46,4 +46,106 @@ class PasswordResetToken(models.Model):
         return not self.is_used and timezone.now() < self.expires_at
 
     def __str__(self):
-        return f"{self.user.username} - {self.token}"
\ No newline at end of file
+        return f"{self.user.username} - {self.token}"
+
+class DashboardSnapshot(models.Model):
+    """Dashboard uchun oldindan hisoblangan statistika (har bir scope uchun bitta qator)"""
+
+    SCOPE_CHOICES = [
+        ('global', 'Umumiy'),
+        ('school', 'Maktab'),
+        ('teacher', 'O\'qituvchi'),
+    ]
+
+    scope = models.CharField(max_length=10, choices=SCOPE_CHOICES, verbose_name='Scope')
+    school = models.OneToOneField(
+        'schools.School',
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='dashboard_snapshot',
+        verbose_name='Maktab'
+    )
+    teacher = models.OneToOneField(
+        'teachers.Teacher',
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='dashboard_snapshot',
+        verbose_name='O\'qituvchi'
+    )
+    total_users = models.IntegerField(default=0, verbose_name='Foydalanuvchilar')
+    total_teachers = models.IntegerField(default=0, verbose_name='O\'qituvchilar')
+    total_schools = models.IntegerField(default=0, verbose_name='Maktablar')
+    total_materials = models.IntegerField(default=0, verbose_name='Materiallar')
+    approved_materials = models.IntegerField(default=0, verbose_name='Tasdiqlangan materiallar')
+    total_videos = models.IntegerField(default=0, verbose_name='Videolar')
+    approved_videos = models.IntegerField(default=0, verbose_name='Tasdiqlangan videolar')
+    total_consultations = models.IntegerField(default=0, verbose_name='Maslahatlar')
+    total_activities = models.IntegerField(default=0, verbose_name='Faoliyatlar')
+    updated_at = models.DateTimeField(auto_now=True, verbose_name='Yangilangan')
+
+    class Meta:
+        verbose_name = 'Dashboard snapshot'
+        verbose_name_plural = 'Dashboard snapshotlar'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['scope'],
+                condition=models.Q(scope='global'),
+                name='unique_global_dashboard_snapshot'
+            ),
+        ]
+
+    def __str__(self):
+        if self.scope == 'school':
+            return f"Maktab #{self.school_id}"
+        if self.scope == 'teacher':
+            return f"O'qituvchi #{self.teacher_id}"
+        return 'Umumiy'
+
+
+class ReportJob(models.Model):
+    """Fon rejimida tayyorlanadigan hisobot (Excel/PDF)"""
+
+    KIND_CHOICES = [
+        ('ratings_excel', 'Reyting (Excel)'),
+        ('ratings_pdf', 'Reyting (PDF)'),
+        ('analyses_excel', 'Dars tahlillari (Excel)'),
+    ]
+
+    STATUS_CHOICES = [
+        ('pending', 'Navbatda'),
+        ('running', 'Tayyorlanmoqda'),
+        ('done', 'Tayyor'),
+        ('failed', 'Xatolik'),
+    ]
+
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES, verbose_name='Turi')
+    params = models.JSONField(default=dict, blank=True, verbose_name='Parametrlar')
+    params_hash = models.CharField(max_length=64, verbose_name='Parametrlar xeshi')
+    requested_by = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='report_jobs',
+        verbose_name='So\'ragan'
+    )
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending', verbose_name='Holat')
+    file = models.FileField(upload_to='reports/', blank=True, verbose_name='Fayl')
+    error = models.TextField(blank=True, verbose_name='Xatolik')
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name='Yaratilgan')
+    started_at = models.DateTimeField(null=True, blank=True, verbose_name='Boshlangan')
+    finished_at = models.DateTimeField(null=True, blank=True, verbose_name='Tugagan')
+
+    class Meta:
+        verbose_name = 'Hisobot'
+        verbose_name_plural = 'Hisobotlar'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['params_hash', 'status'], name='report_job_hash_idx'),
+            models.Index(fields=['status', 'created_at'], name='report_job_queue_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.get_kind_display()} #{self.pk} ({self.status})"
@@ -0,0 +1,204 @@
+"""
+Fon rejimidagi hisobotlar.
+
+Eksport so'rovi ReportJob sifatida navbatga qo'yiladi, run_report_jobs
+buyrug'i uni tayyorlab faylni saqlaydi. Bir xil parametrli so'rov TTL
+ichida takrorlansa mavjud (yoki tayyorlanayotgan) hisobot qaytariladi.
+
+Worker keshga davriy belgi (heartbeat) yozadi. Belgi bo'lmasa (worker
+ishga tushirilmagan yoki to'xtagan) hisobot so'rov ichida tayyorlanadi -
+navbatda abadiy qolib ketmaydi. Deploy da worker start.sh orqali ishga
+tushadi.
+"""
+import hashlib
+import json
+import logging
+import tempfile
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files import File
+from django.db.models import Q
+from django.utils import timezone
+
+from utils.cache import KEY_PREFIX
+
+from . import exports
+from .models import ReportJob
+
+logger = logging.getLogger(__name__)
+
+HEARTBEAT_KEY = f'{KEY_PREFIX}:report_worker'
+
+
+def _analysis_statuses():
+    from lesson_analysis.models import LessonAnalysis
+    return dict(LessonAnalysis.STATUS_CHOICES)
+
+
+REPORTS = {
+    'ratings_excel': {
+        'rows': exports.rating_rows,
+        'write': lambda rows, output: exports.write_workbook(exports.RATINGS_SHEET, rows, output),
+        'filename': 'reyting',
+        'extension': 'xlsx',
+        'content_type': exports.XLSX_CONTENT_TYPE,
+        'statuses': None,
+    },
+    'ratings_pdf': {
+        'rows': exports.rating_rows,
+        'write': exports.write_ratings_pdf,
+        'filename': 'reyting',
+        'extension': 'pdf',
+        'content_type': exports.PDF_CONTENT_TYPE,
+        'statuses': None,
+    },
+    'analyses_excel': {
+        'rows': exports.analysis_rows,
+        'write': lambda rows, output: exports.write_workbook(exports.ANALYSES_SHEET, rows, output),
+        'filename': 'dars_tahlili',
+        'extension': 'xlsx',
+        'content_type': exports.XLSX_CONTENT_TYPE,
+        'statuses': _analysis_statuses,
+    },
+}
+
+
+def clean_params(kind, query_params):
+    """So'rov parametrlarini tekshirib, JSON ga yoziladigan ko'rinishga keltirish"""
+    statuses = REPORTS[kind]['statuses']
+    filters = exports.parse_filters(query_params, statuses=statuses() if statuses else None)
+    if 'month' in filters:
+        filters['month'] = filters['month'].strftime('%Y-%m')
+    return filters
+
+
+def is_global(user):
+    """Superadmin hisobotlari umumiy: bir-birinikini qayta ishlatadi va ko'radi"""
+    return user is None or user.is_superuser or user.role == 'superadmin'
+
+
+def params_hash(kind, params, user):
+    """Hisobot kaliti: turi, parametrlar va ko'rinish doirasi
+
+    Superadmindan boshqalar hisoboti faqat o'ziga qayta ishlatiladi - ular
+    boshqa foydalanuvchining hisobotini ko'ra olmaydi.
+    """
+    scope = None if is_global(user) else user.pk
+    payload = json.dumps({'kind': kind, 'params': params, 'scope': scope}, sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def filename(kind):
+    spec = REPORTS[kind]
+    return f"{spec['filename']}_{timezone.localdate().strftime('%Y%m%d')}.{spec['extension']}"
+
+
+def render(kind, params, user, output):
+    """Hisobotni output fayliga yozish"""
+    spec = REPORTS[kind]
+    filters = exports.parse_filters(params, statuses=spec['statuses']() if spec['statuses'] else None)
+    spec['write'](spec['rows'](filters, user=user), output)
+
+
+def render_response(kind, params, user):
+    """Hisobotni so'rov ichida tayyorlab qaytarish"""
+    output = tempfile.TemporaryFile()
+    render(kind, params, user, output)
+    return exports.file_response(output, filename(kind), REPORTS[kind]['content_type'])
+
+
+def submit(kind, params, user):
+    """Hisobotni navbatga qo'yish. (job, yangi_yaratildimi) qaytaradi."""
+    key = params_hash(kind, params, user)
+    fresh_since = timezone.now() - timedelta(seconds=settings.REPORT_CACHE_TTL)
+    job = ReportJob.objects.filter(params_hash=key).filter(
+        Q(status__in=['pending', 'running']) | Q(status='done', finished_at__gte=fresh_since)
+    ).order_by('-created_at').first()
+    if job is not None:
+        return job, False
+
+    job = ReportJob.objects.create(kind=kind, params=params, params_hash=key, requested_by=user)
+    return job, True
+
+
+def claim_next():
+    """Navbatdagi hisobotni olish
+
+    Shartli UPDATE bilan olinadi - bir nechta worker bitta hisobotni ikki
+    marta tayyorlamaydi. Uzoq vaqt 'running' holatida qolgan (worker to'xtab
+    qolgan) hisobotlar qayta olinadi.
+    """
+    now = timezone.now()
+    claimable = Q(status='pending') | Q(
+        status='running', started_at__lt=now - timedelta(seconds=settings.REPORT_JOB_TIMEOUT)
+    )
+    candidates = ReportJob.objects.filter(claimable).order_by('created_at').values_list('pk', flat=True)[:10]
+    for pk in candidates:
+        if ReportJob.objects.filter(claimable, pk=pk).update(status='running', started_at=now):
+            return ReportJob.objects.select_related('requested_by').get(pk=pk)
+    return None
+
+
+def run(job):
+    """Hisobotni tayyorlab faylga saqlash"""
+    try:
+        with tempfile.TemporaryFile() as output:
+            render(job.kind, job.params, job.requested_by, output)
+            output.seek(0)
+            job.file.save(filename(job.kind), File(output), save=False)
+    except Exception as e:
+        logger.exception("Hisobot #%s tayyorlanmadi", job.pk)
+        job.status = 'failed'
+        job.error = str(e)
+    else:
+        job.status = 'done'
+        job.error = ''
+    job.finished_at = timezone.now()
+    job.save(update_fields=['file', 'status', 'error', 'finished_at'])
+    return job
+
+
+def heartbeat():
+    """Worker ishlayotganini bildirish (run_report_jobs har aylanishda)"""
+    cache.set(HEARTBEAT_KEY, timezone.now().timestamp(), settings.REPORT_WORKER_TIMEOUT)
+
+
+def worker_alive():
+    return cache.get(HEARTBEAT_KEY) is not None
+
+
+def run_inline(job):
+    """Worker yo'q bo'lsa navbatdagi hisobotni so'rov ichida tayyorlash"""
+    if ReportJob.objects.filter(pk=job.pk, status='pending').update(status='running', started_at=timezone.now()):
+        job.refresh_from_db()
+        return run(job)
+    job.refresh_from_db()
+    return job
+
+
+def run_pending(limit=None):
+    """Navbatdagi hisobotlarni tayyorlash. Tayyorlanganlar soni qaytariladi."""
+    count = 0
+    while limit is None or count < limit:
+        heartbeat()
+        job = claim_next()
+        if job is None:
+            break
+        run(job)
+        count += 1
+    return count
+
+
+def purge_expired():
+    """Saqlash muddati o'tgan hisobotlarni fayli bilan o'chirish"""
+    cutoff = timezone.now() - timedelta(seconds=settings.REPORT_RETENTION)
+    expired = ReportJob.objects.filter(status__in=['done', 'failed'], finished_at__lt=cutoff)
+    count = 0
+    for job in expired.iterator():
+        if job.file:
+            job.file.delete(save=False)
+        job.delete()
+        count += 1
+    return count
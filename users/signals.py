@@ -0,0 +1,149 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+from materials.models import Material
+from videos.models import Video
+from teachers.models import Teacher, TeacherActivity
+from schools.models import School
+from consultations.models import Consultation
+from . import dashboard
+from .authentication import forget_token, forget_user
+
+User = get_user_model()
+
+
+def _remember_approval(instance):
+    # Deferred maydonni yuklamaslik uchun __dict__ dan o'qiladi
+    instance._dashboard_approved = instance.__dict__.get('is_approved')
+
+
+def _content_saved(instance, created, total_field, approved_field):
+    """Material/Video saqlanganda snapshot hisoblagichlarini o'zgartirish"""
+    if created:
+        dashboard.adjust(
+            {total_field: 1, approved_field: int(instance.is_approved)},
+            teacher_id=instance.teacher_id,
+        )
+    else:
+        previous = getattr(instance, '_dashboard_approved', None)
+        if previous is not None and previous != instance.is_approved:
+            dashboard.adjust(
+                {approved_field: 1 if instance.is_approved else -1},
+                teacher_id=instance.teacher_id,
+            )
+    _remember_approval(instance)
+
+
+def _content_deleted(instance, total_field, approved_field):
+    dashboard.adjust(
+        {total_field: -1, approved_field: -int(instance.is_approved)},
+        teacher_id=instance.teacher_id,
+    )
+
+
+@receiver(post_init, sender=Material)
+@receiver(post_init, sender=Video)
+def remember_content_state(sender, instance, **kwargs):
+    _remember_approval(instance)
+
+
+@receiver(post_save, sender=Material)
+def material_saved(sender, instance, created, raw=False, **kwargs):
+    if not raw:
+        _content_saved(instance, created, 'total_materials', 'approved_materials')
+
+
+@receiver(post_delete, sender=Material)
+def material_deleted(sender, instance, **kwargs):
+    _content_deleted(instance, 'total_materials', 'approved_materials')
+
+
+@receiver(post_save, sender=Video)
+def video_saved(sender, instance, created, raw=False, **kwargs):
+    if not raw:
+        _content_saved(instance, created, 'total_videos', 'approved_videos')
+
+
+@receiver(post_delete, sender=Video)
+def video_deleted(sender, instance, **kwargs):
+    _content_deleted(instance, 'total_videos', 'approved_videos')
+
+
+@receiver(post_init, sender=Teacher)
+def remember_teacher_school(sender, instance, **kwargs):
+    instance._dashboard_school_id = instance.__dict__.get('school_id')
+
+
+@receiver(post_save, sender=Teacher)
+def teacher_saved(sender, instance, created, raw=False, **kwargs):
+    """O'qituvchi qo'shilganda yoki maktabi o'zgarganda"""
+    if raw:
+        return
+    previous_school_id = getattr(instance, '_dashboard_school_id', None)
+    if created:
+        dashboard.adjust({'total_teachers': 1}, school_id=instance.school_id)
+    elif previous_school_id is not None and previous_school_id != instance.school_id:
+        # Kam uchraydigan holat - ikkala maktabni to'liq qayta hisoblash
+        for school in School.objects.filter(id__in=[previous_school_id, instance.school_id]):
+            dashboard.rebuild_school(school)
+    instance._dashboard_school_id = instance.school_id
+
+
+@receiver(post_delete, sender=Teacher)
+def teacher_deleted(sender, instance, **kwargs):
+    dashboard.adjust({'total_teachers': -1}, school_id=instance.school_id)
+
+
+@receiver(post_save, sender=TeacherActivity)
+def activity_saved(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        dashboard.adjust({'total_activities': 1}, teacher_id=instance.teacher_id, include_global=False)
+
+
+@receiver(post_delete, sender=TeacherActivity)
+def activity_deleted(sender, instance, **kwargs):
+    dashboard.adjust({'total_activities': -1}, teacher_id=instance.teacher_id, include_global=False)
+
+
+@receiver(post_save, sender=Consultation)
+def consultation_saved(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        dashboard.adjust({'total_consultations': 1})
+
+
+@receiver(post_delete, sender=Consultation)
+def consultation_deleted(sender, instance, **kwargs):
+    dashboard.adjust({'total_consultations': -1})
+
+
+@receiver(post_save, sender=School)
+def school_saved(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        dashboard.adjust({'total_schools': 1})
+
+
+@receiver(post_delete, sender=School)
+def school_deleted(sender, instance, **kwargs):
+    dashboard.adjust({'total_schools': -1})
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        dashboard.adjust({'total_users': 1})
+    else:
+        # Parol, is_active yoki rol o'zgargan bo'lishi mumkin
+        forget_user(instance.pk)
+
+
+@receiver(post_delete, sender=User)
+def user_deleted(sender, instance, **kwargs):
+    dashboard.adjust({'total_users': -1})
+    forget_user(instance.pk)
+
+
+@receiver(post_delete, sender=Token)
+def token_deleted(sender, instance, **kwargs):
+    # Logout - token keshdan ham o'chiriladi
+    forget_token(instance.key)
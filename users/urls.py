@@ -18,6 +18,8 @@ from .views import (
     ExportRatingsExcelView,
     ExportRatingsPDFView,
     ExportLessonAnalysisExcelView,
+    ReportJobDetailView,
+    ReportJobDownloadView,
     ChartDataView,
     AnalyticsOverviewView,
 )
@@ -53,4 +55,6 @@ urlpatterns = [
     path('export/ratings/excel/', ExportRatingsExcelView.as_view(), name='export-ratings-excel'),
     path('export/ratings/pdf/', ExportRatingsPDFView.as_view(), name='export-ratings-pdf'),
     path('export/lesson-analysis/excel/', ExportLessonAnalysisExcelView.as_view(), name='export-analysis-excel'),
+    path('reports/<int:pk>/', ReportJobDetailView.as_view(), name='report-job-detail'),
+    path('reports/<int:pk>/download/', ReportJobDownloadView.as_view(), name='report-job-download'),
 ]
\ No newline at end of file
@@ -4,21 +4,13 @@ from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated, AllowAny, IsAdminUser
 from rest_framework.authtoken.models import Token
 from django.contrib.auth import authenticate, get_user_model
-from django.db import models
-from django.http import HttpResponse
+from django.db import models, transaction
 from django.core.mail import send_mail
 from django.conf import settings
-from openpyxl import Workbook
-from openpyxl.styles import Font, Alignment, PatternFill
-from reportlab.lib.pagesizes import A4
-from reportlab.lib import colors
-from reportlab.lib.units import inch
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph
-from reportlab.lib.styles import getSampleStyleSheet
-from io import BytesIO
 from django.db.models import Count, Sum, Q
-from django.db.models.functions import TruncMonth, TruncDay
+from django.db.models.functions import TruncMonth, Coalesce
 from datetime import datetime, timedelta
+import os
 from .serializers import (
     UserSerializer,
     RegisterSerializer,
@@ -26,8 +18,13 @@ from .serializers import (
     ChangePasswordSerializer,
     PasswordResetRequestSerializer,
     PasswordResetConfirmSerializer,
+    ReportJobSerializer,
 )
-from .models import PasswordResetToken
+from .models import PasswordResetToken, ReportJob
+from . import exports, reports
+from .authentication import forget_user
+from utils.cache import cache_view
+from utils.pagination import KeysetPagination
 
 User = get_user_model()
 
@@ -78,6 +75,7 @@ class LogoutView(APIView):
     permission_classes = [IsAuthenticated]
 
     def post(self, request):
+        forget_user(request.user.pk)
         try:
             # Token o'chirish
             request.user.auth_token.delete()
@@ -260,87 +258,38 @@ class DashboardStatsView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        from teachers.models import Teacher, TeacherActivity
-        from materials.models import Material
-        from videos.models import Video
-        from schools.models import School
-        from consultations.models import Consultation
-
-        user = request.user
-
-        if user.is_superuser or user.role == 'superadmin':
-            stats = {
-                'total_users': User.objects.count(),
-                'total_teachers': Teacher.objects.count(),
-                'total_schools': School.objects.count(),
-                'total_materials': Material.objects.count(),
-                'total_videos': Video.objects.count(),
-                'pending_materials': Material.objects.filter(is_approved=False).count(),
-                'pending_videos': Video.objects.filter(is_approved=False).count(),
-                'total_consultations': Consultation.objects.count(),
-            }
-        elif user.role == 'admin':
-            school = School.objects.filter(director=user).first()
-            if school:
-                stats = {
-                    'school_name': school.name,
-                    'total_teachers': Teacher.objects.filter(school=school).count(),
-                    'total_materials': Material.objects.filter(teacher__school=school).count(),
-                    'total_videos': Video.objects.filter(teacher__school=school).count(),
-                    'pending_materials': Material.objects.filter(teacher__school=school, is_approved=False).count(),
-                    'pending_videos': Video.objects.filter(teacher__school=school, is_approved=False).count(),
-                }
-            else:
-                stats = {}
-        elif user.role == 'teacher':
-            try:
-                teacher = Teacher.objects.get(user=user)
-                stats = {
-                    'total_points': teacher.total_points,
-                    'monthly_points': teacher.monthly_points,
-                    'level': teacher.level,
-                    'total_materials': Material.objects.filter(teacher=teacher).count(),
-                    'approved_materials': Material.objects.filter(teacher=teacher, is_approved=True).count(),
-                    'total_videos': Video.objects.filter(teacher=teacher).count(),
-                    'approved_videos': Video.objects.filter(teacher=teacher, is_approved=True).count(),
-                    'total_activities': TeacherActivity.objects.filter(teacher=teacher).count(),
-                }
-            except Teacher.DoesNotExist:
-                stats = {}
-        else:
-            stats = {}
+        from .dashboard import get_stats
 
-        return Response(stats)
+        return Response(get_stats(request.user))
 
 
 class MonthlyActivityView(APIView):
     """Oylik faoliyat statistikasi"""
     permission_classes = [IsAuthenticated]
 
+    @cache_view('analytics')
     def get(self, request):
-        from teachers.models import Teacher, TeacherActivity
-        from django.db.models import Count, Sum
-        from django.db.models.functions import TruncMonth
+        from teachers.models import TeacherActivityDaily
 
         six_months_ago = datetime.now() - timedelta(days=180)
 
         if request.user.role == 'teacher':
-            try:
-                teacher = Teacher.objects.get(user=request.user)
-                activities = TeacherActivity.objects.filter(
-                    teacher=teacher,
-                    date__gte=six_months_ago
-                ).annotate(
-                    month=TruncMonth('date')
-                ).values('month').annotate(
-                    count=Count('id'),
-                    total_points=Sum('points')
-                ).order_by('month')
-
-                return Response(list(activities))
-            except Teacher.DoesNotExist:
+            teacher = request.profile.teacher
+            if teacher is None:
                 return Response([])
 
+            activities = TeacherActivityDaily.objects.filter(
+                teacher=teacher,
+                day__gte=six_months_ago.date()
+            ).annotate(
+                month=TruncMonth('day')
+            ).values('month').annotate(
+                count=Sum('count'),
+                total_points=Sum('points')
+            ).order_by('month')
+
+            return Response(list(activities))
+
         return Response([])
 
 
@@ -348,6 +297,7 @@ class TopPerformersView(APIView):
     """Top o'qituvchilar"""
     permission_classes = [IsAuthenticated]
 
+    @cache_view('analytics')
     def get(self, request):
         from teachers.models import Teacher
 
@@ -379,41 +329,103 @@ class BulkApprovalView(APIView):
         from materials.models import Material
         from videos.models import Video
 
-        material_ids = request.data.get('material_ids', [])
-        video_ids = request.data.get('video_ids', [])
+        try:
+            material_ids = [int(pk) for pk in request.data.get('material_ids', [])]
+            video_ids = [int(pk) for pk in request.data.get('video_ids', [])]
+        except (TypeError, ValueError):
+            return Response(
+                {'error': 'ID lar butun son bo\'lishi kerak'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
         action = request.data.get('action', 'approve')
 
-        if action == 'approve':
-            materials = Material.objects.filter(id__in=material_ids)
-            for material in materials:
-                material.is_approved = True
-                material.save()
-                material.teacher.total_points += 10
-                material.teacher.monthly_points += 10
-                material.teacher.update_level()
-
-            videos = Video.objects.filter(id__in=video_ids)
-            for video in videos:
-                video.is_approved = True
-                video.save()
-                video.teacher.total_points += 15
-                video.teacher.monthly_points += 15
-                video.teacher.update_level()
-
-            message = f"{len(materials)} material va {len(videos)} video tasdiqlandi"
-
-        elif action == 'reject':
-            Material.objects.filter(id__in=material_ids).delete()
-            Video.objects.filter(id__in=video_ids).delete()
-            message = f"{len(material_ids)} material va {len(video_ids)} video rad etildi"
-
-        else:
+        if action not in ['approve', 'reject']:
             return Response(
                 {'error': 'Noto\'g\'ri action'},
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        return Response({'message': message})
+        materials = Material.objects.all()
+        videos = Video.objects.all()
+        if request.user.role == 'admin':
+            # Admin faqat o'z maktabi materiallarini tasdiqlaydi
+            materials = materials.filter(teacher__school__director=request.user)
+            videos = videos.filter(teacher__school__director=request.user)
+
+        with transaction.atomic():
+            if action == 'approve':
+                material_results = self.approve(materials, material_ids, 'material_approved', 'approved_materials')
+                video_results = self.approve(videos, video_ids, 'video_approved', 'approved_videos')
+                verb = 'tasdiqlandi'
+            else:
+                material_results = self.reject(materials, material_ids)
+                video_results = self.reject(videos, video_ids)
+                verb = 'rad etildi'
+
+        done = 'approved' if action == 'approve' else 'rejected'
+        materials_done = sum(1 for item in material_results if item['status'] == done)
+        videos_done = sum(1 for item in video_results if item['status'] == done)
+
+        return Response({
+            'message': f"{materials_done} material va {videos_done} video {verb}",
+            'results': {
+                'materials': material_results,
+                'videos': video_results,
+            },
+        })
+
+    @staticmethod
+    def approve(queryset, ids, reason, counter_field):
+        """Bitta UPDATE bilan tasdiqlash va ballarni bitta bulk update bilan berish
+
+        UPDATE post_save signalini chaqirmaydi - qidiruv hujjatlari ham
+        bitta UPDATE bilan ochiladi.
+        """
+        from search import index
+        from teachers import points
+        from .dashboard import adjust_many
+
+        rows = {
+            pk: (teacher_id, is_approved)
+            for pk, teacher_id, is_approved in queryset.select_for_update(of=('self',)).filter(
+                id__in=ids
+            ).values_list('id', 'teacher_id', 'is_approved')
+        }
+        pending = [pk for pk, (_, is_approved) in rows.items() if not is_approved]
+
+        if pending:
+            queryset.model.objects.filter(id__in=pending).update(is_approved=True)
+            index.refresh_public(queryset.model, pending)
+
+            source_type = queryset.model._meta.model_name
+            points.award_many([
+                (rows[pk][0], reason, (source_type, pk)) for pk in pending
+            ])
+
+            per_teacher = {}
+            for pk in pending:
+                per_teacher[rows[pk][0]] = per_teacher.get(rows[pk][0], 0) + 1
+            adjust_many(counter_field, per_teacher)
+
+        pending = set(pending)
+        results = []
+        for pk in ids:
+            if pk not in rows:
+                item_status = 'not_found'
+            elif pk in pending:
+                item_status = 'approved'
+            else:
+                item_status = 'already_approved'
+            results.append({'id': pk, 'status': item_status})
+        return results
+
+    @staticmethod
+    def reject(queryset, ids):
+        """Rad etilganlarni o'chirish"""
+        found = set(queryset.filter(id__in=ids).values_list('id', flat=True))
+        if found:
+            queryset.model.objects.filter(id__in=found).delete()
+        return [{'id': pk, 'status': 'rejected' if pk in found else 'not_found'} for pk in ids]
 
 
 class PendingApprovalsView(APIView):
@@ -445,173 +457,89 @@ class PendingApprovalsView(APIView):
             materials = Material.objects.filter(is_approved=False)
             videos = Video.objects.filter(is_approved=False)
 
-        return Response({
-            'materials': MaterialSerializer(materials, many=True).data,
-            'videos': VideoSerializer(videos, many=True).data,
-        })
+        # Har bir ro'yxat o'z kursori bilan: ?materials_cursor= / ?videos_cursor=
+        data = {}
+        for key, queryset, serializer_class in (
+            ('materials', materials.select_related('teacher__user', 'teacher__school'), MaterialSerializer),
+            ('videos', videos, VideoSerializer),
+        ):
+            paginator = KeysetPagination(cursor_query_param=f'{key}_cursor')
+            page = paginator.paginate_queryset(queryset, request, view=self)
+            data[key] = paginator.get_paginated_data(serializer_class(page, many=True).data)
+        return Response(data)
 
 
 # EXPORT VIEWS
 
-class ExportRatingsExcelView(APIView):
-    """Reytingni Excel ga export qilish"""
-    permission_classes = [IsAuthenticated]
-
-    def get(self, request):
-        from ratings.models import TeacherRating
-
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "O'qituvchilar Reytingi"
-
-        ws['A1'] = "O'qituvchilar Reytingi"
-        ws['A1'].font = Font(size=16, bold=True)
-        ws['A1'].alignment = Alignment(horizontal='center')
-        ws.merge_cells('A1:E1')
-
-        headers = ['#', 'O\'qituvchi', 'Maktab', 'Ball', 'O\'rin']
-        ws.append([])
-        ws.append(headers)
-
-        for cell in ws[3]:
-            cell.font = Font(bold=True, color='FFFFFF')
-            cell.fill = PatternFill(start_color='4472C4', end_color='4472C4', fill_type='solid')
-            cell.alignment = Alignment(horizontal='center')
-
-        ratings = TeacherRating.objects.select_related('teacher').order_by('rank')[:50]
-        for idx, rating in enumerate(ratings, 1):
-            ws.append([
-                idx,
-                rating.teacher.user.get_full_name(),
-                rating.teacher.school.name,
-                rating.total_points,
-                rating.rank
-            ])
-
-        ws.column_dimensions['A'].width = 5
-        ws.column_dimensions['B'].width = 30
-        ws.column_dimensions['C'].width = 40
-        ws.column_dimensions['D'].width = 12
-        ws.column_dimensions['E'].width = 12
-
-        response = HttpResponse(
-            content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-        )
-        response['Content-Disposition'] = f'attachment; filename=reyting_{datetime.now().strftime("%Y%m%d")}.xlsx'
-
-        wb.save(response)
-        return response
-
+class ReportExportView(APIView):
+    """Hisobot eksporti uchun umumiy view
 
-class ExportRatingsPDFView(APIView):
-    """Reytingni PDF ga export qilish"""
+    Filtrlar: ?month=YYYY-MM, ?school=<id>, ?region=<viloyat>
+    ?async=1 - hisobot navbatga qo'yiladi, holati /reports/<id>/ dan olinadi
+    """
     permission_classes = [IsAuthenticated]
+    kind = None
 
     def get(self, request):
-        from ratings.models import TeacherRating
-
-        buffer = BytesIO()
-        doc = SimpleDocTemplate(buffer, pagesize=A4)
-        elements = []
-
-        styles = getSampleStyleSheet()
-
-        title = Paragraph("O'qituvchilar Reytingi", styles['Title'])
-        elements.append(title)
-        elements.append(Paragraph("<br/><br/>", styles['Normal']))
+        try:
+            params = reports.clean_params(self.kind, request.query_params)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        if request.query_params.get('async') in ('1', 'true'):
+            job, _ = reports.submit(self.kind, params, request.user)
+            if job.status == 'pending' and not reports.worker_alive():
+                # Fon worker ishlamayapti - navbatda qolib ketmasin
+                job = reports.run_inline(job)
+            return Response(
+                ReportJobSerializer(job, context={'request': request}).data,
+                status=status.HTTP_202_ACCEPTED
+            )
 
-        data = [['#', 'O\'qituvchi', 'Maktab', 'Ball', 'O\'rin']]
+        return reports.render_response(self.kind, params, request.user)
 
-        ratings = TeacherRating.objects.select_related('teacher').order_by('rank')[:50]
-        for idx, rating in enumerate(ratings, 1):
-            data.append([
-                str(idx),
-                rating.teacher.user.get_full_name(),
-                rating.teacher.school.name[:30],
-                str(rating.total_points),
-                str(rating.rank)
-            ])
 
-        table = Table(data, colWidths=[0.5 * inch, 2 * inch, 3 * inch, 1 * inch, 1 * inch])
+class ExportRatingsExcelView(ReportExportView):
+    """Reytingni Excel ga export qilish"""
+    kind = 'ratings_excel'
 
-        table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#4472C4')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 12),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 1), (-1, -1), 9),
-        ]))
 
-        elements.append(table)
-        doc.build(elements)
+class ExportRatingsPDFView(ReportExportView):
+    """Reytingni PDF ga export qilish"""
+    kind = 'ratings_pdf'
 
-        buffer.seek(0)
-        response = HttpResponse(buffer, content_type='application/pdf')
-        response['Content-Disposition'] = f'attachment; filename=reyting_{datetime.now().strftime("%Y%m%d")}.pdf'
 
-        return response
+class ExportLessonAnalysisExcelView(ReportExportView):
+    """Dars tahlilini Excel ga export (qo'shimcha filtr: ?status=<holat>)"""
+    kind = 'analyses_excel'
 
 
-class ExportLessonAnalysisExcelView(APIView):
-    """Dars tahlilini Excel ga export"""
+class ReportJobDetailView(generics.RetrieveAPIView):
+    """Fon rejimidagi hisobot holati"""
     permission_classes = [IsAuthenticated]
+    serializer_class = ReportJobSerializer
 
-    def get(self, request):
-        from lesson_analysis.models import LessonAnalysis
+    def get_queryset(self):
+        if reports.is_global(self.request.user):
+            return ReportJob.objects.all()
+        return ReportJob.objects.filter(requested_by=self.request.user)
 
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Dars Tahlillari"
-
-        ws['A1'] = "Dars Tahlillari Hisoboti"
-        ws['A1'].font = Font(size=16, bold=True)
-        ws.merge_cells('A1:H1')
-
-        headers = ['#', 'O\'qituvchi', 'Tahlilchi', 'Mavzu', 'Fan', 'Sinf', 'Baho', 'Sana']
-        ws.append([])
-        ws.append(headers)
-
-        for cell in ws[3]:
-            cell.font = Font(bold=True, color='FFFFFF')
-            cell.fill = PatternFill(start_color='4472C4', end_color='4472C4', fill_type='solid')
-
-        analyses = LessonAnalysis.objects.select_related('teacher', 'analyzer').filter(
-            status='approved'
-        ).order_by('-lesson_date')[:100]
-
-        for idx, analysis in enumerate(analyses, 1):
-            ws.append([
-                idx,
-                analysis.teacher.user.get_full_name(),
-                analysis.analyzer.user.get_full_name(),
-                analysis.topic,
-                analysis.subject,
-                analysis.grade,
-                float(analysis.overall_rating),
-                analysis.lesson_date.strftime('%Y-%m-%d')
-            ])
 
-        ws.column_dimensions['A'].width = 5
-        ws.column_dimensions['B'].width = 25
-        ws.column_dimensions['C'].width = 25
-        ws.column_dimensions['D'].width = 40
-        ws.column_dimensions['E'].width = 15
-        ws.column_dimensions['F'].width = 8
-        ws.column_dimensions['G'].width = 10
-        ws.column_dimensions['H'].width = 12
-
-        response = HttpResponse(
-            content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-        )
-        response['Content-Disposition'] = f'attachment; filename=dars_tahlili_{datetime.now().strftime("%Y%m%d")}.xlsx'
+class ReportJobDownloadView(ReportJobDetailView):
+    """Tayyor hisobotni yuklab olish"""
 
-        wb.save(response)
-        return response
+    def get(self, request, *args, **kwargs):
+        job = self.get_object()
+        if job.status != 'done':
+            return Response(
+                {'error': 'Hisobot hali tayyor emas', 'status': job.status},
+                status=status.HTTP_409_CONFLICT
+            )
+        return exports.file_response(
+            job.file.open('rb'),
+            os.path.basename(job.file.name),
+            reports.REPORTS[job.kind]['content_type'],
+        )
 
 
 # CHART DATA VIEWS
@@ -620,6 +548,7 @@ class ChartDataView(APIView):
     """Grafiklar uchun ma'lumotlar"""
     permission_classes = [IsAuthenticated]
 
+    @cache_view('analytics')
     def get(self, request):
         chart_type = request.query_params.get('type', 'monthly_activity')
 
@@ -638,39 +567,24 @@ class ChartDataView(APIView):
 
     def get_monthly_activity(self, request):
         """Oylik faoliyat grafigi"""
-        from teachers.models import TeacherActivity
+        from teachers.models import TeacherActivityDaily
 
         six_months_ago = datetime.now() - timedelta(days=180)
+        activities = TeacherActivityDaily.objects.filter(day__gte=six_months_ago.date())
 
         if request.user.role == 'teacher':
-            from teachers.models import Teacher
-            try:
-                teacher = Teacher.objects.get(user=request.user)
-                activities = TeacherActivity.objects.filter(
-                    teacher=teacher,
-                    date__gte=six_months_ago
-                ).annotate(
-                    month=TruncMonth('date')
-                ).values('month').annotate(
-                    materials=Count('id', filter=Q(activity_type='material_upload')),
-                    videos=Count('id', filter=Q(activity_type='video_upload')),
-                    analyses=Count('id', filter=Q(activity_type='lesson_analysis')),
-                    total_points=Sum('points')
-                ).order_by('month')
-
-                return Response(list(activities))
-            except Teacher.DoesNotExist:
+            teacher = request.profile.teacher
+            if teacher is None:
                 return Response([])
+            activities = activities.filter(teacher=teacher)
 
         # Admin uchun umumiy statistika
-        activities = TeacherActivity.objects.filter(
-            date__gte=six_months_ago
-        ).annotate(
-            month=TruncMonth('date')
+        activities = activities.annotate(
+            month=TruncMonth('day')
         ).values('month').annotate(
-            materials=Count('id', filter=Q(activity_type='material_upload')),
-            videos=Count('id', filter=Q(activity_type='video_upload')),
-            analyses=Count('id', filter=Q(activity_type='lesson_analysis')),
+            materials=Coalesce(Sum('count', filter=Q(activity_type='material_upload')), 0),
+            videos=Coalesce(Sum('count', filter=Q(activity_type='video_upload')), 0),
+            analyses=Coalesce(Sum('count', filter=Q(activity_type='lesson_analysis')), 0),
             total_points=Sum('points')
         ).order_by('month')
 
@@ -721,16 +635,14 @@ class ChartDataView(APIView):
 
     def get_growth_trend(self, request):
         """O'sish trendi (oxirgi 30 kun)"""
-        from teachers.models import TeacherActivity
+        from teachers.models import TeacherActivityDaily
 
         thirty_days_ago = datetime.now() - timedelta(days=30)
 
-        daily_stats = TeacherActivity.objects.filter(
-            date__gte=thirty_days_ago
-        ).annotate(
-            day=TruncDay('date')
+        daily_stats = TeacherActivityDaily.objects.filter(
+            day__gte=thirty_days_ago.date()
         ).values('day').annotate(
-            total_activities=Count('id'),
+            total_activities=Sum('count'),
             total_points=Sum('points')
         ).order_by('day')
 
@@ -741,6 +653,7 @@ class AnalyticsOverviewView(APIView):
     """Umumiy tahliliy ko'rsatkichlar"""
     permission_classes = [IsAuthenticated]
 
+    @cache_view('analytics', vary=None)
     def get(self, request):
         from teachers.models import Teacher, TeacherActivity
         from materials.models import Material
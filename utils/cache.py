@@ -0,0 +1,118 @@
+"""
+Loyiha darajasidagi kesh API.
+
+Kalitlar nomlar fazosi (namespace) bo'yicha guruhlanadi va har bir fazoning
+versiyasi bor: invalidate('ratings') versiyani oshiradi, eski kalitlar
+boshqa o'qilmaydi va backend ularni o'zi chiqarib tashlaydi (TTL / cull).
+Versiya barcha gunicorn workerlar uchun umumiy keshda saqlanadi.
+
+Versiya - millisekundlardagi vaqt (invalidate da kamida +1): versiya kaliti
+cull bilan o'chib ketsa, qayta yaratilgani avvalgi barcha versiyalardan
+katta bo'ladi va eski kalitlar qayta o'qilmaydi.
+"""
+import functools
+import hashlib
+import json
+import time
+
+from django.core.cache import cache
+from rest_framework.response import Response
+
+KEY_PREFIX = 'edu'
+
+
+def _version_key(namespace):
+    return f'{KEY_PREFIX}:{namespace}:version'
+
+
+def _now():
+    return int(time.time() * 1000)
+
+
+def get_version(namespace):
+    """Nomlar fazosining joriy versiyasi"""
+    key = _version_key(namespace)
+    version = cache.get(key)
+    if version is None:
+        # Versiya keshdan chiqib ketgan: joriy vaqt avvalgi versiyalardan katta
+        cache.add(key, _now(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def invalidate(*namespaces):
+    """Nomlar fazosidagi barcha kalitlarni eskirgan deb belgilash"""
+    for namespace in namespaces:
+        key = _version_key(namespace)
+        # incr o'rniga vaqt: versiya doim vaqtdan orqada qolmaydi
+        cache.set(key, max(_now(), (cache.get(key) or 0) + 1), timeout=None)
+
+
+def make_key(namespace, *parts):
+    """Nomlar fazosi va versiya bilan kalit (qismlar xeshlanadi)"""
+    digest = hashlib.md5(
+        json.dumps(parts, sort_keys=True, default=str).encode()
+    ).hexdigest()
+    return f'{KEY_PREFIX}:{namespace}:{get_version(namespace)}:{digest}'
+
+
+def cached(namespace, parts, compute, timeout=300):
+    """Kesh qiymatini olish, bo'lmasa compute() bilan hisoblab saqlash"""
+    key = make_key(namespace, *parts)
+    value = cache.get(key)
+    if value is None:
+        value = compute()
+        if value is not None:
+            cache.set(key, value, timeout)
+    return value
+
+
+def cached_query(namespace, timeout=300):
+    """Funksiya natijasini argumentlari bo'yicha keshlash
+
+        @cached_query('ratings')
+        def top_teachers(month, limit): ...
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            parts = (func.__module__, func.__qualname__, args, kwargs)
+            return cached(namespace, parts, lambda: func(*args, **kwargs), timeout)
+        wrapper.invalidate = lambda: invalidate(namespace)
+        return wrapper
+    return decorator
+
+
+def cache_view(namespace, timeout=300, vary='user'):
+    """APIView/ViewSet metodining javobini keshlash
+
+    Faqat 200 javoblar keshlanadi. Kalit so'rov yo'li va query
+    parametrlaridan tuziladi; vary - javob kimga bog'liq:
+    'user' - har bir foydalanuvchi, 'role' - har bir rol, None - hamma uchun bir xil.
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, request, *args, **kwargs):
+            if vary == 'user':
+                audience = request.user.pk
+            elif vary == 'role':
+                audience = getattr(request.user, 'role', None)
+            else:
+                audience = None
+            key = make_key(
+                namespace,
+                request.path,
+                sorted(request.query_params.lists()),
+                audience,
+            )
+
+            data = cache.get(key)
+            if data is not None:
+                return Response(data)
+
+            response = method(self, request, *args, **kwargs)
+            if response.status_code == 200:
+                cache.set(key, response.data, timeout)
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,150 @@
+"""
+Write-behind hisoblagichlar (ko'rishlar, yuklab olishlar, likelar).
+
+Har bir bosish bazaga UPDATE yubormaydi: oshirishlar jarayon xotirasida
+yig'iladi va fon oqimi har COUNTER_FLUSH_INTERVAL soniyada (yoki
+COUNTER_FLUSH_THRESHOLD ta kalit yig'ilganda) ularni har bir model uchun
+bitta F() + CASE UPDATE bilan yozadi. O'qishda hali yozilmagan qiymatlar
+qo'shib ko'rsatiladi.
+
+    counters.increment(Video, video_id, 'likes')
+    counters.pending(Video, video_id, 'likes')
+"""
+import atexit
+import logging
+import threading
+import time
+from collections import defaultdict
+
+from django.apps import apps
+from django.conf import settings
+from django.db import connection
+from django.db.models import Case, F, Value, When
+from rest_framework.generics import get_object_or_404
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_pending = defaultdict(int)    # (model_label, field, pk) -> delta
+_in_flight = {}                # bazaga yozilayotgan qiymatlar (o'qishda hisobga olinadi)
+_flusher = None
+
+
+def _key(model, pk, field):
+    return model._meta.label, field, int(pk)
+
+
+def increment(model, pk, field, amount=1):
+    """Hisoblagichni oshirish (bazaga keyinroq yoziladi)"""
+    with _lock:
+        _pending[_key(model, pk, field)] += amount
+        size = len(_pending)
+
+    _ensure_flusher()
+    if size >= settings.COUNTER_FLUSH_THRESHOLD:
+        flush()
+
+
+def pending(model, pk, field):
+    """Bazaga hali yozilmagan farq"""
+    key = _key(model, pk, field)
+    with _lock:
+        return _pending.get(key, 0) + _in_flight.get(key, 0)
+
+
+def hit(queryset, pk, field):
+    """View ichida: obyekt ko'rinishini tekshirib hisoblagichni oshirish
+
+    Obyekt yuklanmaydi va qator yangilanmaydi - faqat bitta ustun o'qiladi.
+    Yangi qiymat (yozilmagan farq bilan) qaytariladi.
+    """
+    current = get_object_or_404(queryset.values_list(field, flat=True), pk=pk)
+    increment(queryset.model, pk, field)
+    return current + pending(queryset.model, pk, field)
+
+
+def _update(label, fields):
+    """{field: {pk: delta}} ni bitta UPDATE bilan qo'llash"""
+    model = apps.get_model(label)
+    pks = set()
+    updates = {}
+    for field, deltas in fields.items():
+        pks.update(deltas)
+        updates[field] = F(field) + Case(
+            *[When(pk=pk, then=Value(delta)) for pk, delta in deltas.items()],
+            default=Value(0),
+        )
+    model.objects.filter(pk__in=pks).update(**updates)
+
+
+def flush():
+    """Yig'ilgan oshirishlarni bazaga yozish. Yozilgan kalitlar soni qaytariladi."""
+    with _lock:
+        batch = dict(_pending)
+        _pending.clear()
+        for key, delta in batch.items():
+            _in_flight[key] = _in_flight.get(key, 0) + delta
+    if not batch:
+        return 0
+
+    grouped = defaultdict(lambda: defaultdict(dict))
+    for (label, field, pk), delta in batch.items():
+        grouped[label][field][pk] = delta
+
+    written = 0
+    for label, fields in grouped.items():
+        keys = [(label, field, pk) for field, deltas in fields.items() for pk in deltas]
+        try:
+            _update(label, fields)
+        except Exception:
+            logger.exception("%s hisoblagichlari yozilmadi, keyingi safar qayta uriniladi", label)
+            with _lock:
+                for key in keys:
+                    _pending[key] += batch[key]
+        else:
+            written += len(keys)
+        finally:
+            with _lock:
+                for key in keys:
+                    _in_flight[key] -= batch[key]
+                    if not _in_flight[key]:
+                        del _in_flight[key]
+    return written
+
+
+def _run_flusher():
+    while True:
+        time.sleep(settings.COUNTER_FLUSH_INTERVAL)
+        try:
+            flush()
+        finally:
+            connection.close()
+
+
+def _ensure_flusher():
+    global _flusher
+    if _flusher is not None and _flusher.is_alive():
+        return
+    with _lock:
+        if _flusher is None or not _flusher.is_alive():
+            _flusher = threading.Thread(target=_run_flusher, name='counter-flusher', daemon=True)
+            _flusher.start()
+
+
+atexit.register(flush)
+
+
+class PendingCountersMixin:
+    """Serializer javobiga yozilmagan hisoblagich qiymatlarini qo'shish
+
+    Serializer da counter_fields = ['views', ...] ko'rsatiladi.
+    """
+    counter_fields = ()
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        model = type(instance)
+        for field in self.counter_fields:
+            if field in data:
+                data[field] += pending(model, instance.pk, field)
+        return data
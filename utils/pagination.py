@@ -1,4 +1,29 @@
-from rest_framework.pagination import PageNumberPagination
+"""
+Sahifalash klasslari.
+
+KeysetPagination - katta va o'sib boruvchi ro'yxatlar uchun: sahifa
+OFFSET bilan emas, oxirgi qatorning kaliti bo'yicha olinadi
+(WHERE (created_at, id) < (...)), shuning uchun har qanday chuqurlikdagi
+sahifa bir xil tez va COUNT(*) bajarilmaydi.
+
+    ?cursor=<javob.next dagi qiymat>   keyingi sahifa
+    ?page_size=50                      sahifa hajmi (ko'pi bilan max_page_size)
+    ?count=1                           aniq jami son (qo'shimcha COUNT so'rovi)
+
+Qidiruv reytingi yoki ?ordering= bo'yicha tartiblanadigan umumiy
+ro'yxatlarda (kutubxona, maktablar, o'qituvchilar) PageNumberPagination
+qoladi.
+"""
+import base64
+import json
+from collections import OrderedDict
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
 
 
 class StandardResultsSetPagination(PageNumberPagination):
@@ -10,4 +35,140 @@ class StandardResultsSetPagination(PageNumberPagination):
 class LargeResultsSetPagination(PageNumberPagination):
     page_size = 50
     page_size_query_param = 'page_size'
-    max_page_size = 1000
\ No newline at end of file
+    max_page_size = 1000
+
+
+class KeysetPagination(BasePagination):
+    """Kalit bo'yicha sahifalash (faqat oldinga)
+
+    Tartib querysetning o'z tartibidan (masalan OrderingFilter qo'ygan),
+    konstruktorga berilgan ordering, view.keyset_ordering yoki
+    ('-created_at',) dan - shu navbatda - olinadi; oxiriga doim pk
+    qo'shiladi, shunda kalit yagona bo'ladi. Kalit maydonlari NULL bo'lmasligi
+    kerak, shuning uchun queryset tartibi faqat modelning NULL bo'lmaydigan
+    o'z maydonlaridan iborat bo'lsa ishlatiladi.
+
+    Action ichida boshqa tartib bilan:
+        paginator = KeysetPagination(ordering=('-completed_at',))
+        page = paginator.paginate_queryset(queryset, request, view=self)
+        return paginator.get_paginated_response(serializer(page, many=True).data)
+    """
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    count_query_param = 'count'
+    ordering = ('-created_at',)
+    invalid_cursor_message = 'Noto\'g\'ri kursor'
+
+    def __init__(self, ordering=None, cursor_query_param=None):
+        self.explicit_ordering = ordering
+        if cursor_query_param is not None:
+            self.cursor_query_param = cursor_query_param
+
+    def queryset_ordering(self, queryset):
+        """Querysetga order_by bilan berilgan tartib, agar u kalit bo'la olsa"""
+        ordering = queryset.query.order_by
+        if not ordering:
+            return None
+        for name in ordering:
+            if not isinstance(name, str):
+                return None
+            try:
+                field = queryset.model._meta.get_field(name.lstrip('-'))
+            except FieldDoesNotExist:
+                return None
+            if not field.concrete or field.null:
+                return None
+        return ordering
+
+    def get_ordering(self, queryset, view):
+        ordering = list(
+            self.queryset_ordering(queryset)
+            or self.explicit_ordering
+            or getattr(view, 'keyset_ordering', None)
+            or self.ordering
+        )
+        pk = queryset.model._meta.pk.name
+        if ordering[-1].lstrip('-') not in (pk, 'pk'):
+            ordering.append(f"-{pk}" if ordering[0].startswith('-') else pk)
+        return ordering
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size_value = self.get_page_size(request)
+        self.ordering_fields = self.get_ordering(queryset, view)
+        self.fields = [queryset.model._meta.get_field(name.lstrip('-')) for name in self.ordering_fields]
+
+        self.count = None
+        if request.query_params.get(self.count_query_param) in ('1', 'true'):
+            self.count = queryset.count()
+
+        queryset = queryset.order_by(*self.ordering_fields)
+        cursor = request.query_params.get(self.cursor_query_param)
+        if cursor:
+            queryset = queryset.filter(self.after(self.decode_cursor(cursor)))
+
+        page = list(queryset[:self.page_size_value + 1])
+        self.has_next = len(page) > self.page_size_value
+        page = page[:self.page_size_value]
+        self.last = page[-1] if page else None
+        return page
+
+    def after(self, values):
+        """Kalitdan keyingi qatorlar: (a, b) < (x, y) => a < x OR (a = x AND b < y)"""
+        condition = Q()
+        equal = {}
+        for name, field, value in zip(self.ordering_fields, self.fields, values):
+            lookup = 'lt' if name.startswith('-') else 'gt'
+            condition |= Q(**equal, **{f"{field.name}__{lookup}": value})
+            equal[field.name] = value
+        return condition
+
+    def encode_cursor(self, obj):
+        values = [field.value_to_string(obj) for field in self.fields]
+        return base64.urlsafe_b64encode(json.dumps(values).encode()).decode().rstrip('=')
+
+    def decode_cursor(self, cursor):
+        try:
+            values = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+            if not isinstance(values, list) or len(values) != len(self.fields):
+                raise ValueError
+            return [field.to_python(value) for field, value in zip(self.fields, values)]
+        except Exception:
+            raise NotFound(self.invalid_cursor_message)
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        url = remove_query_param(url, self.count_query_param)
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.last))
+
+    def get_paginated_data(self, data):
+        payload = OrderedDict()
+        if self.count is not None:
+            payload['count'] = self.count
+        payload['next'] = self.get_next_link()
+        payload['results'] = data
+        return payload
+
+    def get_paginated_response(self, data):
+        return Response(self.get_paginated_data(data))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'count': {'type': 'integer'},
+                'next': {'type': 'string', 'nullable': True},
+                'results': schema,
+            },
+        }
@@ -0,0 +1,81 @@
+import base64
+import json
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import RequestFactory, TestCase
+from django.utils import timezone
+from rest_framework.exceptions import NotFound
+from rest_framework.request import Request
+from rest_framework.test import APIClient
+
+from mock_tests.models import MockTest
+
+from .pagination import KeysetPagination
+
+
+class KeysetPaginationTests(TestCase):
+    """utils.pagination.KeysetPagination: sahifalar kalit bo'yicha, takrorlanmasdan"""
+
+    def setUp(self):
+        self.factory = RequestFactory()
+        now = timezone.now()
+        self.tests = [
+            MockTest.objects.create(title=f't{i}', subject='math' if i % 2 else 'physics',
+                                    difficulty='easy', duration=10, passing_score=50)
+            for i in range(7)
+        ]
+        # Birinchi beshtasi bir xil vaqtda yaratilgan - tartibni faqat id hal qiladi
+        MockTest.objects.filter(pk__in=[test.pk for test in self.tests[:5]]).update(created_at=now)
+        MockTest.objects.filter(pk=self.tests[5].pk).update(created_at=now + timedelta(seconds=1))
+        MockTest.objects.filter(pk=self.tests[6].pk).update(created_at=now - timedelta(seconds=1))
+
+    def paginate(self, url, ordering=None):
+        paginator = KeysetPagination(ordering=ordering)
+        page = paginator.paginate_queryset(MockTest.objects.all(), Request(self.factory.get(url)))
+        return paginator, [test.pk for test in page]
+
+    def walk(self, ordering=None, page_size=2):
+        """Barcha sahifalarni next havolasi bo'yicha o'qish"""
+        ids, url, pages = [], f'/tests/?page_size={page_size}', 0
+        while url:
+            paginator, page = self.paginate(url, ordering)
+            ids += page
+            url = paginator.get_next_link()
+            pages += 1
+        return ids, pages
+
+    def test_equal_timestamps(self):
+        ids, pages = self.walk()
+        expected = list(MockTest.objects.order_by('-created_at', '-id').values_list('id', flat=True))
+        self.assertEqual(ids, expected)
+        self.assertEqual(pages, 4)
+
+    def test_mixed_directions(self):
+        ids, _ = self.walk(ordering=('subject', '-created_at'))
+        expected = list(MockTest.objects.order_by('subject', '-created_at', 'id').values_list('id', flat=True))
+        self.assertEqual(ids, expected)
+
+    def test_last_page_has_no_next(self):
+        paginator, page = self.paginate('/tests/?page_size=7')
+        self.assertEqual(len(page), 7)
+        self.assertIsNone(paginator.get_next_link())
+
+    def test_count(self):
+        paginator, _ = self.paginate('/tests/?page_size=2&count=1')
+        data = paginator.get_paginated_data([])
+        self.assertEqual(data['count'], 7)
+        self.assertNotIn('count=', data['next'])
+
+    def test_invalid_cursor(self):
+        wrong_length = base64.urlsafe_b64encode(json.dumps(['x']).encode()).decode()
+        for cursor in ['not-a-cursor', wrong_length, base64.urlsafe_b64encode(b'{}').decode()]:
+            with self.subTest(cursor=cursor), self.assertRaises(NotFound):
+                self.paginate(f'/tests/?cursor={cursor}')
+
+    def test_invalid_cursor_response(self):
+        client = APIClient()
+        client.force_authenticate(get_user_model().objects.create_user(username='u', password='x'))
+        response = client.get('/api/mock-tests/my_attempts/?cursor=not-a-cursor')
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response.data['detail'], KeysetPagination.invalid_cursor_message)
@@ -1,9 +1,11 @@
 from rest_framework import serializers
+from utils.counters import PendingCountersMixin
 from .models import Video
 
 
-class VideoSerializer(serializers.ModelSerializer):
+class VideoSerializer(PendingCountersMixin, serializers.ModelSerializer):
     """Video serializer"""
+    counter_fields = ['views', 'likes']
     teacher_name = serializers.SerializerMethodField()
     subject_display = serializers.CharField(source='get_subject_display', read_only=True)
 
@@ -2,9 +2,12 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from django.db import transaction
 from .models import Video
 from .serializers import VideoSerializer
-from teachers.models import Teacher
+from teachers import points
+from utils import counters
+from utils.pagination import KeysetPagination
 
 
 class VideoViewSet(viewsets.ModelViewSet):
@@ -12,6 +15,7 @@ class VideoViewSet(viewsets.ModelViewSet):
     queryset = Video.objects.select_related('teacher').all()
     serializer_class = VideoSerializer
     permission_classes = [IsAuthenticated]
+    search_kind = 'video'
 
     def get_queryset(self):
         queryset = Video.objects.all()
@@ -21,19 +25,18 @@ class VideoViewSet(viewsets.ModelViewSet):
             queryset = queryset.filter(teacher__school__director=user)
 
         if user.role == 'teacher':
-            try:
-                teacher = Teacher.objects.get(user=user)
+            teacher = self.request.profile.teacher
+            if teacher is not None:
                 queryset = queryset.filter(is_approved=True) | queryset.filter(teacher=teacher)
-            except Teacher.DoesNotExist:
+            else:
                 queryset = queryset.filter(is_approved=True)
 
         return queryset
 
     def create(self, request, *args, **kwargs):
         """Video yaratish"""
-        try:
-            teacher = Teacher.objects.get(user=request.user)
-        except Teacher.DoesNotExist:
+        teacher = request.profile.teacher
+        if teacher is None:
             return Response(
                 {"error": "O'qituvchi profili topilmadi. Admin bilan bog'laning."},
                 status=status.HTTP_400_BAD_REQUEST
@@ -49,13 +52,15 @@ class VideoViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'])
     def my_videos(self, request):
         """Mening videolarim"""
-        try:
-            teacher = Teacher.objects.get(user=request.user)
-            videos = Video.objects.filter(teacher=teacher)
-            serializer = self.get_serializer(videos, many=True)
-            return Response(serializer.data)
-        except Teacher.DoesNotExist:
-            return Response([], status=status.HTTP_200_OK)
+        teacher = request.profile.teacher
+        if teacher is None:
+            return Response({'next': None, 'results': []}, status=status.HTTP_200_OK)
+
+        videos = Video.objects.filter(teacher=teacher).select_related('teacher__user')
+        paginator = KeysetPagination()
+        page = paginator.paginate_queryset(videos, request, view=self)
+        serializer = self.get_serializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
 
     @action(detail=True, methods=['post'])
     def approve(self, request, pk=None):
@@ -67,29 +72,25 @@ class VideoViewSet(viewsets.ModelViewSet):
             )
 
         video = self.get_object()
-        video.is_approved = True
-        video.save()
 
-        # Ball qo'shish
-        video.teacher.total_points += 15
-        video.teacher.monthly_points += 15
-        video.teacher.update_level()
-        video.teacher.save()
+        with transaction.atomic():
+            video.is_approved = True
+            video.save()
+
+            # Ball qo'shish
+            awarded = points.award(video.teacher_id, 'video_approved', source=video)
 
-        return Response({'message': 'Video tasdiqlandi', 'points': 15})
+        return Response({
+            'message': 'Video tasdiqlandi',
+            'points': points.POINT_VALUES['video_approved'] if awarded else 0
+        })
 
     @action(detail=True, methods=['post'])
     def increment_view(self, request, pk=None):
         """Ko'rish sonini oshirish"""
-        video = self.get_object()
-        video.views += 1
-        video.save()
-        return Response({'views': video.views})
+        return Response({'views': counters.hit(self.get_queryset(), pk, 'views')})
 
     @action(detail=True, methods=['post'])
     def like(self, request, pk=None):
         """Like qo'shish"""
-        video = self.get_object()
-        video.likes += 1
-        video.save()
-        return Response({'likes': video.likes})
\ No newline at end of file
+        return Response({'likes': counters.hit(self.get_queryset(), pk, 'likes')})
\ No newline at end of file